@@ -5,8 +5,15 @@ import asyncio
 import functools
 import inspect
 import hashlib
+import re
+import sys
+import fnmatch
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, Optional
-from datetime import datetime, timedelta
+from datetime import datetime
 from mcp.server.fastmcp import FastMCP
 from pydantic import Field
 from dotenv import load_dotenv
@@ -21,6 +28,14 @@ mcp = FastMCP("Meraki Magic MCP - Full API")
 # Configuration
 ENABLE_CACHING = os.getenv("ENABLE_CACHING", "true").lower() == "true"
 CACHE_TTL_SECONDS = int(os.getenv("CACHE_TTL_SECONDS", "300"))  # 5 minutes default
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "2000"))
+CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", str(64 * 1024 * 1024)))  # 64 MB of serialized JSON
+CACHE_SWEEP_SECONDS = int(os.getenv("CACHE_SWEEP_SECONDS", "60"))  # How often expired entries are purged
+# Stale-while-revalidate: serve expired entries this much longer while one background refresh runs (0 = off)
+CACHE_STALE_SECONDS = int(os.getenv("CACHE_STALE_SECONDS", "0"))
+CACHE_NEGATIVE_TTL_SECONDS = int(os.getenv("CACHE_NEGATIVE_TTL_SECONDS", "0"))  # Default TTL for 4xx errors (0 = don't cache)
+CACHE_POLICY_FILE = os.getenv("CACHE_POLICY_FILE", "")  # JSON list of per-endpoint cache policies
+MAX_INDEXED_DEVICES = 100000  # serial -> networkId mappings kept per profile for write invalidation
 READ_ONLY_MODE = os.getenv("READ_ONLY_MODE", "false").lower() == "true"
 
 # Response size management (new)
@@ -163,42 +178,339 @@ dashboard = profile_manager.dashboard
 # CACHING SYSTEM
 ###################
 
-class SimpleCache:
-    """Simple in-memory cache with TTL"""
-    def __init__(self):
-        self.cache = {}
-        self.timestamps = {}
-
-    def get(self, key: str) -> Optional[Any]:
-        """Get cached value if not expired"""
-        if key in self.cache:
-            if datetime.now() - self.timestamps[key] < timedelta(seconds=CACHE_TTL_SECONDS):
-                return self.cache[key]
-            else:
-                # Expired, remove
-                del self.cache[key]
-                del self.timestamps[key]
-        return None
+class BoundedCache:
+    """In-memory LRU cache with TTL, bounded by entry count and approximate bytes.
 
-    def set(self, key: str, value: Any):
-        """Set cached value"""
-        self.cache[key] = value
-        self.timestamps[key] = datetime.now()
-
-    def clear(self):
-        """Clear all cache"""
-        self.cache.clear()
-        self.timestamps.clear()
+    Entries expire on a monotonic clock; expired entries are also swept every
+    CACHE_SWEEP_SECONDS so keys that are never read again don't pile up.
+    Entries can carry tags (e.g. "section:switch") for selective invalidation.
+    With stale_seconds > 0 an expired entry is kept that much longer and
+    returned flagged as stale, so the caller can refresh it in the background.
+    Tool handlers run in executor threads, so all access is locked.
+    """
+    def __init__(self, max_entries: int, max_bytes: int, ttl_seconds: int, stale_seconds: int = 0):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        # key -> (value, expires_at, size, tags, stored_at)
+        self._entries: "OrderedDict[str, tuple[Any, float, int, tuple[str, ...], float]]" = OrderedDict()
+        self._keys_by_tag: Dict[str, set] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._next_sweep = time.monotonic() + CACHE_SWEEP_SECONDS
+        self._refreshing: set = set()
+        self._epoch = 0  # Bumped by every invalidation; results fetched under an older epoch aren't stored
+        self.hits = 0
+        self.stale_hits = 0
+        self.refreshes = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key: str, max_age: Optional[float] = None) -> tuple:
+        """Get (value, is_stale), marking the entry most recently used; value is None on a miss.
+
+        An entry stored more than max_age seconds ago counts as a miss (but is kept).
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._maybe_sweep(now)
+            entry = self._entries.get(key)
+            if entry is None or (max_age is not None and now - entry[4] > max_age):
+                self.misses += 1
+                return None, False
+            if entry[1] + self.stale_seconds <= now:
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None, False
+            self._entries.move_to_end(key)
+            if entry[1] <= now:
+                self.stale_hits += 1
+                return entry[0], True
+            self.hits += 1
+            return entry[0], False
+
+    def begin_refresh(self, key: str) -> bool:
+        """Claim the background refresh of a stale key; False if one is already running"""
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            self.refreshes += 1
+            return True
+
+    def end_refresh(self, key: str):
+        with self._lock:
+            self._refreshing.discard(key)
+
+    @property
+    def epoch(self) -> int:
+        """Invalidation epoch; pass it to set() to drop results fetched before a later invalidation"""
+        return self._epoch
+
+    def set(self, key: str, value: Any, size: Optional[int] = None, ttl_seconds: Optional[int] = None,
+            tags: tuple = (), epoch: Optional[int] = None):
+        """Set cached value; size is the approximate serialized size in bytes.
+
+        With epoch given, the value is not stored if an invalidation happened since
+        (e.g. a write finished while this read was in flight).
+        """
+        if size is None:
+            size = len(json.dumps(value, default=str))
+        now = time.monotonic()
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        with self._lock:
+            self._maybe_sweep(now)
+            if key in self._entries:
+                self._remove(key)
+            if size > self.max_bytes or (epoch is not None and epoch != self._epoch):
+                return  # Too large to fit, or possibly stale; the old value is dropped either way
+            self._entries[key] = (value, now + ttl, size, tuple(tags), now)
+            for tag in tags:
+                self._keys_by_tag.setdefault(tag, set()).add(key)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def discard(self, key: str):
+        """Remove one entry if present"""
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def invalidate(self, tag: str) -> int:
+        """Remove all entries carrying a tag, returning how many were removed"""
+        with self._lock:
+            self._epoch += 1
+            keys = self._keys_by_tag.get(tag, set()).copy()
+            for key in keys:
+                self._remove(key)
+            self.invalidations += len(keys)
+            return len(keys)
+
+    def clear(self) -> int:
+        """Clear all cache, returning how many entries were removed"""
+        with self._lock:
+            self._epoch += 1
+            count = len(self._entries)
+            self._entries.clear()
+            self._keys_by_tag.clear()
+            self._bytes = 0
+            return count
+
+    def _remove(self, key: str):
+        _, _, size, tags, _ = self._entries.pop(key)
+        self._bytes -= size
+        for tag in tags:
+            keys = self._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
+
+    def _maybe_sweep(self, now: float):
+        """Drop expired entries at most once per sweep interval (lock held)"""
+        if now < self._next_sweep:
+            return
+        self._next_sweep = now + CACHE_SWEEP_SECONDS
+        expired = [key for key, entry in self._entries.items() if entry[1] + self.stale_seconds <= now]
+        for key in expired:
+            self._remove(key)
+        self.expirations += len(expired)
 
     def stats(self) -> Dict:
         """Get cache statistics"""
+        with self._lock:
+            self._maybe_sweep(time.monotonic())
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                "total_items": len(self._entries),
+                "total_bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "refreshes": self.refreshes,
+                "misses": self.misses,
+                "hit_ratio": round((self.hits + self.stale_hits) / lookups, 3) if lookups else None,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations
+            }
+
+class ProfileCache:
+    """One BoundedCache per ProfileManager profile.
+
+    Responses from different organizations never share a partition, so a
+    switch_profile can't serve another org's data, and each profile has its own
+    budget (MERAKI_PROFILE_<NAME>_CACHE_MAX_ENTRIES / _CACHE_MAX_BYTES, falling
+    back to CACHE_MAX_ENTRIES / CACHE_MAX_BYTES).
+    """
+    def __init__(self):
+        self._partitions: Dict[str, BoundedCache] = {}
+        self._device_networks: Dict[str, Dict[str, str]] = {}  # profile -> serial -> networkId
+        self._lock = threading.Lock()
+
+    def partition(self, profile: Optional[str]) -> BoundedCache:
+        """Get (creating if needed) the cache for a profile"""
+        profile = (profile or "default").lower()
+        with self._lock:
+            part = self._partitions.get(profile)
+            if part is None:
+                prefix = f"MERAKI_PROFILE_{profile.upper()}_CACHE_"
+                part = self._partitions[profile] = BoundedCache(
+                    int(os.getenv(prefix + "MAX_ENTRIES", str(CACHE_MAX_ENTRIES))),
+                    int(os.getenv(prefix + "MAX_BYTES", str(CACHE_MAX_BYTES))),
+                    CACHE_TTL_SECONDS,
+                    CACHE_STALE_SECONDS
+                )
+            return part
+
+    def note_devices(self, profile: Optional[str], data: Any):
+        """Remember serial -> networkId for devices seen in a response or request"""
+        items = data if isinstance(data, list) else [data]
+        found = {item["serial"]: item["networkId"] for item in items
+                 if isinstance(item, dict) and item.get("serial") and item.get("networkId")}
+        if not found:
+            return
+        with self._lock:
+            networks = self._device_networks.setdefault((profile or "default").lower(), {})
+            if len(networks) + len(found) > MAX_INDEXED_DEVICES:
+                networks.clear()
+            networks.update(found)
+
+    def invalidate_for_write(self, profile: Optional[str], method: str, params: Dict,
+                             org_id: Optional[str]) -> int:
+        """Drop the cached reads a successful write makes stale; returns entries removed"""
+        with self._lock:
+            network_id = params.get("networkId") or self._device_networks.get(
+                (profile or "default").lower(), {}).get(params.get("serial", ""))
+        part = self.partition(profile)
+        return sum(part.invalidate(tag) for tag in write_invalidation_tags(method, params, network_id, org_id))
+
+    def clear(self, profile: Optional[str] = None, section: Optional[str] = None) -> int:
+        """Clear one profile or all, optionally only one SDK section; returns entries removed"""
+        with self._lock:
+            if profile is None:
+                parts = list(self._partitions.values())
+            else:
+                part = self._partitions.get(profile.lower())
+                parts = [part] if part is not None else []
+        if section is None:
+            return sum(part.clear() for part in parts)
+        return sum(part.invalidate(f"section:{section}") for part in parts)
+
+    def stats(self, profile: Optional[str] = None) -> Dict:
+        """Get totals plus per-profile cache statistics"""
+        with self._lock:
+            parts = {name: part for name, part in self._partitions.items()
+                     if profile is None or name == profile.lower()}
+        profiles = {name: part.stats() for name, part in parts.items()}
+        totals = {key: sum(s[key] for s in profiles.values())
+                  for key in ("total_items", "total_bytes", "hits", "stale_hits", "refreshes", "misses",
+                              "evictions", "expirations", "invalidations")}
+        served = totals["hits"] + totals["stale_hits"]
+        lookups = served + totals["misses"]
         return {
-            "total_items": len(self.cache),
+            **totals,
+            "hit_ratio": round(served / lookups, 3) if lookups else None,
             "cache_enabled": ENABLE_CACHING,
-            "ttl_seconds": CACHE_TTL_SECONDS
+            "ttl_seconds": CACHE_TTL_SECONDS,
+            "stale_seconds": CACHE_STALE_SECONDS,
+            "profiles": profiles
         }
 
-cache = SimpleCache()
+cache = ProfileCache()
+
+###################
+# CACHE POLICIES
+###################
+
+# Built-in per-endpoint policies; CACHE_POLICIES (env, JSON) and CACHE_POLICY_FILE entries take precedence.
+# "match" is an exact method name or a glob; "ttl" 0 disables caching for matching methods.
+DEFAULT_CACHE_POLICIES = [
+    {"match": "getOrganizations", "ttl": 3600},
+    {"match": "getOrganization", "ttl": 3600},
+    {"match": "getOrganizationAdmins", "ttl": 3600},
+    {"match": "getOrganizationNetworks", "ttl": 900},
+    {"match": "getNetwork", "ttl": 900},
+    {"match": "*Clients*", "ttl": 30},
+    {"match": "*Events*", "ttl": 30},
+    {"match": "*Statuses*", "ttl": 60},
+    {"match": "*History*", "ttl": 60},
+]
+
+class CachePolicyTable:
+    """Resolves the cache policy (ttl, negative_ttl, max_entry_bytes) for a method.
+
+    Sources are consulted in order (env, then file, then built-in) and the first
+    source with a matching policy decides; within a source an exact method name
+    wins over glob patterns, and among patterns the first match wins. Unmatched
+    methods use CACHE_TTL_SECONDS and CACHE_NEGATIVE_TTL_SECONDS.
+    """
+    def __init__(self, sources: list):
+        # Per source: (exact name -> policy, [glob policies in order])
+        self._sources = []
+        self.policies = []
+        for policies in sources:
+            valid = [p for p in policies if isinstance(p, dict) and p.get("match")]
+            exact: Dict[str, Dict] = {}
+            for policy in valid:
+                if not any(c in policy["match"] for c in "*?["):
+                    exact.setdefault(policy["match"], policy)
+            patterns = [p for p in valid if any(c in p["match"] for c in "*?[")]
+            self._sources.append((exact, patterns))
+            self.policies.extend(valid)
+        self._resolved: Dict[str, Dict] = {}
+
+    def _match(self, method: str) -> Dict:
+        for exact, patterns in self._sources:
+            matched = exact.get(method) or next(
+                (p for p in patterns if fnmatch.fnmatchcase(method, p["match"])), None)
+            if matched is not None:
+                return matched
+        return {}
+
+    def resolve(self, method: str) -> Dict:
+        policy = self._resolved.get(method)
+        if policy is None:
+            matched = self._match(method)
+            policy = self._resolved[method] = {
+                "match": matched.get("match"),
+                "ttl": int(matched.get("ttl", CACHE_TTL_SECONDS)),
+                "negative_ttl": int(matched.get("negative_ttl", CACHE_NEGATIVE_TTL_SECONDS)),
+                "max_entry_bytes": matched.get("max_entry_bytes")
+            }
+        return policy
+
+def _load_cache_policies() -> list:
+    """Policy lists from CACHE_POLICIES and CACHE_POLICY_FILE, followed by the built-in defaults"""
+    policies = []
+    sources = [("CACHE_POLICIES", os.getenv("CACHE_POLICIES", ""))]
+    if CACHE_POLICY_FILE:
+        try:
+            sources.append((CACHE_POLICY_FILE, Path(CACHE_POLICY_FILE).read_text()))
+        except OSError as e:
+            print(f"Cache policies: cannot read {CACHE_POLICY_FILE}: {e}", file=sys.stderr)
+    for name, text in sources:
+        if not text.strip():
+            continue
+        try:
+            loaded = json.loads(text)
+        except json.JSONDecodeError as e:
+            print(f"Cache policies: invalid JSON in {name}: {e}", file=sys.stderr)
+            continue
+        if isinstance(loaded, list):
+            policies.append(loaded)
+        else:
+            print(f"Cache policies: {name} must be a JSON list", file=sys.stderr)
+    return policies + [DEFAULT_CACHE_POLICIES]
+
+cache_policies = CachePolicyTable(_load_cache_policies())
 
 ###################
 # FILE CACHE UTILITIES
@@ -330,14 +642,75 @@ def create_cache_key(section: str, method: str, kwargs: Dict) -> str:
     key_string = f"{section}_{method}_{sorted_kwargs}"
     return hashlib.md5(key_string.encode()).hexdigest()
 
+# Request parameters identifying the resource a call reads or writes, most specific first
+RESOURCE_ID_PARAMS = ("serial", "networkId", "organizationId")
+
+def read_resource_tags(method: str, params: Dict) -> tuple:
+    """Dependency tags for a cached read: one per resource identifier in its params.
+
+    Listings also get a "devices:"/"networks:" tag for their scope, so a write to
+    one device can invalidate e.g. getNetworkDevices without touching other reads.
+    """
+    tags = [f"{name}:{params[name]}" for name in RESOURCE_ID_PARAMS if params.get(name)]
+    if "Devices" in method and not params.get("serial"):
+        tags += [f"devices:{name}:{params[name]}" for name in ("networkId", "organizationId") if params.get(name)]
+    if "Networks" in method and not params.get("networkId") and params.get("organizationId"):
+        tags.append(f"networks:organizationId:{params['organizationId']}")
+    return tuple(tags)
+
+def write_invalidation_tags(method: str, params: Dict, network_id: Optional[str],
+                            org_id: Optional[str]) -> list:
+    """Tags of the cached reads a write makes stale.
+
+    That is every read of the resources named in the write's params, plus the
+    device/network listings of the enclosing network and organization when the
+    write changes devices or a network themselves (updateDevice, claimNetworkDevices,
+    updateNetwork), not their sub-resources (updateDeviceSwitchPort).
+    """
+    tags = [f"{name}:{params[name]}" for name in RESOURCE_ID_PARAMS if params.get(name)]
+    if re.search(r"Devices?$", method):
+        if network_id:
+            tags.append(f"devices:networkId:{network_id}")
+        if org_id:
+            tags.append(f"devices:organizationId:{org_id}")
+    if params.get("networkId") and not params.get("serial") and re.search(r"Network(s)?$", method) and org_id:
+        tags.append(f"networks:organizationId:{org_id}")
+    return tags
+
 ###################
 # GENERIC API CALLER - Provides access to ALL 804+ endpoints
 ###################
 
-def _call_meraki_method_internal(section: str, method: str, params: dict) -> str:
-    """Internal helper to call Meraki API methods"""
+# Background refreshes for stale-while-revalidate (each stale key is refreshed at most once at a time)
+_refresh_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="meraki-cache-refresh")
+
+def _refresh_cached(profile_cache: BoundedCache, cache_key: str, section: str, method: str, params: dict,
+                    cache_ttl: Optional[int]):
+    """Re-fetch a stale entry, bypassing the cache; the normal call path stores the result"""
+    try:
+        _call_meraki_method_internal(section, method, params, bypass_cache=True, cache_ttl=cache_ttl)
+    finally:
+        profile_cache.end_refresh(cache_key)
+
+def _cache_result(profile_cache: BoundedCache, cache_key: str, data: Any, size: int, ttl: int,
+                  policy: Dict, tags: tuple, epoch: int):
+    """Store a read result unless it exceeds the policy's max entry size (which drops any older value)"""
+    if policy["max_entry_bytes"] is not None and size > int(policy["max_entry_bytes"]):
+        profile_cache.discard(cache_key)
+        return
+    profile_cache.set(cache_key, data, size=size, ttl_seconds=ttl, tags=tags, epoch=epoch)
+
+def _call_meraki_method_internal(section: str, method: str, params: dict, bypass_cache: bool = False,
+                                 cache_ttl: Optional[int] = None) -> str:
+    """Internal helper to call Meraki API methods.
+
+    cache_ttl shortens the endpoint's cache policy TTL: only entries at most that old are
+    served and new results are stored for at most that long; 0 fetches fresh and skips caching.
+    """
     pagination_limited = False
     original_params = params.copy()
+    cache_key = None  # Set for cacheable reads
+    cache_epoch = None
 
     try:
         # Validate section
@@ -386,18 +759,39 @@ def _call_meraki_method_internal(section: str, method: str, params: dict) -> str
         if params != params_before:
             pagination_limited = True
 
-        # Check cache for read operations
-        if ENABLE_CACHING and is_read:
+        # Check cache for read operations (partitioned by profile so orgs never share entries)
+        profile_cache = cache.partition(active_config['profile_name'])
+        cache_tags = (f"section:{section}",) + read_resource_tags(method, params)
+        policy = cache_policies.resolve(method)
+        # Entries are shared by all callers, so an override can only shorten the policy TTL, never extend it
+        ttl = policy["ttl"] if cache_ttl is None else min(cache_ttl, policy["ttl"])
+        if ENABLE_CACHING and is_read and cache_ttl != 0 and (ttl > 0 or policy["negative_ttl"] > 0):
             cache_key = create_cache_key(section, method, params)
-            cached = cache.get(cache_key)
+        if cache_key and not bypass_cache:
+            cached, stale = profile_cache.get(cache_key, max_age=cache_ttl)
             if cached is not None:
+                if stale and profile_cache.begin_refresh(cache_key):
+                    _refresh_pool.submit(_refresh_cached, profile_cache, cache_key, section, method, dict(params),
+                                         cache_ttl)
                 if isinstance(cached, dict):
-                    cached['_from_cache'] = True
+                    cached = {**cached, '_from_cache': True}
+                    if stale:
+                        cached['_stale'] = True
+                elif stale:
+                    # Lists can't carry the flag, so stale ones are wrapped
+                    cached = {'_stale': True, '_from_cache': True, 'items': cached}
                 return json.dumps(cached, indent=2)
 
-        # Call the method
+        # Call the method (the epoch is taken first so a write landing meanwhile keeps the result out of the cache)
+        cache_epoch = profile_cache.epoch
         result = method_func(**params)
 
+        # Write-through invalidation: drop cached reads of the resources this call changed
+        if ENABLE_CACHING and not is_read:
+            cache.invalidate_for_write(active_config['profile_name'], method, params, active_config['org_id'])
+        elif ENABLE_CACHING:
+            cache.note_devices(active_config['profile_name'], result)
+
         # Check response size and handle large responses
         result_json = json.dumps(result)
         estimated_tokens = estimate_token_count(result_json)
@@ -415,9 +809,9 @@ def _call_meraki_method_internal(section: str, method: str, params: dict) -> str
                 truncated_response["_pagination_message"] = f"Request modified: pagination limited to {MAX_PER_PAGE} items per page"
 
             # Cache the truncated response (not the full result)
-            if ENABLE_CACHING and is_read:
-                cache_key = create_cache_key(section, method, params)
-                cache.set(cache_key, truncated_response)
+            if cache_key and ttl > 0:
+                _cache_result(profile_cache, cache_key, truncated_response, len(json.dumps(truncated_response)),
+                              ttl, policy, cache_tags, cache_epoch)
 
             return json.dumps(truncated_response, indent=2)
 
@@ -428,18 +822,23 @@ def _call_meraki_method_internal(section: str, method: str, params: dict) -> str
             response_data["_pagination_message"] = f"Request modified: pagination limited to {MAX_PER_PAGE} items per page"
 
         # Cache read results
-        if ENABLE_CACHING and is_read:
-            cache_key = create_cache_key(section, method, params)
-            cache.set(cache_key, response_data)
+        if cache_key and ttl > 0:
+            _cache_result(profile_cache, cache_key, response_data, len(result_json), ttl, policy, cache_tags,
+                          cache_epoch)
 
         return json.dumps(response_data, indent=2)
 
     except meraki.exceptions.APIError as e:
-        return json.dumps({
+        error = {
             "error": "Meraki API Error",
             "message": str(e),
             "status": getattr(e, 'status', 'unknown')
-        }, indent=2)
+        }
+        # Negative caching: remember client errors (e.g. 404 for a wrong serial), never rate limits/timeouts
+        if (cache_key and policy["negative_ttl"] > 0 and isinstance(error["status"], int)
+                and 400 <= error["status"] < 500 and error["status"] not in (408, 429)):
+            profile_cache.set(cache_key, error, ttl_seconds=policy["negative_ttl"], tags=cache_tags, epoch=cache_epoch)
+        return json.dumps(error, indent=2)
     except TypeError as e:
         return json.dumps({
             "error": "Invalid parameters",
@@ -467,7 +866,8 @@ async def call_meraki_api(
             'properties': {},
             'additionalProperties': True
         }
-    )
+    ),
+    cache_ttl: Optional[int] = None
 ) -> str:
     """
     Call any Meraki API method - provides access to all 804+ endpoints
@@ -476,14 +876,16 @@ async def call_meraki_api(
         section: SDK section (organizations, networks, wireless, switch, appliance, camera, devices, sensor, sm, etc.)
         method: Method name (e.g., getOrganizationAdmins, updateNetworkWirelessSsid, getNetworkApplianceFirewallL3FirewallRules)
         parameters: Dict of parameters (e.g., {"networkId": "L_123", "name": "MySSID"})
+        cache_ttl: Max age in seconds for this read; shortens (never extends) the endpoint's cache policy TTL (0 = fetch fresh, don't cache)
 
     Examples:
         call_meraki_api(section="organizations", method="getOrganizationAdmins", parameters={"organizationId": "123456"})
         call_meraki_api(section="wireless", method="updateNetworkWirelessSsid", parameters={"networkId": "L_123", "number": "0", "name": "NewSSID", "enabled": True})
         call_meraki_api(section="appliance", method="getNetworkApplianceFirewallL3FirewallRules", parameters={"networkId": "L_123"})
+        call_meraki_api(section="networks", method="getNetworkClients", parameters={"networkId": "L_123"}, cache_ttl=0)
     """
     # Call internal method (parameters is always a dict due to default_factory)
-    return await to_async(_call_meraki_method_internal)(section, method, parameters)
+    return await to_async(_call_meraki_method_internal)(section, method, parameters, cache_ttl=cache_ttl)
 
 ###################
 # MOST COMMON TOOLS (Pre-registered for convenience)
@@ -704,19 +1106,39 @@ async def get_method_info(section: str, method: str) -> str:
         }, indent=2)
 
 @mcp.tool()
-async def cache_stats() -> str:
-    """Get cache statistics and configuration"""
-    stats = cache.stats()
+async def cache_stats(profile: Optional[str] = None) -> str:
+    """
+    Get cache statistics and configuration
+
+    Args:
+        profile: Only report this profile's cache (default: totals plus every profile)
+    """
+    stats = cache.stats(profile)
+    stats['active_profile'] = profile_manager.active_profile
     stats['read_only_mode'] = READ_ONLY_MODE
     return json.dumps(stats, indent=2)
 
 @mcp.tool()
-async def cache_clear() -> str:
-    """Clear all cached data"""
-    cache.clear()
+async def cache_clear(profile: Optional[str] = None, section: Optional[str] = None) -> str:
+    """
+    Clear cached data, optionally only for one profile and/or SDK section
+
+    Args:
+        profile: Profile whose cache to clear (default: all profiles)
+        section: Only clear responses from this SDK section, e.g. "switch" (default: all sections)
+
+    Examples:
+        cache_clear()                                  # Everything
+        cache_clear(profile="caladan")                 # One organization
+        cache_clear(profile="caladan", section="switch")
+    """
+    removed = cache.clear(profile, section)
     return json.dumps({
         "status": "success",
-        "message": "Cache cleared successfully"
+        "message": "Cache cleared successfully",
+        "profile": profile or "all",
+        "section": section or "all",
+        "entries_removed": removed
     }, indent=2)
 
 @mcp.tool()
@@ -735,6 +1157,12 @@ async def get_mcp_config() -> str:
         "read_only_mode": READ_ONLY_MODE,
         "caching_enabled": ENABLE_CACHING,
         "cache_ttl_seconds": CACHE_TTL_SECONDS,
+        "cache_max_entries": CACHE_MAX_ENTRIES,
+        "cache_max_bytes": CACHE_MAX_BYTES,
+        "cache_stale_seconds": CACHE_STALE_SECONDS,
+        "cache_negative_ttl_seconds": CACHE_NEGATIVE_TTL_SECONDS,
+        "cache_policy_file": CACHE_POLICY_FILE or None,
+        "cache_policies": cache_policies.policies,
         "file_caching_enabled": ENABLE_FILE_CACHING,
         "max_response_tokens": MAX_RESPONSE_TOKENS,
         "max_per_page": MAX_PER_PAGE,
@@ -0,0 +1,61 @@
+"""LangChain callback handler recording LLM latency and token metrics."""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+from uuid import UUID
+
+from langchain_core.callbacks import AsyncCallbackHandler
+from langchain_core.outputs import LLMResult
+
+from metrics import LLM_DURATION, LLM_ERRORS, LLM_TOKENS
+
+# Runs that never report an end (e.g. cancelled streams) are dropped past this
+_MAX_OPEN_RUNS = 10_000
+
+
+class LLMMetricsHandler(AsyncCallbackHandler):
+    """Times every chat model call made inside a graph run.
+
+    Passed in the graph's run config, so it reaches every LLM call in every
+    node (and the canvas prefetch task) without touching the agents.
+    """
+
+    def __init__(self) -> None:
+        self._started: dict[UUID, tuple[float, str]] = {}
+
+    async def on_chat_model_start(
+        self,
+        serialized: dict[str, Any],
+        messages: list,
+        *,
+        run_id: UUID,
+        metadata: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        model = (metadata or {}).get("ls_model_name") or (serialized.get("kwargs") or {}).get("model") or "unknown"
+        if len(self._started) >= _MAX_OPEN_RUNS:
+            self._started.clear()
+        self._started[run_id] = (time.perf_counter(), model)
+
+    async def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        started = self._started.pop(run_id, None)
+        if started is None:
+            return
+        began, model = started
+        LLM_DURATION.observe(time.perf_counter() - began, model=model)
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if usage:
+                    LLM_TOKENS.observe(usage.get("input_tokens", 0), model=model, direction="input")
+                    LLM_TOKENS.observe(usage.get("output_tokens", 0), model=model, direction="output")
+
+    async def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        started = self._started.pop(run_id, None)
+        if started is not None:
+            LLM_ERRORS.inc(model=started[1])
+
+
+llm_metrics = LLMMetricsHandler()
@@ -2,14 +2,21 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
 import logging
 import uuid
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
 
 from langchain_anthropic import ChatAnthropic
-from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+from langgraph.config import get_stream_writer
+from langgraph.constants import TAG_NOSTREAM
 
+from agents.card_stream import CardStreamParser
 from agents.state import AgentState
+from agents.tool_summary import summarize_tool_result
 from config import settings
 from prompts import load_prompt
 
@@ -18,26 +25,149 @@ logger = logging.getLogger(__name__)
 CANVAS_SYSTEM_PROMPT = load_prompt("canvas")
 
 
+# Canvas runs started by a specialist, keyed by prefetch ID.  Each run pushes
+# finished cards onto its queue, then None when it ends.
+_prefetch_tasks: dict[str, tuple[asyncio.Task, asyncio.Queue]] = {}
+
+# How long a finished run waits for canvas_node before it is dropped
+_UNCLAIMED_TTL_SECONDS = 60.0
+
+# Prefetch IDs started during the current graph run (see canvas_prefetch_scope)
+_run_prefetches: ContextVar[set[str] | None] = ContextVar("canvas_run_prefetches", default=None)
+
+
+def start_canvas_prefetch(state: AgentState, tool_results: list[dict]) -> str:
+    """Speculatively start generating cards before a specialist's next model turn.
+
+    Specialists call this before each model call once their tools have run:
+    if the turn is the final synthesis, card generation has overlapped with
+    it and the canvas node only waits for the run to finish; if the turn asks
+    for more tools, the specialist drops the run with ``cancel_canvas_prefetch``.
+    Returns a prefetch ID to store in ``canvas_prefetch_id``, or "" when no
+    cards are wanted, no tools have run, or the latest tool call failed (the
+    model usually retries, so the tool phase isn't over).
+    """
+    if not state.get("generate_cards", False) or not tool_results:
+        return ""
+    if _is_error(tool_results[-1].get("result")):
+        return ""
+
+    prefetch_id = uuid.uuid4().hex
+    queue: asyncio.Queue = asyncio.Queue()
+    task = asyncio.create_task(_run_prefetch(queue, state["user_query"], list(tool_results)))
+    _prefetch_tasks[prefetch_id] = (task, queue)
+    # Drop the run if the graph never reaches canvas_node to claim it
+    task.add_done_callback(
+        lambda t: t.get_loop().call_later(_UNCLAIMED_TTL_SECONDS, _prefetch_tasks.pop, prefetch_id, None)
+    )
+    run_ids = _run_prefetches.get()
+    if run_ids is not None:
+        run_ids.add(prefetch_id)
+    logger.info("Started canvas prefetch %s from %d tool results", prefetch_id[:8], len(tool_results))
+    return prefetch_id
+
+
+def _is_error(result: object) -> bool:
+    """Whether a tool result is one of the error strings the tool wrappers return."""
+    return isinstance(result, str) and (result.startswith("Error") or result.endswith("not found"))
+
+
+def cancel_canvas_prefetch(prefetch_id: str) -> None:
+    """Cancel a canvas run that will not be claimed ("" is a no-op)."""
+    task, _ = _prefetch_tasks.pop(prefetch_id, (None, None))
+    if task is not None and not task.done():
+        task.cancel()
+        logger.info("Cancelled canvas prefetch %s", prefetch_id[:8])
+
+
+@contextmanager
+def canvas_prefetch_scope() -> Iterator[None]:
+    """Cancel any canvas run still unclaimed when a graph run ends.
+
+    Wrap one graph run in this: if the run is cancelled or fails between a
+    specialist starting a prefetch and canvas_node claiming it, the run is
+    stopped here rather than left to finish for nobody.
+    """
+    token = _run_prefetches.set(set())
+    try:
+        yield
+    finally:
+        for prefetch_id in _run_prefetches.get() or ():
+            cancel_canvas_prefetch(prefetch_id)
+        _run_prefetches.reset(token)
+
+
+async def _run_prefetch(queue: asyncio.Queue, query: str, tool_results: list[dict]) -> list[dict]:
+    """Generate cards into the queue, closing it with None however the run ends."""
+    try:
+        return await _generate_cards(query, "", tool_results, on_card=queue.put_nowait)
+    finally:
+        queue.put_nowait(None)
+
+
 async def canvas_node(state: AgentState) -> dict:
     """Structure specialist results into card directives."""
     query = state["user_query"]
     tool_results = state.get("tool_results", [])
     messages = state.get("messages", [])
 
-    # Get the last AI message content as the specialist's analysis
-    specialist_text = ""
-    for msg in reversed(messages):
-        if hasattr(msg, "content") and hasattr(msg, "type") and msg.type == "ai":
-            specialist_text = msg.content if isinstance(msg.content, str) else str(msg.content)
-            break
+    writer = get_stream_writer()
+    sent: list[dict] = []
+
+    def emit(card: dict) -> None:
+        # Stream each card to the client as soon as its JSON object closes
+        sent.append(card)
+        writer({"type": "card", "data": card})
+
+    cards = None
+    task, queue = _prefetch_tasks.pop(state.get("canvas_prefetch_id", ""), (None, None))
+    if task is not None:
+        while (card := await queue.get()) is not None:
+            emit(card)
+        try:
+            cards = await task
+            logger.info("Canvas using %d prefetched cards", len(cards))
+        except Exception:
+            logger.exception("Canvas prefetch failed after %d cards", len(sent))
+            if sent:
+                cards = sent
+
+    if cards is None:
+        # Get the last AI message content as the specialist's analysis
+        specialist_text = ""
+        for msg in reversed(messages):
+            if hasattr(msg, "content") and hasattr(msg, "type") and msg.type == "ai":
+                specialist_text = _message_text(msg)
+                break
+        cards = await _generate_cards(query, specialist_text, tool_results, on_card=emit)
+
+    return {
+        "cards": cards,
+        "agent_events": state.get("agent_events", []) + [
+            {"type": "cards_ready", "count": len(cards)},
+        ],
+    }
+
 
-    # Prepare a summary of tool results for the canvas agent
+async def _generate_cards(
+    query: str,
+    specialist_text: str,
+    tool_results: list[dict],
+    on_card: Callable[[dict], None] | None = None,
+) -> list[dict]:
+    """Stream card directives from the canvas LLM, calling ``on_card`` for each one."""
+    # Summarize each full tool result as aggregates for the canvas agent
     tool_summary_parts = []
     for tr in tool_results:
-        result_preview = str(tr.get("result", ""))[:2000]
-        tool_summary_parts.append(f"Tool: {tr['tool']}\nArgs: {tr.get('args', {})}\nResult: {result_preview}")
+        result_summary = summarize_tool_result(tr.get("result", ""))
+        tool_summary_parts.append(f"Tool: {tr['tool']}\nArgs: {tr.get('args', {})}\nResult: {result_summary}")
     tool_summary = "\n\n---\n\n".join(tool_summary_parts) if tool_summary_parts else "No tool results available."
 
+    # A prefetched run starts before the specialist has written its answer, and
+    # card follow-ups reuse stored tool results without one
+    if not specialist_text:
+        specialist_text = "(Not available - build the cards directly from the tool results.)"
+
     llm = ChatAnthropic(
         model=settings.model_name,
         api_key=settings.anthropic_api_key,
@@ -54,60 +184,44 @@ Tool results:
 
 Generate card directives as a JSON array."""
 
-    response = await llm.ainvoke([
-        SystemMessage(content=CANVAS_SYSTEM_PROMPT),
-        HumanMessage(content=user_content),
-    ])
-
-    # Parse the card JSON from the response
-    cards = _parse_cards(response.content)
+    parser = CardStreamParser()
+    cards: list[dict] = []
 
-    # Add IDs to cards
-    for card in cards:
-        card["id"] = f"card-{uuid.uuid4().hex[:8]}"
+    def accept(new_cards: list[dict]) -> None:
+        for card in new_cards:
+            card["id"] = f"card-{uuid.uuid4().hex[:8]}"
+            cards.append(card)
+            if on_card is not None:
+                on_card(card)
 
-    return {
-        "cards": cards,
-        "agent_events": state.get("agent_events", []) + [
-            {"type": "cards_ready", "count": len(cards)},
-        ],
-    }
-
-
-def _parse_cards(content: str) -> list[dict]:
-    """Parse card JSON from the LLM response, handling markdown code blocks."""
-    if isinstance(content, list):
-        # Handle structured content blocks
-        text_parts = []
-        for block in content:
-            if hasattr(block, "text"):
-                text_parts.append(block.text)
-        content = "\n".join(text_parts)
-
-    # Strip markdown code blocks if present
-    content = content.strip()
-    if content.startswith("```"):
-        lines = content.split("\n")
-        # Remove first and last lines (```json and ```)
-        lines = lines[1:]
-        if lines and lines[-1].strip() == "```":
-            lines = lines[:-1]
-        content = "\n".join(lines)
-
-    try:
-        cards = json.loads(content)
-        if isinstance(cards, list):
-            return cards
-        if isinstance(cards, dict):
-            return [cards]
-    except json.JSONDecodeError:
-        logger.warning("Failed to parse card JSON from canvas agent")
-        # Return a fallback text report card
-        return [{
-            "type": "text_report",
-            "title": "Analysis Results",
-            "source": "meraki",
-            "data": {"content": content},
-        }]
-
-    return []
+    # nostream: card JSON is delivered as card events, never as response text
+    async for chunk in llm.astream([
+        SystemMessage(content=CANVAS_SYSTEM_PROMPT),
+        HumanMessage(content=user_content),
+    ], config={"tags": [TAG_NOSTREAM]}):
+        accept(parser.feed(chunk_text(chunk.content)))
+    accept(parser.close())
+
+    if parser.cards_malformed:
+        logger.warning("Canvas output: %d cards parsed, %d malformed",
+                       parser.cards_parsed, parser.cards_malformed)
+    return cards
+
+
+def _message_text(msg: BaseMessage) -> str:
+    """A message's content as a string."""
+    return msg.content if isinstance(msg.content, str) else str(msg.content)
+
+
+def chunk_text(content: str | list) -> str:
+    """Extract the text from a streamed message chunk's content."""
+    if isinstance(content, str):
+        return content
+    # Handle structured content blocks
+    text_parts = []
+    for block in content:
+        if isinstance(block, dict):
+            text_parts.append(block.get("text", ""))
+        elif hasattr(block, "text"):
+            text_parts.append(block.text)
+    return "".join(text_parts)
@@ -0,0 +1,119 @@
+"""Incremental parser that pulls card objects out of a streamed JSON array."""
+
+from __future__ import annotations
+
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class CardStreamParser:
+    """Extract card directives from canvas LLM output as it streams in.
+
+    The canvas agent answers with a JSON array of card objects, sometimes
+    wrapped in a markdown code block.  ``feed`` accepts arbitrary text chunks
+    and returns every card whose object has closed, so each card can be sent
+    to the frontend without waiting for the rest of the array.  A card that
+    fails to parse is skipped on its own; the remaining cards still go out.
+    """
+
+    def __init__(self) -> None:
+        self._parts: list[str] = []  # Text of the object currently being read
+        self._depth = 0  # Brace/bracket nesting inside the current object
+        self._in_string = False
+        self._escape = False
+        self._text: list[str] = []  # Everything fed, for the prose fallback
+        self.cards_parsed = 0
+        self.cards_malformed = 0
+
+    def feed(self, chunk: str) -> list[dict]:
+        """Consume a chunk of text and return the cards completed by it."""
+        if not chunk:
+            return []
+        self._text.append(chunk)
+
+        cards = []
+        start = 0 if self._depth else -1
+        for i, ch in enumerate(chunk):
+            if self._depth == 0:
+                # Between cards: skip array brackets, commas and code fences
+                if ch == "{":
+                    self._depth = 1
+                    start = i
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+
+            if ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._parts.append(chunk[start:i + 1])
+                    card = self._finish_object("".join(self._parts))
+                    self._parts = []
+                    if card is not None:
+                        cards.append(card)
+
+        if self._depth and start >= 0:
+            self._parts.append(chunk[start:])
+        return cards
+
+    def close(self) -> list[dict]:
+        """Finish the stream, returning a fallback card if nothing parsed.
+
+        An object left open at the end (e.g. the output hit ``max_tokens``)
+        counts as malformed.  If the model answered in prose with no JSON at
+        all, the text is wrapped in a single ``text_report`` card.
+        """
+        if self._depth:
+            self.cards_malformed += 1
+            logger.warning("Canvas output ended inside an unterminated card object")
+            self._parts = []
+            self._depth = 0
+
+        if self.cards_parsed or self.cards_malformed:
+            return []
+
+        content = _strip_code_fence("".join(self._text).strip())
+        if not content or content in ("[]", "{}"):
+            return []
+        logger.warning("Canvas output contained no card objects, using text report")
+        return [{
+            "type": "text_report",
+            "title": "Analysis Results",
+            "source": "meraki",
+            "data": {"content": content},
+        }]
+
+    def _finish_object(self, text: str) -> dict | None:
+        try:
+            card = json.loads(text)
+        except json.JSONDecodeError:
+            card = None
+        if not isinstance(card, dict) or "type" not in card:
+            self.cards_malformed += 1
+            logger.warning("Skipping malformed card from canvas output (%d chars)", len(text))
+            return None
+        self.cards_parsed += 1
+        return card
+
+
+def _strip_code_fence(content: str) -> str:
+    """Remove a surrounding markdown code block, if present."""
+    if not content.startswith("```"):
+        return content
+    lines = content.split("\n")[1:]
+    if lines and lines[-1].strip() == "```":
+        lines = lines[:-1]
+    return "\n".join(lines)
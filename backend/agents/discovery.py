@@ -3,13 +3,13 @@
 from __future__ import annotations
 
 import logging
-import re
 
 from langchain_anthropic import ChatAnthropic
-from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+from langchain_core.messages import HumanMessage, SystemMessage, ToolMessage
 
+from agents.canvas_agent import cancel_canvas_prefetch, start_canvas_prefetch
 from agents.state import AgentState
-from agents.table_extractor import extract_network_table
+from agents.table_extractor import extract_tables, strip_markdown_tables
 from agents.tools import build_langchain_tools
 from config import settings
 from prompts import load_prompt
@@ -48,13 +48,22 @@ async def discovery_node(state: AgentState) -> dict:
     tool_results = list(state.get("tool_results", []))
 
     max_iterations = 10
+    canvas_prefetch_id = ""
     for _ in range(max_iterations):
+        # Once tools have run, this turn may be the final synthesis: build the
+        # cards from the tool results alongside it.
+        canvas_prefetch_id = start_canvas_prefetch(state, tool_results)
+
         response = await llm_with_tools.ainvoke(messages)
         messages.append(response)
 
         if not response.tool_calls:
             break
 
+        # More tool calls: the prefetched cards would miss their results
+        cancel_canvas_prefetch(canvas_prefetch_id)
+        canvas_prefetch_id = ""
+
         for tool_call in response.tool_calls:
             tool_name = tool_call["name"]
             tool_args = tool_call["args"]
@@ -92,42 +101,19 @@ async def discovery_node(state: AgentState) -> dict:
             messages.append(ToolMessage(content=str(result), tool_call_id=tool_call["id"]))
 
     # Extract structured table data for interactive hover popups
-    table_data = extract_network_table(tool_results)
+    table_data = await extract_tables(tool_results)
     logger.info("Discovery node: extracted %d table_data entries from %d tool_results",
                 len(table_data), len(tool_results))
 
     # If we have interactive tables, strip duplicate markdown tables from the
     # LLM response so the user doesn't see the same data twice.
     if table_data:
-        response = _strip_markdown_tables(response)
+        response = strip_markdown_tables(response)
 
     return {
         "messages": [HumanMessage(content=query), response],
         "tool_results": tool_results,
         "agent_events": agent_events,
+        "canvas_prefetch_id": canvas_prefetch_id,
         "table_data": table_data,
     }
-
-
-# Regex matching a full markdown table (header row, separator row, data rows)
-_MD_TABLE_RE = re.compile(
-    r"(?m)"                   # multiline
-    r"^[ \t]*\|.+\|[ \t]*\n"  # header row
-    r"^[ \t]*\|[-:\s|]+\|[ \t]*\n"  # separator row
-    r"(?:^[ \t]*\|.+\|[ \t]*\n?)+"  # one or more data rows
-)
-
-
-def _strip_markdown_tables(msg: AIMessage) -> AIMessage:
-    """Return a copy of the AI message with markdown tables removed."""
-    content = msg.content
-    if not isinstance(content, str):
-        return msg
-    cleaned = _MD_TABLE_RE.sub("", content)
-    # Collapse runs of blank lines left behind
-    cleaned = re.sub(r"\n{3,}", "\n\n", cleaned).strip()
-    if cleaned == content.strip():
-        return msg
-    logger.info("Stripped markdown table(s) from discovery response (%d -> %d chars)",
-                len(content), len(cleaned))
-    return AIMessage(content=cleaned, id=msg.id)
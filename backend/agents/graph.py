@@ -2,7 +2,14 @@
 
 from __future__ import annotations
 
+import functools
+import logging
+from collections.abc import Awaitable, Callable, Sequence
+from contextlib import AsyncExitStack
+
+from langgraph.checkpoint.memory import InMemorySaver
 from langgraph.graph import END, StateGraph
+from langgraph.graph.state import CompiledStateGraph
 
 from agents.canvas_agent import canvas_node
 from agents.compliance import compliance_node
@@ -11,25 +18,46 @@ from agents.orchestrator import orchestrator_node, route_to_specialist
 from agents.security import security_node
 from agents.state import AgentState
 from agents.troubleshooting import troubleshooting_node
+from config import settings
+from metrics import GRAPH_NODE_DURATION
+from state.session import session_store
+
+logger = logging.getLogger(__name__)
 
 
 def _route_after_specialist(state: AgentState) -> str:
-    """Route to canvas if cards were requested, otherwise end."""
+    """Route to canvas if cards were requested, otherwise end.
+
+    When cards were requested the specialist has usually started the canvas
+    run speculatively alongside its final model turn (see
+    ``start_canvas_prefetch``); the canvas node then only waits for it.  If
+    no run survived (no tool results, a failed last tool call, or the tool loop
+    hit its iteration limit), the canvas node generates the cards itself.
+    """
     if state.get("generate_cards", False):
         return "canvas"
     return "__end__"
 
 
+def _timed(name: str, node: Callable[[AgentState], Awaitable[dict]]) -> Callable[[AgentState], Awaitable[dict]]:
+    """Wrap a node so its duration is recorded in the node latency histogram."""
+    @functools.wraps(node)
+    async def run(state: AgentState) -> dict:
+        with GRAPH_NODE_DURATION.time(node=name):
+            return await node(state)
+    return run
+
+
 # Build the multi-agent graph
 graph_builder = StateGraph(AgentState)
 
 # Add nodes
-graph_builder.add_node("orchestrator", orchestrator_node)
-graph_builder.add_node("troubleshooting", troubleshooting_node)
-graph_builder.add_node("compliance", compliance_node)
-graph_builder.add_node("security", security_node)
-graph_builder.add_node("discovery", discovery_node)
-graph_builder.add_node("canvas", canvas_node)
+graph_builder.add_node("orchestrator", _timed("orchestrator", orchestrator_node))
+graph_builder.add_node("troubleshooting", _timed("troubleshooting", troubleshooting_node))
+graph_builder.add_node("compliance", _timed("compliance", compliance_node))
+graph_builder.add_node("security", _timed("security", security_node))
+graph_builder.add_node("discovery", _timed("discovery", discovery_node))
+graph_builder.add_node("canvas", _timed("canvas", canvas_node))
 
 # Entry point
 graph_builder.set_entry_point("orchestrator")
@@ -57,5 +85,78 @@ for agent_name in ["troubleshooting", "compliance", "security", "discovery"]:
 
 graph_builder.add_edge("canvas", END)
 
-# Compile the graph
+# Compile the graph.  The stateless graph takes the whole conversation as
+# input on every run; the checkpointed one (set up at startup) keeps each
+# session's state under thread_id=session_id and only needs the new query.
 agent_graph = graph_builder.compile()
+_checkpointed_graph: CompiledStateGraph | None = None
+_saver = None
+
+
+class _LatestOnlySaver(InMemorySaver):
+    """In-memory checkpointer that can drop all but a thread's latest checkpoint.
+
+    InMemorySaver keeps every checkpoint of every thread, each with the run's
+    tool results and table data.  The runner prunes a thread after each query
+    and the session store drops it with its session, so memory stays bounded
+    by the session limits.
+    """
+
+    def prune(self, thread_ids: Sequence[str], *, strategy: str = "keep_latest") -> None:
+        for thread_id in thread_ids:
+            if strategy == "delete":
+                self.delete_thread(thread_id)
+                continue
+            for ns, checkpoints in self.storage.get(thread_id, {}).items():
+                if not checkpoints:
+                    continue
+                latest_id = max(checkpoints)
+                checkpoint, metadata, _ = checkpoints[latest_id]
+                self.storage[thread_id][ns] = {latest_id: (checkpoint, metadata, None)}
+                # Keep only the channel values and pending writes the latest checkpoint uses
+                versions = self.serde.loads_typed(checkpoint)["channel_versions"]
+                for key in [k for k in self.blobs if k[:2] == (thread_id, ns) and versions.get(k[2]) != k[3]]:
+                    del self.blobs[key]
+                for key in [k for k in self.writes if k[:2] == (thread_id, ns) and k[2] != latest_id]:
+                    del self.writes[key]
+
+    async def aprune(self, thread_ids: Sequence[str], *, strategy: str = "keep_latest") -> None:
+        self.prune(thread_ids, strategy=strategy)
+
+
+async def open_checkpointer(stack: AsyncExitStack) -> None:
+    """Compile the checkpointed graph with the configured checkpointer.
+
+    ``CHECKPOINTER`` selects "memory", "sqlite" (needs
+    langgraph-checkpoint-sqlite) or "" to always use the stateless graph.
+    In-memory threads are dropped when their session leaves the session
+    store; SQLite threads outlive eviction like the session database does.
+    """
+    global _checkpointed_graph, _saver
+    if settings.checkpointer == "memory":
+        saver = _LatestOnlySaver()
+        session_store.add_drop_listener(saver.delete_thread)
+    elif settings.checkpointer == "sqlite":
+        from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+        saver = await stack.enter_async_context(AsyncSqliteSaver.from_conn_string(settings.checkpoint_db_path))
+    else:
+        return
+    _saver = saver
+    _checkpointed_graph = graph_builder.compile(checkpointer=saver)
+    logger.info("Agent graph checkpointing enabled (%s)", settings.checkpointer)
+
+
+def get_checkpointed_graph() -> CompiledStateGraph | None:
+    """The checkpointed graph, or None if checkpointing is disabled."""
+    return _checkpointed_graph
+
+
+async def prune_checkpoints(thread_id: str) -> None:
+    """Drop all but a thread's latest checkpoint, if the checkpointer supports it."""
+    if _saver is None:
+        return
+    try:
+        await _saver.aprune([thread_id])
+    except NotImplementedError:
+        pass
@@ -75,10 +75,14 @@ async def orchestrator_node(state: AgentState) -> dict:
 
     # Check if this is a follow-up request to show previous results as cards
     if _is_card_followup(query):
-        logger.info("Orchestrator detected card follow-up request: %s", query[:100])
+        previous = state.get("previous_tool_results", [])
+        logger.info("Orchestrator detected card follow-up request (%d stored tool results): %s",
+                    len(previous), query[:100])
+        # Reuse the last query's tool results so the canvas needs no MCP calls
         return {
             "active_agent": "canvas",
             "generate_cards": True,
+            "tool_results": previous,
             "agent_events": [{"type": "agent_start", "agent": "canvas"}],
         }
 
@@ -7,7 +7,9 @@ import logging
 from langchain_anthropic import ChatAnthropic
 from langchain_core.messages import HumanMessage, SystemMessage, ToolMessage
 
+from agents.canvas_agent import cancel_canvas_prefetch, start_canvas_prefetch
 from agents.state import AgentState
+from agents.table_extractor import extract_tables, strip_markdown_tables
 from agents.tools import build_langchain_tools
 from config import settings
 from prompts import load_prompt
@@ -46,13 +48,22 @@ async def security_node(state: AgentState) -> dict:
     tool_results = list(state.get("tool_results", []))
 
     max_iterations = 10
+    canvas_prefetch_id = ""
     for _ in range(max_iterations):
+        # Once tools have run, this turn may be the final synthesis: build the
+        # cards from the tool results alongside it.
+        canvas_prefetch_id = start_canvas_prefetch(state, tool_results)
+
         response = await llm_with_tools.ainvoke(messages)
         messages.append(response)
 
         if not response.tool_calls:
             break
 
+        # More tool calls: the prefetched cards would miss their results
+        cancel_canvas_prefetch(canvas_prefetch_id)
+        canvas_prefetch_id = ""
+
         for tool_call in response.tool_calls:
             tool_name = tool_call["name"]
             tool_args = tool_call["args"]
@@ -89,8 +100,20 @@ async def security_node(state: AgentState) -> dict:
 
             messages.append(ToolMessage(content=str(result), tool_call_id=tool_call["id"]))
 
+    # Extract structured table data for interactive hover popups
+    table_data = await extract_tables(tool_results)
+    logger.info("Security node: extracted %d table_data entries from %d tool_results",
+                len(table_data), len(tool_results))
+
+    # If we have interactive tables, strip duplicate markdown tables from the
+    # LLM response so the user doesn't see the same data twice.
+    if table_data:
+        response = strip_markdown_tables(response)
+
     return {
         "messages": [HumanMessage(content=query), response],
         "tool_results": tool_results,
         "agent_events": agent_events,
+        "canvas_prefetch_id": canvas_prefetch_id,
+        "table_data": table_data,
     }
@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import operator
 from typing import Annotated, TypedDict
 
 from langgraph.graph.message import add_messages
@@ -16,6 +15,8 @@ class AgentState(TypedDict):
     active_agent: str  # Which specialist is currently active
     generate_cards: bool  # Whether to generate canvas cards for this query
     tool_results: list[dict]  # Collected MCP tool outputs
+    previous_tool_results: list[dict]  # Tool outputs kept from the session's last query
     cards: list[dict]  # Card directives to send to frontend
     agent_events: list[dict]  # Progress events for streaming
-    table_data: Annotated[list[dict], operator.add]  # Structured table data for interactive hover popups
+    canvas_prefetch_id: str  # Handle of a canvas run started during the specialist's final turn
+    table_data: list[dict]  # Structured table data for interactive hover popups
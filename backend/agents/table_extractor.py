@@ -1,140 +1,392 @@
-"""Utility to extract structured table data from raw MCP tool results."""
+"""Utility to extract structured table data from raw MCP tool results.
+
+Each entity type (networks, devices, clients, ...) is described by a
+``TableExtractor`` in a registry.  An extractor declares which tools produce
+its rows, the table columns, and how one record maps to cells and hover-popup
+metadata.  ``extract_tables`` parses every tool result once and hands the
+parsed value to all extractors registered for that tool.
+
+When the Meraki MCP server truncates a large result it returns only a preview
+plus a ``_full_response_cached`` handle; the full dataset is loaded from that
+handle so the interactive table is complete.  Stale cached lists arrive wrapped
+as ``{"_stale": true, "items": [...]}`` and are unwrapped the same way (both
+in ``mcp_client.results``).
+"""
 
 from __future__ import annotations
 
-import json
 import logging
+import re
 import uuid
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from langchain_core.messages import AIMessage
+
+from mcp_client.results import load_full_response, parse_result, unwrap_stale
 
 logger = logging.getLogger(__name__)
 
-# Tool names and method names that return organization networks
-_NETWORK_TOOL_NAMES = {"getOrganizationNetworks", "getorganizationnetworks"}
-_NETWORK_METHOD_NAMES = {"getOrganizationNetworks", "getorganizationnetworks"}
+# Keys under which MCP servers wrap the record list of a response
+_WRAPPER_KEYS = ("_sample", "data", "results", "items", "_preview")
 
+@dataclass(frozen=True)
+class TableExtractor:
+    """Describes how to turn one kind of tool result into an interactive table.
 
-def _is_network_result(result: dict) -> bool:
-    """Check if a tool result contains organization network data."""
-    tool_name = result.get("tool", "")
+    ``row`` maps a record (plus the tool call's args) to ``(row_id, cells,
+    metadata)``, or returns None to skip the record.
+    """
 
-    # Direct match: getOrganizationNetworks tool
-    if tool_name.lower().rstrip() in _NETWORK_TOOL_NAMES:
-        return True
+    entity_type: str
+    tools: frozenset[str]  # Tool names or call_meraki_api methods, lowercase
+    columns: list[str]
+    row: Callable[[dict, dict], tuple[str, list[str], dict] | None]
+    source: str = "meraki"
+    list_keys: tuple[str, ...] = field(default=())  # Entity-specific wrapper keys, tried first
 
-    # Generic call_meraki_api tool with networks method
-    if tool_name == "call_meraki_api":
-        args = result.get("args", {})
-        method = args.get("method", "")
-        if method.lower() in _NETWORK_METHOD_NAMES:
-            return True
 
-    return False
+_EXTRACTORS: dict[str, list[TableExtractor]] = {}
 
 
-def extract_network_table(tool_results: list[dict]) -> list[dict]:
-    """Find getOrganizationNetworks results and build structured table data.
+def register_extractor(extractor: TableExtractor) -> None:
+    """Register an extractor for each tool it handles."""
+    for tool in extractor.tools:
+        _EXTRACTORS.setdefault(tool, []).append(extractor)
+
+
+async def extract_tables(tool_results: list[dict]) -> list[dict]:
+    """Build structured table data from every recognised tool result.
 
     Returns a list of table_data dicts suitable for sending as WebSocket events.
     """
     tables = []
-    logger.info("extract_network_table: scanning %d tool results", len(tool_results))
+    logger.info("extract_tables: scanning %d tool results", len(tool_results))
 
     for result in tool_results:
-        tool_name = result.get("tool", "")
-
-        if not _is_network_result(result):
+        extractors = _EXTRACTORS.get(_tool_key(result))
+        if not extractors:
             continue
 
-        logger.info("extract_network_table: found network result from tool '%s'", tool_name)
-
+        tool_name = result.get("tool", "")
         raw = result.get("result", "")
-        networks = _parse_result(raw)
-
-        if networks is None:
-            logger.warning("extract_network_table: failed to parse result from '%s' (raw type: %s, length: %s)",
+        parsed = unwrap_stale(parse_result(raw))  # Parsed once, shared by all extractors for this tool
+        if parsed is None:
+            logger.warning("extract_tables: failed to parse result from '%s' (raw type: %s, length: %s)",
                            tool_name, type(raw).__name__, len(raw) if isinstance(raw, str) else "N/A")
             continue
 
-        # Handle truncated responses — the MCP may wrap large results
-        if isinstance(networks, dict):
-            # Check for sample/data fields in truncated responses
-            sample = networks.get("_sample") or networks.get("data") or networks.get("results")
-            if isinstance(sample, list):
-                logger.info("extract_network_table: extracted %d networks from wrapped response", len(sample))
-                networks = sample
-            else:
-                logger.warning("extract_network_table: result is a dict, not a list (keys: %s)",
-                               list(networks.keys())[:10])
-                continue
-
-        if not isinstance(networks, list):
-            logger.warning("extract_network_table: parsed result is %s, not a list", type(networks).__name__)
-            continue
+        if isinstance(parsed, dict) and parsed.get("_full_response_cached"):
+            full = await load_full_response(parsed)
+            if full is not None:
+                parsed = full
+
+        args = result.get("args", {})
+        if result.get("tool") == "call_meraki_api":
+            # Generic calls carry the API params (possibly as a JSON string)
+            params = parse_result(args.get("parameters", {}))
+            args = params if isinstance(params, dict) else {}
 
-        logger.info("extract_network_table: building rows from %d networks", len(networks))
-
-        rows = []
-        for net in networks:
-            if not isinstance(net, dict):
-                continue
-
-            network_id = net.get("id", "")
-            name = net.get("name", "")
-            product_types = net.get("productTypes", [])
-            time_zone = net.get("timeZone", "")
-            tags = net.get("tags", [])
-            notes = net.get("notes", "")
-
-            # Ensure tags is a list
-            if isinstance(tags, str):
-                tags = [t.strip() for t in tags.split(",") if t.strip()] if tags else []
-
-            rows.append({
-                "id": network_id,
-                "cells": [
-                    name,
-                    ", ".join(product_types) if isinstance(product_types, list) else str(product_types),
-                    time_zone,
-                    ", ".join(tags) if tags else "",
-                ],
-                "metadata": {
-                    "networkId": network_id,
-                    "notes": notes or None,
-                    "tags": tags if tags else None,
-                    "timeZone": time_zone or None,
-                    "productTypes": product_types if product_types else None,
-                },
-            })
-
-        if rows:
-            table = {
-                "table_id": f"tbl-{uuid.uuid4().hex[:8]}",
-                "entity_type": "network",
-                "source": "meraki",
-                "columns": ["Name", "Product Types", "Time Zone", "Tags"],
-                "rows": rows,
-            }
-            tables.append(table)
-            logger.info("extract_network_table: built table with %d rows (id=%s)", len(rows), table["table_id"])
-        else:
-            logger.warning("extract_network_table: no valid rows extracted from %d networks", len(networks))
+        for extractor in extractors:
+            table = _build_table(extractor, parsed, args)
+            if table is not None:
+                tables.append(table)
+                logger.info("extract_tables: built %s table with %d rows from '%s' (id=%s)",
+                            extractor.entity_type, len(table["rows"]), tool_name, table["table_id"])
 
     if not tables:
-        logger.info("extract_network_table: no network tables extracted from tool results")
+        logger.info("extract_tables: no tables extracted from tool results")
 
     return tables
 
 
-def _parse_result(raw: object) -> object | None:
-    """Try to parse a tool result into a Python object."""
-    if isinstance(raw, list):
-        return raw
-    if isinstance(raw, dict):
-        return raw
-    if isinstance(raw, str):
-        try:
-            return json.loads(raw)
-        except (json.JSONDecodeError, ValueError):
-            logger.debug("extract_network_table: json.loads failed on string of length %d", len(raw))
-            return None
+# Regex matching a full markdown table (header row, separator row, data rows)
+_MD_TABLE_RE = re.compile(
+    r"(?m)"                   # multiline
+    r"^[ \t]*\|.+\|[ \t]*\n"  # header row
+    r"^[ \t]*\|[-:\s|]+\|[ \t]*\n"  # separator row
+    r"(?:^[ \t]*\|.+\|[ \t]*\n?)+"  # one or more data rows
+)
+
+
+def strip_markdown_tables(msg: AIMessage) -> AIMessage:
+    """Return a copy of the AI message with markdown tables removed.
+
+    Specialists call this when interactive tables were extracted, so the user
+    doesn't see the same data twice.
+    """
+    content = msg.content
+    if not isinstance(content, str):
+        return msg
+    cleaned = _MD_TABLE_RE.sub("", content)
+    # Collapse runs of blank lines left behind
+    cleaned = re.sub(r"\n{3,}", "\n\n", cleaned).strip()
+    if cleaned == content.strip():
+        return msg
+    logger.info("Stripped markdown table(s) from specialist response (%d -> %d chars)",
+                len(content), len(cleaned))
+    return AIMessage(content=cleaned, id=msg.id)
+
+
+def _tool_key(result: dict) -> str:
+    """Registry key for a tool result: the tool name or the generic API method."""
+    tool_name = result.get("tool", "").strip()
+    if tool_name == "call_meraki_api":
+        return str(result.get("args", {}).get("method", "")).lower()
+    return tool_name.lower()
+
+
+def _build_table(extractor: TableExtractor, parsed: object, args: dict) -> dict | None:
+    records = _records(parsed, extractor.list_keys)
+    if records is None:
+        logger.warning("extract_tables: %s result has no record list (type: %s)",
+                       extractor.entity_type, type(parsed).__name__)
+        return None
+
+    rows = []
+    for record in records:
+        if not isinstance(record, dict):
+            continue
+        built = extractor.row(record, args)
+        if built is None:
+            continue
+        row_id, cells, metadata = built
+        rows.append({"id": row_id, "cells": cells, "metadata": metadata})
+
+    if not rows:
+        logger.warning("extract_tables: no valid %s rows extracted from %d records",
+                       extractor.entity_type, len(records))
+        return None
+
+    return {
+        "table_id": f"tbl-{uuid.uuid4().hex[:8]}",
+        "entity_type": extractor.entity_type,
+        "source": extractor.source,
+        "columns": list(extractor.columns),
+        "rows": rows,
+    }
+
+
+def _records(parsed: object, list_keys: tuple[str, ...]) -> list | None:
+    """Find the record list in a parsed result, unwrapping response envelopes."""
+    if isinstance(parsed, list):
+        return parsed
+    if not isinstance(parsed, dict):
+        return None
+    for key in (*list_keys, *_WRAPPER_KEYS):
+        if isinstance(parsed.get(key), list):
+            return parsed[key]
     return None
+
+
+def _join(value: object) -> str:
+    if isinstance(value, list):
+        return ", ".join(str(v) for v in value)
+    return "" if value is None else str(value)
+
+
+def _as_list(value: object) -> list:
+    """Normalise tag-like values: lists pass through, comma strings are split."""
+    if isinstance(value, list):
+        return value
+    if isinstance(value, str):
+        return [t.strip() for t in value.split(",") if t.strip()]
+    return []
+
+
+def _yes_no(value: object) -> str:
+    if value is None:
+        return ""
+    return "Yes" if value else "No"
+
+
+# ---------------------------------------------------------------------------
+# Entity extractors
+# ---------------------------------------------------------------------------
+
+def _network_row(net: dict, args: dict) -> tuple[str, list[str], dict]:
+    network_id = net.get("id", "")
+    product_types = net.get("productTypes", [])
+    time_zone = net.get("timeZone", "")
+    tags = _as_list(net.get("tags", []))
+    return network_id, [
+        net.get("name", ""),
+        _join(product_types),
+        time_zone,
+        _join(tags),
+    ], {
+        "networkId": network_id,
+        "notes": net.get("notes") or None,
+        "tags": tags or None,
+        "timeZone": time_zone or None,
+        "productTypes": product_types or None,
+    }
+
+
+def _device_row(dev: dict, args: dict) -> tuple[str, list[str], dict] | None:
+    serial = dev.get("serial", "")
+    if not serial:
+        return None
+    return serial, [
+        dev.get("name") or serial,
+        dev.get("model", ""),
+        serial,
+        dev.get("mac", ""),
+        dev.get("lanIp") or "",
+        dev.get("firmware", ""),
+    ], {
+        "networkId": dev.get("networkId") or args.get("networkId"),
+        "serial": serial,
+        "model": dev.get("model") or None,
+        "productType": dev.get("productType") or None,
+        "firmware": dev.get("firmware") or None,
+        "tags": _as_list(dev.get("tags")) or None,
+        "address": dev.get("address") or None,
+    }
+
+
+def _client_row(client: dict, args: dict) -> tuple[str, list[str], dict]:
+    client_id = client.get("id") or client.get("mac", "")
+    usage = client.get("usage") or {}
+    return client_id, [
+        client.get("description") or client.get("mac", ""),
+        client.get("ip") or "",
+        client.get("mac", ""),
+        client.get("manufacturer") or "",
+        client.get("os") or "",
+        client.get("ssid") or "",
+        client.get("status") or "",
+    ], {
+        "networkId": args.get("networkId"),
+        "clientId": client_id,
+        "mac": client.get("mac") or None,
+        "vlan": client.get("vlan"),
+        "ssid": client.get("ssid") or None,
+        "recentDeviceSerial": client.get("recentDeviceSerial") or None,
+        "usageSent": usage.get("sent"),
+        "usageRecv": usage.get("recv"),
+    }
+
+
+def _ssid_row(ssid: dict, args: dict) -> tuple[str, list[str], dict]:
+    number = ssid.get("number", "")
+    network_id = args.get("networkId")
+    return f"{network_id}:{number}", [
+        str(number),
+        ssid.get("name", ""),
+        _yes_no(ssid.get("enabled")),
+        ssid.get("authMode", ""),
+        ssid.get("encryptionMode") or "",
+        ssid.get("bandSelection") or "",
+    ], {
+        "networkId": network_id,
+        "number": number,
+        "enabled": ssid.get("enabled"),
+        "authMode": ssid.get("authMode") or None,
+        "visible": ssid.get("visible"),
+        "ipAssignmentMode": ssid.get("ipAssignmentMode") or None,
+    }
+
+
+def _switch_port_row(port: dict, args: dict) -> tuple[str, list[str], dict]:
+    serial = args.get("serial", "")
+    port_id = str(port.get("portId", ""))
+    return f"{serial}:{port_id}", [
+        port_id,
+        port.get("name") or "",
+        _yes_no(port.get("enabled")),
+        port.get("type", ""),
+        _join(port.get("vlan")),
+        _yes_no(port.get("poeEnabled")),
+    ], {
+        "serial": serial or None,
+        "portId": port_id,
+        "vlan": port.get("vlan"),
+        "voiceVlan": port.get("voiceVlan"),
+        "allowedVlans": port.get("allowedVlans") or None,
+        "tags": _as_list(port.get("tags")) or None,
+    }
+
+
+def _event_row(event: dict, args: dict) -> tuple[str, list[str], dict]:
+    occurred_at = event.get("occurredAt", "")
+    row_id = f"{occurred_at}:{event.get('type', '')}:{event.get('deviceSerial') or event.get('clientMac') or ''}"
+    return row_id, [
+        occurred_at,
+        event.get("type", ""),
+        event.get("description", ""),
+        event.get("deviceName") or event.get("deviceSerial") or "",
+        event.get("clientDescription") or event.get("clientMac") or "",
+    ], {
+        "networkId": event.get("networkId") or args.get("networkId"),
+        "category": event.get("category") or None,
+        "deviceSerial": event.get("deviceSerial") or None,
+        "clientMac": event.get("clientMac") or None,
+        "eventData": event.get("eventData") or None,
+    }
+
+
+def _te_test_row(test: dict, args: dict) -> tuple[str, list[str], dict] | None:
+    test_id = str(test.get("testId") or test.get("id") or "")
+    if not test_id:
+        return None
+    return test_id, [
+        test.get("testName") or test.get("name", ""),
+        test.get("type", ""),
+        test.get("url") or test.get("server") or test.get("domain") or "",
+        _join(test.get("interval")),
+        _yes_no(test.get("enabled")),
+    ], {
+        "testId": test_id,
+        "type": test.get("type") or None,
+        "interval": test.get("interval"),
+        "alertsEnabled": test.get("alertsEnabled"),
+        "createdDate": test.get("createdDate") or None,
+    }
+
+
+register_extractor(TableExtractor(
+    entity_type="network",
+    tools=frozenset({"getorganizationnetworks"}),
+    columns=["Name", "Product Types", "Time Zone", "Tags"],
+    row=_network_row,
+))
+register_extractor(TableExtractor(
+    entity_type="device",
+    tools=frozenset({"getorganizationdevices", "getnetworkdevices"}),
+    columns=["Name", "Model", "Serial", "MAC", "LAN IP", "Firmware"],
+    row=_device_row,
+))
+register_extractor(TableExtractor(
+    entity_type="client",
+    tools=frozenset({"getnetworkclients"}),
+    columns=["Description", "IP", "MAC", "Manufacturer", "OS", "SSID", "Status"],
+    row=_client_row,
+))
+register_extractor(TableExtractor(
+    entity_type="ssid",
+    tools=frozenset({"getnetworkwirelessssids"}),
+    columns=["#", "Name", "Enabled", "Auth Mode", "Encryption", "Band Selection"],
+    row=_ssid_row,
+))
+register_extractor(TableExtractor(
+    entity_type="switch_port",
+    tools=frozenset({"getdeviceswitchports"}),
+    columns=["Port", "Name", "Enabled", "Type", "VLAN", "PoE"],
+    row=_switch_port_row,
+))
+register_extractor(TableExtractor(
+    entity_type="event",
+    tools=frozenset({"getnetworkevents"}),
+    columns=["Time", "Type", "Description", "Device", "Client"],
+    row=_event_row,
+    list_keys=("events",),
+))
+register_extractor(TableExtractor(
+    entity_type="te_test",
+    tools=frozenset({"list_network_app_synthetics_tests"}),
+    columns=["Name", "Type", "Target", "Interval", "Enabled"],
+    row=_te_test_row,
+    source="thousandeyes",
+    list_keys=("tests",),
+))
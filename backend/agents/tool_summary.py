@@ -0,0 +1,235 @@
+"""Compact statistical summaries of MCP tool results for the canvas agent."""
+
+from __future__ import annotations
+
+import json
+import logging
+from collections import Counter
+from datetime import datetime
+
+from mcp_client.results import parse_result, unwrap_stale
+
+logger = logging.getLogger(__name__)
+
+# Limits that keep a summary small whatever the payload size
+_MAX_FIELDS = 40
+_TOP_VALUES = 5
+_SAMPLE_ROWS = 3
+_TIME_BUCKETS = 12
+_SERIES_FIELDS = 4
+_MAX_CELL_CHARS = 120
+_MAX_OBJECT_CHARS = 2000
+_MAX_TEXT_CHARS = 2000
+
+# Keys that wrap the actual list in Meraki/ThousandEyes responses
+_LIST_KEYS = ("data", "results", "items", "_sample")
+
+
+def summarize_tool_result(raw: object) -> str:
+    """Summarize a raw tool result as compact JSON aggregates.
+
+    Lists of records become row counts, per-field distinct counts, numeric
+    min/max/percentiles, top categories and a small time-bucketed series,
+    computed over every row.  Small objects are passed through whole.
+    Unparseable text falls back to a truncated preview.
+    """
+    parsed = unwrap_stale(parse_result(raw))
+    if parsed is None:
+        text = str(raw)
+        if len(text) <= _MAX_TEXT_CHARS:
+            return text
+        return f"{text[:_MAX_TEXT_CHARS]}... ({len(text)} chars, truncated)"
+
+    return json.dumps(_summarize(parsed), separators=(",", ":"), default=str)
+
+
+def _summarize(value: object) -> object:
+    if isinstance(value, list):
+        return _summarize_list(value)
+    if not isinstance(value, dict):
+        return value
+
+    # Truncated MCP response: only a preview of the full dataset is present
+    if value.get("_response_truncated"):
+        preview = value.get("_preview")
+        return {
+            "truncated": True,
+            "total_items": value.get("_total_items"),
+            "full_response_cached": value.get("_full_response_cached"),
+            "preview": _summarize(preview) if isinstance(preview, list) else preview,
+        }
+
+    for key in _LIST_KEYS:
+        if isinstance(value.get(key), list):
+            other = {k: v for k, v in value.items() if k != key and not isinstance(v, (list, dict))}
+            return {**other, key: _summarize_list(value[key])}
+
+    if len(json.dumps(value, default=str)) <= _MAX_OBJECT_CHARS:
+        return value
+
+    # Large object: keep scalars, summarize nested lists, describe nested objects
+    summary: dict = {}
+    for key, item in list(value.items())[:_MAX_FIELDS]:
+        if isinstance(item, list):
+            summary[key] = _summarize_list(item)
+        elif isinstance(item, dict):
+            summary[key] = {"object_keys": list(item.keys())[:_MAX_FIELDS]}
+        else:
+            summary[key] = _clip(item)
+    return summary
+
+
+def _summarize_list(items: list) -> dict:
+    records = [item for item in items if isinstance(item, dict)]
+    if not records:
+        return {"count": len(items), **_scalar_stats(items)}
+
+    # Single pass over the rows collecting values per field
+    columns: dict[str, list] = {}
+    for record in records:
+        for key, val in record.items():
+            if key not in columns and len(columns) >= _MAX_FIELDS:
+                continue
+            columns.setdefault(key, []).append(val)
+
+    fields = {}
+    time_field = None
+    numeric_fields = []
+    for key, values in columns.items():
+        stats = _scalar_stats(values)
+        stats["missing"] = len(records) - sum(1 for v in values if v is not None)
+        fields[key] = stats
+        if stats.get("type") == "time" and time_field is None:
+            time_field = key
+        elif stats.get("type") == "number":
+            numeric_fields.append(key)
+
+    summary: dict = {"count": len(items), "fields": fields}
+    if time_field:
+        summary["series"] = _time_series(records, time_field, numeric_fields[:_SERIES_FIELDS])
+    summary["sample"] = [
+        {k: _clip(v) for k, v in record.items()} for record in records[:_SAMPLE_ROWS]
+    ]
+    return summary
+
+
+def _scalar_stats(values: list) -> dict:
+    present = [v for v in values if v is not None]
+    if not present:
+        return {"type": "empty"}
+
+    numbers = [v for v in present if isinstance(v, (int, float)) and not isinstance(v, bool)]
+    if len(numbers) == len(present):
+        return {"type": "number", **_numeric_stats(numbers)}
+
+    if all(isinstance(v, list) for v in present):
+        # Multi-valued fields such as tags or productTypes
+        flat = Counter(_hashable(x) for v in present for x in v)
+        return {"type": "list", "distinct": len(flat), "top": flat.most_common(_TOP_VALUES)}
+
+    if all(isinstance(v, dict) for v in present):
+        keys = Counter(k for v in present for k in v)
+        return {"type": "object", "keys": [k for k, _ in keys.most_common(_MAX_FIELDS)]}
+
+    counts = Counter(_hashable(v) for v in present)
+    stats: dict = {"type": "category", "distinct": len(counts)}
+    times = _parse_times(present)
+    if times is not None:
+        stats["type"] = "time"
+        stats["min"] = min(times).isoformat()
+        stats["max"] = max(times).isoformat()
+    elif len(counts) < len(present):
+        stats["top"] = counts.most_common(_TOP_VALUES)
+    return stats
+
+
+def _numeric_stats(numbers: list) -> dict:
+    ordered = sorted(numbers)
+
+    def pct(p: float) -> float:
+        return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+    stats = {
+        "min": ordered[0],
+        "max": ordered[-1],
+        "mean": sum(ordered) / len(ordered),
+        "p50": pct(0.5),
+        "p90": pct(0.9),
+        "p99": pct(0.99),
+        "sum": sum(ordered),
+    }
+    return {k: round(v, 3) if isinstance(v, float) else v for k, v in stats.items()}
+
+
+def _parse_times(values: list) -> list[datetime] | None:
+    """Parse values as ISO-8601 timestamps, or return None if they aren't."""
+    if not isinstance(values[0], str) or len(values[0]) < 10:
+        return None
+    times = []
+    for v in values:
+        if not isinstance(v, str):
+            return None
+        try:
+            times.append(datetime.fromisoformat(v))
+        except ValueError:
+            return None
+    # Mixing naive and aware timestamps can't be compared
+    if len({t.tzinfo is None for t in times}) > 1:
+        return None
+    return times
+
+
+def _time_series(records: list[dict], time_field: str, numeric_fields: list[str]) -> dict:
+    """Bucket rows by time: row count and numeric means per bucket."""
+    points = []
+    for record in records:
+        try:
+            points.append((datetime.fromisoformat(record[time_field]), record))
+        except (KeyError, TypeError, ValueError):
+            continue
+    start = min(t for t, _ in points)
+    span = (max(t for t, _ in points) - start).total_seconds()
+    width = span / _TIME_BUCKETS if span else 1.0
+    n_buckets = _TIME_BUCKETS if span else 1
+
+    counts = [0] * n_buckets
+    sums = {f: [0.0] * n_buckets for f in numeric_fields}
+    seen = {f: [0] * n_buckets for f in numeric_fields}
+    for t, record in points:
+        idx = min(n_buckets - 1, int((t - start).total_seconds() / width))
+        counts[idx] += 1
+        for f in numeric_fields:
+            val = record.get(f)
+            if isinstance(val, (int, float)) and not isinstance(val, bool):
+                sums[f][idx] += val
+                seen[f][idx] += 1
+
+    series: dict = {
+        "field": time_field,
+        "bucket_seconds": round(width),
+        "start": start.isoformat(),
+        "count": counts,
+    }
+    for f in numeric_fields:
+        series[f"{f}_mean"] = [
+            round(sums[f][i] / seen[f][i], 3) if seen[f][i] else None for i in range(n_buckets)
+        ]
+    return series
+
+
+def _hashable(value: object) -> object:
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, sort_keys=True, default=str)[:_MAX_CELL_CHARS]
+    if isinstance(value, str):
+        return value[:_MAX_CELL_CHARS]
+    return value
+
+
+def _clip(value: object) -> object:
+    if isinstance(value, str) and len(value) > _MAX_CELL_CHARS:
+        return value[:_MAX_CELL_CHARS] + "..."
+    if isinstance(value, (dict, list)):
+        text = json.dumps(value, default=str)
+        if len(text) > _MAX_CELL_CHARS:
+            return text[:_MAX_CELL_CHARS] + "..."
+    return value
@@ -9,6 +9,7 @@ from langchain_core.tools import StructuredTool
 from pydantic import BaseModel, Field, create_model
 
 from mcp_client.manager import mcp_manager
+from state.inventory import inventory
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +31,61 @@ def _make_invoke(tool_name: str):
     return _invoke
 
 
+# Agents that get the in-memory inventory lookup alongside their MCP tools
+_INVENTORY_AGENTS = {"discovery"}
+
+
+class _InventoryLookupArgs(BaseModel):
+    kind: str = Field(description='One of "summary", "network", "device", "wireless_networks", "models"')
+    value: str = Field(default="", description="Network name/ID for network and models, serial or name for device")
+
+
+async def _lookup_inventory(kind: str, value: str = "") -> str:
+    """Answer an inventory question from the in-memory index."""
+    if not inventory.ready:
+        return "Error: inventory index not loaded yet - use the Meraki tools instead."
+    value = value.strip()
+    if kind == "summary":
+        answer: object = inventory.summary()
+    elif kind == "network":
+        network = inventory.find_network(value)
+        answer = inventory.describe_network(network) if network else f"No network named or with ID '{value}'"
+    elif kind == "device":
+        device = inventory.find_device(value)
+        if device is None:
+            answer = f"No device with serial or name '{value}'"
+        else:
+            network = inventory.network_for_serial(device["serial"])
+            answer = {**device, "networkName": network.get("name") if network else None}
+    elif kind == "wireless_networks":
+        ids = inventory.wireless_network_ids() or set()
+        answer = [{"id": nid, "name": (inventory.find_network(nid) or {}).get("name")} for nid in sorted(ids)]
+    elif kind == "models":
+        network = inventory.find_network(value) if value else None
+        if value and network is None:
+            answer = f"No network named or with ID '{value}'"
+        else:
+            answer = inventory.model_counts(network["id"] if network else None)
+    else:
+        return f"Error: unknown kind '{kind}'"
+    return json.dumps(answer, default=str)
+
+
+def build_inventory_tool() -> StructuredTool:
+    """LangChain tool answering inventory questions from the in-memory index."""
+    return StructuredTool.from_function(
+        coroutine=_lookup_inventory,
+        name="lookup_inventory",
+        description=(
+            "Instant inventory lookups from an index of the organization's networks, devices and SSIDs "
+            "(refreshed every few minutes). Use for counts and lookups: which network a serial is in, "
+            "devices or models in a network, which networks have wireless, SSIDs of a network, an org "
+            "summary. Not for live status, clients or events."
+        ),
+        args_schema=_InventoryLookupArgs,
+    )
+
+
 def build_langchain_tools(agent_type: str) -> list[StructuredTool]:
     """Build LangChain tools from MCP tool descriptors for a given agent type."""
     descriptors = mcp_manager.get_tools_for_agent(agent_type)
@@ -64,5 +120,8 @@ def build_langchain_tools(agent_type: str) -> list[StructuredTool]:
         )
         tools.append(tool)
 
+    if agent_type in _INVENTORY_AGENTS and inventory.ready:
+        tools.append(build_inventory_tool())
+
     logger.info("Built %d LangChain tools for agent '%s'", len(tools), agent_type)
     return tools
@@ -2,7 +2,53 @@
 
 from __future__ import annotations
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+
+class SessionStats(BaseModel):
+    """Session store size, eviction totals and memory footprint."""
+
+    sessions: int
+    max_sessions: int
+    idle_ttl_seconds: int
+    evicted_lru: int
+    evicted_ttl: int
+    messages: int
+    message_chars: int
+    cards: int
+    tool_results: int
+    table_rows: int
+    db_enabled: bool
+    db_pending_writes: int
+    db_batches_written: int
+
+
+class WebSocketStats(BaseModel):
+    """Outbound WebSocket queues across open connections."""
+
+    connections: int
+    queued_events: int
+    max_queue_depth: int
+    queue_limit: int
+    peak_depth: int
+    events_sent: int
+    coalesced: int
+    slow_disconnects: int
+
+
+class InventoryStats(BaseModel):
+    """State of the in-memory inventory index."""
+
+    ready: bool
+    organization_id: str | None = None  # Organization the index was loaded from
+    networks: int
+    devices: int
+    wireless_networks: int
+    ssid_networks_indexed: int
+    age_seconds: int | None
+    refreshes: int
+    incremental_refreshes: int
+    failures: int
 
 
 class HealthResponse(BaseModel):
@@ -14,6 +60,27 @@ class HealthResponse(BaseModel):
     thousandeyes_connected: bool
     thousandeyes_tools: int
     total_tools: int
+    sessions: SessionStats
+    websocket: WebSocketStats
+    inventory: InventoryStats
+
+
+class SourceHealthInfo(BaseModel):
+    """Cached probe result for one MCP source."""
+
+    status: str  # "healthy", "degraded", "down", "not_configured"
+    rtt_ms: float | None = None
+    consecutive_failures: int = 0
+    last_error: str | None = None
+    checked_seconds_ago: float | None = None
+    last_ok_seconds_ago: float | None = None
+
+
+class ReadyResponse(BaseModel):
+    """Readiness: required MCP sources reachable, per the last background probe."""
+
+    ready: bool
+    sources: dict[str, SourceHealthInfo]
 
 
 class SkillInfo(BaseModel):
@@ -38,18 +105,40 @@ class EntityStatsResponse(BaseModel):
     deviceCount: int
     clientCount: int
     ssidCount: int
+    partial: bool = False  # Some counts timed out or failed and are reported as 0
+    missing: list[str] = []  # Which counts are missing: "devices", "clients", "ssids"
+
+
+class BulkEntityStatsRequest(BaseModel):
+    """Networks to fetch stats for in one request."""
+
+    networkIds: list[str]
+
+
+class BulkEntityStatsResponse(BaseModel):
+    """Stats keyed by network ID."""
+
+    stats: dict[str, EntityStatsResponse]
+
+
+class QueryRequest(BaseModel):
+    """A query for the streaming HTTP endpoint."""
+
+    content: str
+    session_id: str = "default"
+    timeout_seconds: float | None = Field(default=None, gt=0)  # Capped at QUERY_TIMEOUT_SECONDS
 
 
 class WebSocketMessage(BaseModel):
     """Incoming WebSocket message from client."""
 
-    type: str  # "user_message"
-    content: str
+    type: str  # "user_message", "stop", "table_page"
+    content: str = ""
     session_id: str = "default"
 
 
 class WebSocketEvent(BaseModel):
     """Outgoing WebSocket event to client."""
 
-    type: str  # "agent_start", "tool_call", "text", "card", "done", "error"
+    type: str  # "agent_start", "tool_call", "text", "card", "table_data", "table_page", "done", "error"
     data: dict | str | None = None
@@ -0,0 +1,291 @@
+"""WebSocket event encoding: the default JSON protocol and batched variants.
+
+Clients negotiate a protocol with the WebSocket subprotocol header.  Without
+one, every event is sent as its own JSON text frame (the original protocol).
+The batched subprotocols coalesce events produced within a short flush window
+into one frame holding an array of events:
+
+- ``agenticops.batch.json``: a JSON text frame
+- ``agenticops.batch.msgpack``: a MessagePack binary frame (needs ``msgpack``)
+
+Events are queued per connection and written by a background task (see
+``EventSender``).  JSON is encoded with ``orjson`` when it is installed.  Compression is
+permessage-deflate, negotiated by the ASGI server (see ``ws_per_message_deflate``).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import weakref
+from collections import deque
+from collections.abc import Callable
+
+from fastapi import WebSocket
+
+from config import settings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional encoding
+    msgpack = None
+
+logger = logging.getLogger(__name__)
+
+BATCH_JSON = "agenticops.batch.json"
+BATCH_MSGPACK = "agenticops.batch.msgpack"
+
+# Events that end a burst: flush right away instead of waiting for the window
+_FLUSH_NOW = {"done", "error"}
+
+# Flush early once this many encoded bytes are queued; also the most one frame carries
+_MAX_BATCH_BYTES = 256 * 1024
+
+
+def supported_subprotocols() -> list[str]:
+    """Subprotocols this server can speak, most preferred first."""
+    protocols = [BATCH_JSON]
+    if msgpack is not None:
+        protocols.insert(0, BATCH_MSGPACK)
+    return protocols
+
+
+def negotiate_subprotocol(websocket: WebSocket) -> str | None:
+    """Pick the client's first requested subprotocol that we support."""
+    supported = supported_subprotocols()
+    for requested in websocket.scope.get("subprotocols", []):
+        if requested in supported:
+            return requested
+    return None
+
+
+def dumps(obj: object) -> str:
+    """Serialize to a JSON string, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, separators=(",", ":"))
+
+
+class _Slot:
+    """One queued event; coalescing replaces ``payload`` while it waits."""
+
+    __slots__ = ("payload", "key")
+
+    def __init__(self, payload: str | bytes, key: str | None) -> None:
+        self.payload = payload
+        self.key = key
+
+
+def _coalesce_key(event_type: str, data: dict | str | None, request_id: str) -> str | None:
+    """Key shared by progress events that supersede each other while queued.
+
+    A queued ``agent_start`` is replaced by the next one for the same query.
+    ``tool_call`` events are never coalesced: the client adds a tool call on
+    "running" and only updates it on "complete", so both must arrive.
+    """
+    if event_type == "agent_start":
+        return f"agent_start:{request_id}"
+    return None
+
+
+class EventSender:
+    """Sends typed events to one client in its negotiated protocol.
+
+    ``send`` only encodes and queues; a writer task drains the queue to the
+    socket, so a slow client never stalls the agent graph.  The queue is
+    bounded (``WS_SEND_QUEUE_MAX``): superseded progress events are coalesced
+    in place, and if the queue stays full for ``WS_SEND_TIMEOUT_SECONDS`` the
+    client is treated as gone.  A failed write closes the sender and calls
+    ``on_disconnect`` so the connection's queries can be cancelled.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        subprotocol: str | None = None,
+        on_disconnect: Callable[[], None] | None = None,
+    ) -> None:
+        self._websocket = websocket
+        self._subprotocol = subprotocol
+        self._on_disconnect = on_disconnect
+        self._queue: deque[_Slot] = deque()
+        self._keyed: dict[str, _Slot] = {}  # Coalescing key -> its queued slot
+        self._ready = asyncio.Event()  # Queue is non-empty
+        self._space = asyncio.Event()  # Queue is below its bound
+        self._space.set()
+        self._urgent = asyncio.Event()  # A done/error event or a full frame is queued: skip the flush window
+        self._queued_bytes = 0
+        self._writer: asyncio.Task | None = None
+        self.closed = False
+        self.peak_depth = 0
+        self.events_sent = 0
+        self.frames_sent = 0
+        self.coalesced = 0
+        _senders.add(self)
+
+    @property
+    def batched(self) -> bool:
+        return self._subprotocol is not None
+
+    @property
+    def depth(self) -> int:
+        return len(self._queue)
+
+    async def send(self, event_type: str, data: dict | str | None, request_id: str = "") -> None:
+        """Queue an event for the writer task.
+
+        Events belonging to a client-tagged query carry its ``request_id``.
+        Waits only while the queue is full; does nothing once closed.
+        """
+        if self.closed:
+            return
+        event = {"type": event_type, "data": data}
+        if request_id:
+            event["request_id"] = request_id
+        payload = msgpack.packb(event, use_bin_type=True) if self._subprotocol == BATCH_MSGPACK else dumps(event)
+
+        key = _coalesce_key(event_type, data, request_id)
+        queued = self._keyed.get(key) if key else None
+        # Only the newest queued event is replaced, so nothing queued after it changes order
+        if queued is not None and self._queue and self._queue[-1] is queued:
+            self._queued_bytes += len(payload) - len(queued.payload)
+            queued.payload = payload
+            self.coalesced += 1
+            _totals["coalesced"] += 1
+            return
+
+        if len(self._queue) >= settings.ws_send_queue_max:
+            self._space.clear()
+            try:
+                await asyncio.wait_for(self._space.wait(), settings.ws_send_timeout_seconds)
+            except asyncio.TimeoutError:
+                logger.warning("WebSocket client too slow (%d events queued), disconnecting", len(self._queue))
+                _totals["slow_disconnects"] += 1
+                self._close()
+                await self._abort()
+                return
+            if self.closed:
+                return
+
+        slot = _Slot(payload, key)
+        self._queue.append(slot)
+        self._queued_bytes += len(payload)
+        if key:
+            self._keyed[key] = slot
+        self.peak_depth = max(self.peak_depth, len(self._queue))
+        _totals["peak_depth"] = max(_totals["peak_depth"], len(self._queue))
+        if event_type in _FLUSH_NOW or self._queued_bytes >= _MAX_BATCH_BYTES:
+            self._urgent.set()
+        self._ready.set()
+        if self._writer is None:
+            self._writer = asyncio.create_task(self._run())
+
+    async def aclose(self, timeout: float = 2.0) -> None:
+        """Give the writer a moment to drain, then stop it."""
+        if self._writer is not None and not self.closed and self._queue:
+            deadline = asyncio.get_running_loop().time() + timeout
+            while self._queue and not self.closed and asyncio.get_running_loop().time() < deadline:
+                await asyncio.sleep(0.01)
+        self.closed = True
+        if self._writer is not None:
+            self._writer.cancel()
+            try:
+                await self._writer
+            except asyncio.CancelledError:
+                pass
+            self._writer = None
+        self._queue.clear()
+        self._keyed.clear()
+        self._queued_bytes = 0
+
+    async def _run(self) -> None:
+        while not self.closed:
+            await self._ready.wait()
+            if self.batched and not self._urgent.is_set():
+                # Let events produced within the flush window share one frame
+                try:
+                    await asyncio.wait_for(self._urgent.wait(), settings.ws_flush_window_ms / 1000)
+                except asyncio.TimeoutError:
+                    pass
+            batch = self._take()
+            if not batch:
+                continue
+            try:
+                await self._write(batch)
+            except Exception:
+                logger.info("WebSocket write failed, closing sender")
+                self._close()
+                return
+            self.events_sent += len(batch)
+            self.frames_sent += 1 if self.batched else len(batch)
+            _totals["events_sent"] += len(batch)
+
+    def _take(self) -> list[str | bytes]:
+        """Dequeue the next frame's worth of events (everything, up to the byte cap when batched)."""
+        batch: list[str | bytes] = []
+        size = 0
+        while self._queue and (not batch or (self.batched and size < _MAX_BATCH_BYTES)):
+            slot = self._queue.popleft()
+            if slot.key and self._keyed.get(slot.key) is slot:
+                del self._keyed[slot.key]
+            batch.append(slot.payload)
+            size += len(slot.payload)
+            if not self.batched:
+                break
+        self._queued_bytes -= size
+        if not self._queue:
+            self._ready.clear()
+            self._urgent.clear()
+        if len(self._queue) < settings.ws_send_queue_max:
+            self._space.set()
+        return batch
+
+    async def _write(self, batch: list[str | bytes]) -> None:
+        if not self.batched:
+            await self._websocket.send_text(batch[0])
+        elif self._subprotocol == BATCH_MSGPACK:
+            header = msgpack.Packer().pack_array_header(len(batch))
+            await self._websocket.send_bytes(header + b"".join(batch))
+        else:
+            await self._websocket.send_text("[" + ",".join(batch) + "]")
+
+    def _close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        self._space.set()  # Release senders waiting for room
+        self._ready.set()  # Let the writer task exit
+        self._queue.clear()
+        self._keyed.clear()
+        self._queued_bytes = 0
+        if self._on_disconnect is not None:
+            self._on_disconnect()
+
+    async def _abort(self) -> None:
+        try:
+            await self._websocket.close(code=1013)  # Try again later
+        except Exception:
+            pass  # Connection may already be closed
+
+
+# Live senders and process-wide totals, for /api/health
+_senders: weakref.WeakSet[EventSender] = weakref.WeakSet()
+_totals = {"events_sent": 0, "coalesced": 0, "slow_disconnects": 0, "peak_depth": 0}
+
+
+def sender_stats() -> dict:
+    """Outbound queue depths across open connections plus process-wide totals."""
+    live = [s for s in _senders if not s.closed]
+    return {
+        "connections": len(live),
+        "queued_events": sum(s.depth for s in live),
+        "max_queue_depth": max((s.depth for s in live), default=0),
+        "queue_limit": settings.ws_send_queue_max,
+        **_totals,
+    }
@@ -0,0 +1,84 @@
+"""Streaming HTTP endpoint: run a query and stream its events without a WebSocket.
+
+Events are the same ``{type, data}`` objects the WebSocket sends, plus
+``text_delta`` events carrying the response text as the model generates it,
+framed as Server-Sent Events when the client accepts ``text/event-stream`` and
+as newline-delimited JSON otherwise.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import AsyncIterator
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+
+from api.models import QueryRequest
+from api.protocol import dumps
+from api.runner import run_query
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api")
+
+# SSE comment sent while the graph is quiet, so proxies keep the stream open
+_KEEPALIVE_SECONDS = 15
+
+
+@router.post("/query")
+async def stream_query(body: QueryRequest, request: Request) -> StreamingResponse:
+    """Run the agent graph for one query and stream its events as they happen.
+
+    Disconnecting cancels the query.  ``timeout_seconds`` can shorten, not
+    extend, the ``QUERY_TIMEOUT_SECONDS`` deadline.
+    """
+    content = body.content.strip()
+    if not content:
+        raise HTTPException(status_code=400, detail="Empty query")
+
+    sse = "text/event-stream" in request.headers.get("accept", "")
+    timeout = settings.query_timeout_seconds
+    if body.timeout_seconds is not None:
+        timeout = min(body.timeout_seconds, timeout)
+
+    return StreamingResponse(
+        _stream_events(content, body.session_id, timeout, sse),
+        media_type="text/event-stream" if sse else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _stream_events(content: str, sid: str, timeout: float, sse: bool) -> AsyncIterator[str]:
+    """Run the query in a task and yield its events as encoded chunks."""
+    queue: asyncio.Queue[tuple[str, dict | str | None] | None] = asyncio.Queue()
+
+    async def send(event_type: str, data: dict | str | None) -> None:
+        queue.put_nowait((event_type, data))
+
+    async def run() -> None:
+        try:
+            await run_query(content, sid, send, timeout=timeout, stream_text=True)
+        finally:
+            queue.put_nowait(None)
+
+    task = asyncio.create_task(run())
+    try:
+        while True:
+            try:
+                item = await asyncio.wait_for(queue.get(), _KEEPALIVE_SECONDS if sse else None)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if item is None:
+                break
+            event_type, data = item
+            payload = dumps({"type": event_type, "data": data})
+            yield f"event: {event_type}\ndata: {payload}\n\n" if sse else payload + "\n"
+    finally:
+        # The client disconnected (or the stream ended): stop the query
+        if not task.done():
+            logger.info("HTTP query stream closed early, cancelling: %s", content[:100])
+            task.cancel()
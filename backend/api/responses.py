@@ -0,0 +1,65 @@
+"""Project-wide HTTP response encoding: fast JSON and compression.
+
+``FastJSONResponse`` serializes with ``orjson`` when it is installed
+(several times faster than ``json`` on large payloads) and falls back to the
+standard encoder otherwise.  ``CompressionMiddleware`` compresses responses
+above a size threshold with Brotli when ``brotli-asgi`` is installed
+(falling back to gzip for clients that don't accept ``br``), else gzip.
+Streaming endpoints are excluded so their events aren't held in a
+compressor's buffer.
+"""
+
+from __future__ import annotations
+
+import logging
+
+from typing import Any
+
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:
+    from brotli_asgi import BrotliMiddleware
+except ImportError:  # pragma: no cover - optional encoding
+    BrotliMiddleware = None
+
+logger = logging.getLogger(__name__)
+
+
+
+class _ORJSONResponse(JSONResponse):
+    """JSONResponse rendered with ``orjson`` (FastAPI's ORJSONResponse is deprecated)."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+FastJSONResponse: type[JSONResponse] = _ORJSONResponse if orjson is not None else JSONResponse
+
+
+class CompressionMiddleware:
+    """Brotli/gzip compression for HTTP responses, except ``exclude_paths``."""
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, exclude_paths: tuple[str, ...] = ()) -> None:
+        self.app = app
+        self.exclude_paths = exclude_paths
+        if BrotliMiddleware is not None:
+            self.compressed: ASGIApp = BrotliMiddleware(app, minimum_size=minimum_size, gzip_fallback=True)
+        else:
+            self.compressed = GZipMiddleware(app, minimum_size=minimum_size)
+        logger.info(
+            "Response compression: %s above %d bytes",
+            "brotli/gzip" if BrotliMiddleware is not None else "gzip", minimum_size,
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and not scope["path"].startswith(self.exclude_paths):
+            await self.compressed(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
@@ -2,37 +2,164 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
+import hashlib
 import logging
+import time
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import PlainTextResponse
 
-from api.models import EntityStatsResponse, HealthResponse, SkillInfo, SkillsResponse
+from api.models import (
+    BulkEntityStatsRequest,
+    BulkEntityStatsResponse,
+    EntityStatsResponse,
+    HealthResponse,
+    InventoryStats,
+    ReadyResponse,
+    SessionStats,
+    SkillInfo,
+    SkillsResponse,
+    SourceHealthInfo,
+    WebSocketStats,
+)
+from api.protocol import sender_stats
+from api.responses import FastJSONResponse
+from config import settings
+from mcp_client.health import mcp_health
 from mcp_client.manager import mcp_manager
+from mcp_client.results import call_json, fetch_list
+from metrics import REGISTRY
 from skills.loader import list_skills
+from state.inventory import inventory
+from state.session import session_store
+from state.stats_cache import StatsCache
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api")
 
+_stats_cache = StatsCache(ttl_seconds=settings.entity_stats_ttl_seconds)
+
+# Organization-wide snapshots belong to the active profile's organization
+mcp_manager.add_profile_listener(lambda: _stats_cache.invalidate_prefix("org:"))
+
+# Bulk stats: most networks per request, and concurrent per-network SSID lookups
+_BULK_MAX_NETWORKS = 1000
+_SSID_CONCURRENCY = 8
+
 
 @router.get("/health", response_model=HealthResponse)
 async def health_check() -> HealthResponse:
-    """Health check: reports MCP connection status and tool counts."""
-    tools = mcp_manager.tools
-    meraki_count = sum(1 for t in tools if t.source == "meraki")
-    te_count = sum(1 for t in tools if t.source == "thousandeyes")
+    """Health check: MCP connection status, tool counts, sessions, WebSocket queues and inventory index."""
+    counts = mcp_manager.tool_counts
 
     return HealthResponse(
         status="ok",
         meraki_connected=mcp_manager.meraki_connected,
-        meraki_tools=meraki_count,
+        meraki_tools=counts["meraki"],
         thousandeyes_connected=mcp_manager.te_connected,
-        thousandeyes_tools=te_count,
-        total_tools=len(tools),
+        thousandeyes_tools=counts["thousandeyes"],
+        total_tools=sum(counts.values()),
+        sessions=SessionStats(**session_store.stats()),
+        websocket=WebSocketStats(**sender_stats()),
+        inventory=InventoryStats(**inventory.stats()),
     )
 
 
+@router.get("/live")
+async def liveness() -> dict:
+    """Liveness probe: the process is serving requests.  Constant time, no I/O."""
+    return {"status": "ok"}
+
+
+@router.get("/ready", response_model=ReadyResponse)
+async def readiness() -> FastJSONResponse:
+    """Readiness probe from cached background MCP pings; 503 if a required source is down."""
+    now = time.monotonic()
+    sources = {
+        source: SourceHealthInfo(
+            status=h.status,
+            rtt_ms=h.rtt_ms,
+            consecutive_failures=h.consecutive_failures,
+            last_error=h.last_error,
+            checked_seconds_ago=round(now - h.checked_at, 1) if h.checked_at is not None else None,
+            last_ok_seconds_ago=round(now - h.last_ok_at, 1) if h.last_ok_at is not None else None,
+        )
+        for source, h in mcp_health.snapshot().items()
+    }
+    ready = mcp_health.ready()
+    return FastJSONResponse(
+        status_code=200 if ready else 503,
+        content=ReadyResponse(ready=ready, sources=sources).model_dump(),
+    )
+
+
+# The Meraki MCP cache_stats result read by the current scrape, if any
+_mcp_cache_stats: dict | None = None
+_MCP_CACHE_STATS_TIMEOUT_SECONDS = 2
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    """Metrics in the Prometheus text exposition format.
+
+    The Meraki MCP server's response-cache counters are read from its
+    ``cache_stats`` tool on each scrape and left out if that call fails.
+    """
+    global _mcp_cache_stats
+    stats = None
+    if mcp_manager.meraki_connected:
+        stats = await call_json("cache_stats", {}, timeout=_MCP_CACHE_STATS_TIMEOUT_SECONDS)
+    _mcp_cache_stats = stats if isinstance(stats, dict) else None
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+
+def _collect_runtime() -> list:
+    """Scrape-time gauges read from the session store, WebSocket senders and caches."""
+    sessions = session_store.stats()
+    ws = sender_stats()
+    lookups = _stats_cache.hits + _stats_cache.misses
+    requests = [
+        ("agenticops_cache_requests_total", {"cache": "entity_stats", "result": "hit"}, _stats_cache.hits),
+        ("agenticops_cache_requests_total", {"cache": "entity_stats", "result": "miss"}, _stats_cache.misses),
+    ]
+    ratios = [("agenticops_cache_hit_ratio", {"cache": "entity_stats"}, _stats_cache.hits / lookups if lookups else 0)]
+    families = []
+    mcp = _mcp_cache_stats
+    if mcp is not None:
+        # Stale hits are served from the cache while it refreshes in the background
+        label = {"cache": "meraki_mcp"}
+        requests += [
+            ("agenticops_cache_requests_total", {**label, "result": "hit"}, mcp.get("hits", 0)),
+            ("agenticops_cache_requests_total", {**label, "result": "stale_hit"}, mcp.get("stale_hits", 0)),
+            ("agenticops_cache_requests_total", {**label, "result": "miss"}, mcp.get("misses", 0)),
+        ]
+        ratios.append(("agenticops_cache_hit_ratio", label, mcp.get("hit_ratio") or 0))
+        families = [
+            ("agenticops_cache_entries", "gauge", "Entries held by the cache.",
+             [("agenticops_cache_entries", label, mcp.get("total_items", 0))]),
+            ("agenticops_cache_bytes", "gauge", "Approximate bytes held by the cache.",
+             [("agenticops_cache_bytes", label, mcp.get("total_bytes", 0))]),
+            ("agenticops_cache_evictions_total", "counter", "Entries evicted to stay within the cache's bounds.",
+             [("agenticops_cache_evictions_total", label, mcp.get("evictions", 0))]),
+        ]
+    return [
+        ("agenticops_sessions", "gauge", "Sessions held in memory.",
+         [("agenticops_sessions", {}, sessions["sessions"])]),
+        ("agenticops_websocket_queued_events", "gauge", "Outbound events queued across connections.",
+         [("agenticops_websocket_queued_events", {}, ws["queued_events"])]),
+        ("agenticops_websocket_events_coalesced_total", "counter", "Superseded progress events dropped.",
+         [("agenticops_websocket_events_coalesced_total", {}, ws["coalesced"])]),
+        ("agenticops_cache_requests_total", "counter", "Cache lookups by cache and result.", requests),
+        ("agenticops_cache_hit_ratio", "gauge", "Cache hits over lookups since startup.", ratios),
+        *families,
+    ]
+
+
+REGISTRY.add_collector(_collect_runtime)
+
+
 @router.get("/skills", response_model=SkillsResponse)
 async def get_skills() -> SkillsResponse:
     """List all available skills."""
@@ -44,66 +171,177 @@ async def get_skills() -> SkillsResponse:
 
 
 @router.get("/entity/{entity_type}/{entity_id}/stats", response_model=EntityStatsResponse)
-async def entity_stats(entity_type: str, entity_id: str) -> EntityStatsResponse:
-    """Fetch live stats for a network entity via MCP tools."""
+async def entity_stats(entity_type: str, entity_id: str, request: Request) -> Response:
+    """Fetch live stats for a network entity via MCP tools.
+
+    The device, client and SSID lookups run concurrently, each bounded by
+    ``ENTITY_STATS_TIMEOUT_SECONDS``; a count that times out or fails is
+    reported in ``missing``.  Complete results are cached per network for
+    ``ENTITY_STATS_TTL_SECONDS`` and served with an ETag.
+    """
     if entity_type != "network":
         raise HTTPException(status_code=400, detail=f"Unsupported entity type: {entity_type}")
 
     if not mcp_manager.meraki_connected:
         raise HTTPException(status_code=503, detail="Meraki MCP not connected")
 
-    device_count = 0
-    client_count = 0
-    ssid_count = 0
-
-    # Fetch device count
-    try:
-        result = await mcp_manager.call_tool("getNetworkDevices", {"networkId": entity_id})
-        if "error" not in result:
-            content = result.get("content", "")
-            parsed = _parse_json(content)
-            if isinstance(parsed, list):
-                device_count = len(parsed)
-    except Exception:
-        logger.warning("Failed to fetch devices for %s", entity_id)
-
-    # Fetch client count
-    try:
-        result = await mcp_manager.call_tool("getNetworkClients", {"networkId": entity_id, "timespan": "86400"})
-        if "error" not in result:
-            content = result.get("content", "")
-            parsed = _parse_json(content)
-            if isinstance(parsed, list):
-                client_count = len(parsed)
-    except Exception:
-        logger.warning("Failed to fetch clients for %s", entity_id)
-
-    # Fetch SSID count
-    try:
-        result = await mcp_manager.call_tool("getNetworkWirelessSsids", {"networkId": entity_id})
-        if "error" not in result:
-            content = result.get("content", "")
-            parsed = _parse_json(content)
-            if isinstance(parsed, list):
-                # Only count enabled SSIDs
-                ssid_count = sum(1 for s in parsed if isinstance(s, dict) and s.get("enabled", False))
-    except Exception:
-        logger.warning("Failed to fetch SSIDs for %s", entity_id)
-
-    return EntityStatsResponse(
-        deviceCount=device_count,
-        clientCount=client_count,
-        ssidCount=ssid_count,
+    stats, expires_at = await _stats_cache.get_or_load(
+        f"network:{entity_id}", lambda: _load_network_stats(entity_id),
     )
+    body = EntityStatsResponse(**stats).model_dump_json()
+    etag = '"' + hashlib.sha1(body.encode()).hexdigest()[:16] + '"'
+    max_age = max(0, int(expires_at - time.monotonic()))
+    headers = {"ETag": etag, "Cache-Control": f"private, max-age={max_age}"}
+
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.post("/entity/stats", response_model=BulkEntityStatsResponse)
+async def bulk_entity_stats(body: BulkEntityStatsRequest) -> BulkEntityStatsResponse:
+    """Stats for many networks at once, answered from organization-wide data.
+
+    Device counts come from one ``getOrganizationDevices`` call and client
+    counts from ``getOrganizationSummaryTopNetworksByStatus``; both snapshots
+    are cached for ``ENTITY_STATS_ORG_TTL_SECONDS`` and shared by every
+    request, until a ``switch_profile`` call drops them.  There is no organization-wide SSID call, so enabled SSIDs are
+    fetched (and cached) per network, only for networks with wireless devices.
 
+    The summary's client totals are Meraki's own per-network counts, not the
+    24-hour ``getNetworkClients`` list the single-network endpoint counts, so
+    the two can differ.  Networks the summary leaves out are reported with
+    ``clients`` in ``missing``; the UI then asks the single-network endpoint.
+    """
+    if len(body.networkIds) > _BULK_MAX_NETWORKS:
+        raise HTTPException(status_code=400, detail=f"At most {_BULK_MAX_NETWORKS} networks per request")
 
-def _parse_json(content: str | list | dict) -> object | None:
-    """Try to parse content as JSON."""
-    if isinstance(content, (list, dict)):
-        return content
-    if isinstance(content, str):
-        try:
-            return json.loads(content)
-        except (json.JSONDecodeError, ValueError):
+    if not mcp_manager.meraki_connected:
+        raise HTTPException(status_code=503, detail="Meraki MCP not connected")
+
+    network_ids = list(dict.fromkeys(body.networkIds))
+    ttl = settings.entity_stats_org_ttl_seconds
+    (devices, _), (clients, _) = await asyncio.gather(
+        _stats_cache.get_or_load("org:devices", _load_org_devices, ttl_seconds=ttl),
+        _stats_cache.get_or_load("org:clients", _load_org_clients, ttl_seconds=ttl),
+    )
+    device_counts = devices["counts"]
+    client_counts = clients["counts"]
+
+    semaphore = asyncio.Semaphore(_SSID_CONCURRENCY)
+
+    async def ssid_count(network_id: str) -> int | None:
+        indexed = inventory.enabled_ssid_count(network_id)
+        if indexed is not None:
+            return indexed
+        if devices["wireless"] is not None and network_id not in devices["wireless"]:
+            return 0
+        async with semaphore:
+            value, _ = await _stats_cache.get_or_load(f"ssids:{network_id}", lambda: _load_ssid_count(network_id))
+        return value["count"]
+
+    ssid_counts = await asyncio.gather(*(ssid_count(nid) for nid in network_ids))
+
+    stats: dict[str, EntityStatsResponse] = {}
+    for network_id, ssids in zip(network_ids, ssid_counts):
+        # The summary only lists the networks it ranks: any other network's
+        # client count is unknown here, not zero
+        missing = [
+            name for name, available in (
+                ("devices", device_counts is not None),
+                ("clients", client_counts is not None and network_id in client_counts),
+                ("ssids", ssids is not None),
+            ) if not available
+        ]
+        stats[network_id] = EntityStatsResponse(
+            deviceCount=(device_counts or {}).get(network_id, 0),
+            clientCount=(client_counts or {}).get(network_id, 0),
+            ssidCount=ssids or 0,
+            partial=bool(missing),
+            missing=missing,
+        )
+    return BulkEntityStatsResponse(stats=stats)
+
+
+async def _load_org_devices() -> tuple[dict, bool]:
+    """Device counts by network and the networks with wireless devices."""
+    if inventory.ready:
+        # Not cached here: the index is already current and cheaper to read
+        return {"counts": inventory.device_counts(), "wireless": inventory.wireless_network_ids()}, False
+    devices = await fetch_list("getOrganizationDevices", {}, settings.entity_stats_org_timeout_seconds)
+    if devices is None:
+        return {"counts": None, "wireless": None}, False
+    counts: dict[str, int] = {}
+    wireless: set[str] = set()
+    for dev in devices:
+        if not isinstance(dev, dict) or not dev.get("networkId"):
+            continue
+        counts[dev["networkId"]] = counts.get(dev["networkId"], 0) + 1
+        if dev.get("productType") == "wireless":
+            wireless.add(dev["networkId"])
+    return {"counts": counts, "wireless": wireless}, True
+
+
+async def _load_org_clients() -> tuple[dict, bool]:
+    """Client counts by network from the organization network summary."""
+    networks = await fetch_list("call_meraki_api", {
+        "section": "organizations",
+        "method": "getOrganizationSummaryTopNetworksByStatus",
+        "parameters": {},
+    }, settings.entity_stats_org_timeout_seconds)
+    if networks is None:
+        return {"counts": None}, False
+    counts = {
+        net["networkId"]: int(((net.get("clients") or {}).get("counts") or {}).get("total") or 0)
+        for net in networks if isinstance(net, dict) and net.get("networkId")
+    }
+    return {"counts": counts}, True
+
+
+async def _load_ssid_count(network_id: str) -> tuple[dict, bool]:
+    ssids = await fetch_list("getNetworkWirelessSsids", {"networkId": network_id}, settings.entity_stats_timeout_seconds)
+    if ssids is None:
+        return {"count": None}, False
+    return {"count": sum(1 for s in ssids if isinstance(s, dict) and s.get("enabled", False))}, True
+
+
+async def _load_network_stats(network_id: str) -> tuple[dict, bool]:
+    """Query the counts concurrently; cacheable only if all succeeded.
+
+    Device and SSID counts come from the inventory index when it has them;
+    clients are always live.
+    """
+    async def known(count: int) -> int:
+        return count
+
+    async def live(tool_name: str, args: dict, enabled_only: bool = False) -> int | None:
+        items = await fetch_list(tool_name, args, settings.entity_stats_timeout_seconds)
+        if items is None:
             return None
-    return None
+        if enabled_only:
+            return sum(1 for s in items if isinstance(s, dict) and s.get("enabled", False))
+        return len(items)
+
+    indexed_devices = inventory.device_count(network_id)
+    indexed_ssids = inventory.enabled_ssid_count(network_id)
+    counts = await asyncio.gather(
+        known(indexed_devices) if indexed_devices is not None
+        else live("getNetworkDevices", {"networkId": network_id}),
+        live("getNetworkClients", {"networkId": network_id, "timespan": "86400"}),
+        # Only count enabled SSIDs
+        known(indexed_ssids) if indexed_ssids is not None
+        else live("getNetworkWirelessSsids", {"networkId": network_id}, enabled_only=True),
+    )
+    missing = [name for name, c in zip(("devices", "clients", "ssids"), counts) if c is None]
+    if missing:
+        logger.warning("Entity stats for %s missing: %s", network_id, ", ".join(missing))
+
+    devices, clients, ssids = counts
+    stats = {
+        "deviceCount": devices or 0,
+        "clientCount": clients or 0,
+        "ssidCount": ssids or 0,
+        "partial": bool(missing),
+        "missing": missing,
+    }
+    return stats, not missing
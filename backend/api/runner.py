@@ -0,0 +1,200 @@
+"""Runs the agent graph for one query and reports progress as typed events.
+
+Transport-agnostic: the WebSocket endpoint and the streaming HTTP endpoint
+both pass a ``send`` callback that delivers events in their own framing.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+
+from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage, RemoveMessage
+
+from agents.callbacks import llm_metrics
+from agents.canvas_agent import canvas_prefetch_scope, chunk_text
+from agents.graph import agent_graph, get_checkpointed_graph, prune_checkpoints
+from agents.state import AgentState
+from config import settings
+from metrics import QUERIES_IN_FLIGHT, QUERY_DURATION
+from state.session import session_store
+
+logger = logging.getLogger(__name__)
+
+SendEvent = Callable[[str, dict | str | None], Awaitable[None]]
+
+# Sessions with a query running on their checkpoint thread
+_active_threads: set[str] = set()
+
+# Nodes whose model output is the response text, streamed as text_delta events
+_TEXT_NODES = frozenset({"troubleshooting", "compliance", "security", "discovery"})
+
+
+async def run_query(
+    content: str,
+    sid: str,
+    send: SendEvent,
+    timeout: float | None = None,
+    stream_text: bool = False,
+) -> None:
+    """Run the agent graph for ``content`` and stream its events through ``send``.
+
+    With ``stream_text`` the specialist's model output is also sent token by
+    token as ``text_delta`` events ``{agent, text}``, for every model turn; the
+    ``text`` event still carries the final response.  Always ends with a ``done`` event: ``{"stopped": true}`` if the caller
+    cancelled, ``{"timed_out": true}`` after ``timeout`` seconds (default
+    ``QUERY_TIMEOUT_SECONDS``).  Cancellation is absorbed, not re-raised.
+    """
+    session = await session_store.get_or_create(sid)
+    session.add_message("user", content)
+
+    # With a checkpointer the graph keeps the conversation per session, so
+    # only the new query goes in.  A second query running concurrently on
+    # the same session can't share the thread; it runs stateless instead.
+    graph = get_checkpointed_graph()
+    config: dict = {"callbacks": [llm_metrics]}
+    checkpointed = graph is not None and sid not in _active_threads
+    if checkpointed:
+        config["configurable"] = {"thread_id": sid}
+        messages = await _checkpoint_messages(graph, config, session)
+        _active_threads.add(sid)
+    else:
+        graph = agent_graph
+        messages = [HumanMessage(content=m.content) for m in session.messages if m.role == "user"]
+
+    initial_state: AgentState = {
+        "messages": messages,
+        "user_query": content,
+        "active_agent": "",
+        "generate_cards": False,
+        "tool_results": [],
+        "previous_tool_results": session.last_tool_results(),
+        "cards": [],
+        "agent_events": [],
+        "canvas_prefetch_id": "",
+        "table_data": [],
+    }
+
+    QUERIES_IN_FLIGHT.inc()
+    with QUERY_DURATION.time(outcome="ok") as outcome:
+        try:
+            async with asyncio.timeout(timeout or settings.query_timeout_seconds):
+                with canvas_prefetch_scope():
+                    await _stream_graph(graph, initial_state, config, session, send, stream_text)
+            await send("done", None)
+
+        except TimeoutError:
+            outcome["outcome"] = "timeout"
+            logger.warning("Query timed out: %s", content[:100])
+            await send("error", {"message": "The query took too long and was stopped."})
+            await send("done", {"timed_out": True})
+        except asyncio.CancelledError:
+            outcome["outcome"] = "stopped"
+            logger.info("Query processing cancelled: %s", content[:100])
+            await send("done", {"stopped": True})
+        except Exception:
+            outcome["outcome"] = "error"
+            logger.exception("Error processing query: %s", content)
+            await send("error", {"message": "An error occurred while processing your query."})
+            await send("done", None)
+        finally:
+            QUERIES_IN_FLIGHT.dec()
+            if checkpointed:
+                await prune_checkpoints(sid)
+                _active_threads.discard(sid)
+
+
+async def _stream_graph(
+    graph, initial_state: AgentState, config: dict, session, send: SendEvent, stream_text: bool,
+) -> None:
+    """Stream one graph run, forwarding its events and recording the results on the session."""
+    # Immediately tell the UI the orchestrator is working
+    await send("agent_start", {"type": "agent_start", "agent": "orchestrator"})
+
+    last_events_sent = 0
+    latest_tool_results: list[dict] = []
+    sent_card_ids: set[str] = set()
+    response_text = ""
+
+    async for mode, event in graph.astream(
+        initial_state,
+        config,
+        stream_mode=["updates", "custom", "messages"] if stream_text else ["updates", "custom"],
+    ):
+        # Token deltas from the specialist's model calls
+        if mode == "messages":
+            chunk, metadata = event
+            node = metadata.get("langgraph_node")
+            if isinstance(chunk, AIMessageChunk) and node in _TEXT_NODES and (text := chunk_text(chunk.content)):
+                await send("text_delta", {"agent": node, "text": text})
+            continue
+
+        # Events written by nodes mid-run (e.g. cards streamed by the canvas agent)
+        if mode == "custom":
+            if event.get("type") == "card":
+                sent_card_ids.add(event["data"].get("id"))
+                session.add_card(event["data"])
+            await send(event["type"], event["data"])
+            continue
+
+        for node_name, state_update in event.items():
+            logger.info("Stream update from node '%s', keys: %s", node_name, list(state_update.keys()))
+
+            if state_update.get("tool_results"):
+                latest_tool_results = state_update["tool_results"]
+
+            # Send any new agent events
+            agent_events = state_update.get("agent_events", [])
+            for evt in agent_events[last_events_sent:]:
+                await send(evt["type"], evt)
+            last_events_sent = len(agent_events)
+
+            # If we have messages, extract the AI response text
+            new_messages = state_update.get("messages", [])
+            for msg in new_messages:
+                if hasattr(msg, "type") and msg.type == "ai" and msg.content:
+                    text = msg.content if isinstance(msg.content, str) else str(msg.content)
+                    if text and not msg.tool_calls:
+                        response_text = text
+                        await send("text", text)
+
+            # Send table data for interactive hover popups
+            tables = state_update.get("table_data", [])
+            if tables:
+                logger.info("Sending %d table_data events from node '%s'", len(tables), node_name)
+            for table in tables:
+                # Hold the full table server-side and send only the first page
+                session.tables.add(table)
+                await send("table_data", session.tables.page(table["table_id"]))
+
+            # Send card directives not already streamed
+            cards = state_update.get("cards", [])
+            for card in cards:
+                if card.get("id") not in sent_card_ids:
+                    session.add_card(card)
+                    await send("card", card)
+
+    # Keep this query's tool results for "put that on a card" follow-ups
+    if latest_tool_results:
+        session.set_tool_results(latest_tool_results)
+    session.add_message("assistant", response_text or "Response delivered.")
+
+
+async def _checkpoint_messages(graph, config: dict, session) -> list:
+    """Input messages for a checkpointed run.
+
+    Drops the oldest checkpointed history past SESSION_MAX_MESSAGES.  A thread
+    without a checkpoint (after a restart with the memory checkpointer, or a
+    session evicted and reloaded from the database) is seeded with the
+    session's stored history instead, minus the query just added.
+    """
+    snapshot = await graph.aget_state(config)
+    history = snapshot.values.get("messages", []) if snapshot.values else []
+    if not history:
+        return [
+            HumanMessage(content=m.content) if m.role == "user" else AIMessage(content=m.content)
+            for m in list(session.messages)[:-1]
+        ]
+    excess = len(history) - settings.session_max_messages
+    return [RemoveMessage(id=m.id) for m in history[:excess]] if excess > 0 else []
@@ -8,9 +8,12 @@ import logging
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
-from agents.graph import agent_graph
-from agents.state import AgentState
+from api.protocol import EventSender, negotiate_subprotocol
+from api.runner import run_query
+from config import settings
+from metrics import WEBSOCKET_CONNECTIONS
 from state.session import session_store
+from state.tables import PAGE_SIZE
 
 logger = logging.getLogger(__name__)
 
@@ -20,78 +23,29 @@ router = APIRouter()
 @router.websocket("/ws/chat")
 async def chat_websocket(websocket: WebSocket) -> None:
     """WebSocket endpoint for real-time chat with the agent system."""
-    await websocket.accept()
+    subprotocol = negotiate_subprotocol(websocket)
+    await websocket.accept(subprotocol=subprotocol)
     session_id = "default"
-    processing_task: asyncio.Task | None = None
-    logger.info("WebSocket connected: session=%s", session_id)
+    # Running queries by client request ID ("" for clients that don't send one)
+    processing_tasks: dict[str, asyncio.Task] = {}
 
-    async def process_query(content: str, sid: str) -> None:
+    def cancel_all() -> None:
+        for task in processing_tasks.values():
+            if not task.done():
+                task.cancel()
+
+    # A failed or stalled write means the client is gone: stop its queries
+    sender = EventSender(websocket, subprotocol, on_disconnect=cancel_all)
+    WEBSOCKET_CONNECTIONS.inc()
+    logger.info("WebSocket connected: session=%s, protocol=%s", session_id, subprotocol or "json")
+
+    async def process_query(content: str, sid: str, request_id: str) -> None:
         """Run the agent graph and stream results back via WebSocket."""
-        session = session_store.get_or_create(sid)
-        session.add_message("user", content)
-
-        from langchain_core.messages import HumanMessage
-
-        initial_state: AgentState = {
-            "messages": [HumanMessage(content=m["content"]) for m in session.messages if m["role"] == "user"],
-            "user_query": content,
-            "active_agent": "",
-            "generate_cards": False,
-            "tool_results": [],
-            "cards": [],
-            "agent_events": [],
-            "table_data": [],
-        }
-
-        try:
-            # Immediately tell the UI the orchestrator is working
-            await _send_event(websocket, "agent_start", {"type": "agent_start", "agent": "orchestrator"})
-
-            last_events_sent = 0
-
-            async for event in agent_graph.astream(
-                initial_state,
-                stream_mode="updates",
-            ):
-                for node_name, state_update in event.items():
-                    logger.info("Stream update from node '%s', keys: %s", node_name, list(state_update.keys()))
-
-                    # Send any new agent events
-                    agent_events = state_update.get("agent_events", [])
-                    for evt in agent_events[last_events_sent:]:
-                        await _send_event(websocket, evt["type"], evt)
-                    last_events_sent = len(agent_events)
-
-                    # If we have messages, extract the AI response text
-                    new_messages = state_update.get("messages", [])
-                    for msg in new_messages:
-                        if hasattr(msg, "type") and msg.type == "ai" and msg.content:
-                            text = msg.content if isinstance(msg.content, str) else str(msg.content)
-                            if text and not msg.tool_calls:
-                                await _send_event(websocket, "text", text)
-
-                    # Send table data for interactive hover popups
-                    tables = state_update.get("table_data", [])
-                    if tables:
-                        logger.info("Sending %d table_data events from node '%s'", len(tables), node_name)
-                    for table in tables:
-                        await _send_event(websocket, "table_data", table)
-
-                    # Send card directives
-                    cards = state_update.get("cards", [])
-                    for card in cards:
-                        await _send_event(websocket, "card", card)
-
-            session.add_message("assistant", "Response delivered.")
-            await _send_event(websocket, "done", None)
-
-        except asyncio.CancelledError:
-            logger.info("Query processing cancelled: %s", content[:100])
-            await _send_event(websocket, "done", {"stopped": True})
-        except Exception:
-            logger.exception("Error processing query: %s", content)
-            await _send_event(websocket, "error", {"message": "An error occurred while processing your query."})
-            await _send_event(websocket, "done", None)
+
+        async def send(event_type: str, data: dict | str | None) -> None:
+            await sender.send(event_type, data, request_id=request_id)
+
+        await run_query(content, sid, send)
 
     try:
         while True:
@@ -99,20 +53,29 @@ async def chat_websocket(websocket: WebSocket) -> None:
             try:
                 message = json.loads(raw)
             except json.JSONDecodeError:
-                await _send_event(websocket, "error", {"message": "Invalid JSON"})
+                await sender.send("error", {"message": "Invalid JSON"})
                 continue
 
             msg_type = message.get("type")
 
-            # Handle stop/cancel
+            # Handle stop/cancel: one request by ID, or everything running
             if msg_type == "stop":
-                if processing_task and not processing_task.done():
-                    processing_task.cancel()
-                    logger.info("Stop requested, cancelling processing task")
+                stop_id = message.get("request_id")
+                targets = [stop_id] if stop_id is not None else list(processing_tasks)
+                for rid in targets:
+                    task = processing_tasks.get(rid)
+                    if task and not task.done():
+                        task.cancel()
+                        logger.info("Stop requested, cancelling request '%s'", rid)
+                continue
+
+            # Handle paging/sorting/filtering of a server-held table
+            if msg_type == "table_page":
+                await _send_table_page(sender, message, message.get("session_id", session_id))
                 continue
 
             if msg_type != "user_message":
-                await _send_event(websocket, "error", {"message": f"Unknown message type: {msg_type}"})
+                await sender.send("error", {"message": f"Unknown message type: {msg_type}"})
                 continue
 
             content = message.get("content", "").strip()
@@ -120,26 +83,63 @@ async def chat_websocket(websocket: WebSocket) -> None:
                 continue
 
             session_id = message.get("session_id", "default")
-
-            # Cancel any existing processing before starting new one
-            if processing_task and not processing_task.done():
-                processing_task.cancel()
-                try:
-                    await processing_task
-                except (asyncio.CancelledError, Exception):
-                    pass
-
-            processing_task = asyncio.create_task(process_query(content, session_id))
-
-    except WebSocketDisconnect:
+            request_id = str(message.get("request_id") or "")
+
+            if request_id:
+                if request_id in processing_tasks:
+                    await sender.send("error", {"message": f"Duplicate request_id: {request_id}"},
+                                      request_id=request_id)
+                    continue
+                if len(processing_tasks) >= settings.ws_max_concurrent_queries:
+                    await sender.send("error", {"message": "Too many concurrent queries on this connection"},
+                                      request_id=request_id)
+                    await sender.send("done", {"rejected": True}, request_id=request_id)
+                    continue
+            else:
+                # Untagged queries keep the one-at-a-time behaviour: replace the previous one
+                previous = processing_tasks.get("")
+                if previous and not previous.done():
+                    previous.cancel()
+                    try:
+                        await previous
+                    except (asyncio.CancelledError, Exception):
+                        pass
+
+            task = asyncio.create_task(process_query(content, session_id, request_id))
+            processing_tasks[request_id] = task
+            task.add_done_callback(
+                lambda t, rid=request_id: processing_tasks.pop(rid, None) if processing_tasks.get(rid) is t else None
+            )
+
+    except (WebSocketDisconnect, RuntimeError):
+        # RuntimeError: the socket was closed from our side (slow client)
         logger.info("WebSocket disconnected: session=%s", session_id)
-        if processing_task and not processing_task.done():
-            processing_task.cancel()
+    finally:
+        WEBSOCKET_CONNECTIONS.dec()
+        cancel_all()
+        await sender.aclose()
 
 
-async def _send_event(websocket: WebSocket, event_type: str, data: dict | str | None) -> None:
-    """Send a typed event over the WebSocket."""
+async def _send_table_page(sender: EventSender, message: dict, sid: str) -> None:
+    """Answer a table_page request with the requested page of a stored table."""
+    table_id = message.get("table_id", "")
+    session = await session_store.get(sid)
+    sort = message.get("sort") or {}
     try:
-        await websocket.send_json({"type": event_type, "data": data})
-    except Exception:
-        pass  # Connection may already be closed
+        page = session.tables.page(
+            table_id,
+            offset=int(message.get("offset", 0)),
+            limit=int(message.get("limit", PAGE_SIZE)),
+            sort_column=sort.get("column"),
+            descending=bool(sort.get("descending", False)),
+            filter_text=str(message.get("filter") or ""),
+        ) if session else None
+    except (TypeError, ValueError, AttributeError):
+        await sender.send("error", {"message": "Invalid table_page request", "table_id": table_id})
+        return
+
+    if page is None:
+        await sender.send("error", {"message": "Table no longer available", "table_id": table_id})
+        return
+    await sender.send("table_page", page)
+
@@ -0,0 +1,117 @@
+"""Micro-benchmark: JSON encoding cost and compressed size of typical REST payloads.
+
+Run from the backend directory:
+
+    python -m benchmarks.serialization
+
+Compares the standard ``json`` encoder with ``orjson`` (if installed) and
+reports wire size under gzip (level 9, as GZipMiddleware uses) and Brotli
+(quality 4, brotli-asgi's default) when available.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import random
+import string
+import timeit
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional encoding
+    brotli = None
+
+
+def _id(prefix: str, n: int = 12) -> str:
+    return prefix + "".join(random.choices(string.ascii_uppercase + string.digits, k=n))
+
+
+def bulk_stats_payload(networks: int = 1000) -> dict:
+    """POST /api/entity/stats for a page of networks."""
+    return {"stats": {
+        _id("L_"): {
+            "deviceCount": random.randint(0, 60),
+            "clientCount": random.randint(0, 2000),
+            "ssidCount": random.randint(0, 6),
+            "partial": False,
+            "missing": [],
+        }
+        for _ in range(networks)
+    }}
+
+
+def table_page_payload(rows: int = 500) -> dict:
+    """A table_page of networks, as sent for interactive tables."""
+    product_types = ["appliance", "switch", "wireless", "camera", "sensor"]
+    return {
+        "table_id": _id("tbl-", 8),
+        "entity_type": "network",
+        "source": "meraki",
+        "columns": ["Name", "Product Types", "Time Zone", "Tags"],
+        "rows": [
+            {
+                "id": (network_id := _id("L_")),
+                "cells": [f"Branch {i:04d}", ", ".join(random.sample(product_types, 3)),
+                          "America/Los_Angeles", "retail, west"],
+                "metadata": {"networkId": network_id, "timeZone": "America/Los_Angeles",
+                             "productTypes": random.sample(product_types, 3), "tags": ["retail", "west"]},
+            }
+            for i in range(rows)
+        ],
+        "offset": 0,
+        "limit": rows,
+        "total_rows": rows * 4,
+        "sort": None,
+        "filter": None,
+    }
+
+
+def skills_payload(skills: int = 40) -> dict:
+    """GET /api/skills."""
+    return {"skills": [
+        {"name": f"skill-{i}", "agent": random.choice(["discovery", "security", "compliance"]),
+         "file": f"skills/skill_{i}.md", "description": "Checks configuration against best practice. " * 4}
+        for i in range(skills)
+    ], "count": skills}
+
+
+def _time_ms(fn, number: int = 50) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1000
+
+
+def main() -> None:
+    random.seed(7)
+    payloads = {
+        "bulk stats (1000 networks)": bulk_stats_payload(),
+        "table page (500 rows)": table_page_payload(),
+        "skills (40)": skills_payload(),
+    }
+    header = f"{'payload':<28}{'json ms':>9}{'orjson ms':>11}{'raw KB':>9}{'gzip KB':>9}{'br KB':>8}{'ratio':>7}"
+    print(header)
+    print("-" * len(header))
+    for name, payload in payloads.items():
+        std_ms = _time_ms(lambda: json.dumps(payload, separators=(",", ":")))
+        fast_ms = _time_ms(lambda: orjson.dumps(payload)) if orjson else None
+        raw = orjson.dumps(payload) if orjson else json.dumps(payload, separators=(",", ":")).encode()
+        gz = len(gzip.compress(raw, compresslevel=9))
+        br = len(brotli.compress(raw, quality=4)) if brotli else None
+        best = min(x for x in (gz, br) if x is not None)
+        print(
+            f"{name:<28}{std_ms:>9.2f}"
+            f"{fast_ms if fast_ms is not None else float('nan'):>11.2f}"
+            f"{len(raw) / 1024:>9.1f}{gz / 1024:>9.1f}"
+            f"{br / 1024 if br is not None else float('nan'):>8.1f}"
+            f"{len(raw) / best:>6.1f}x"
+        )
+    if orjson is None or brotli is None:
+        print("\n(install the 'fast' extra for orjson and Brotli numbers)")
+
+
+if __name__ == "__main__":
+    main()
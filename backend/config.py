@@ -26,6 +26,14 @@ class Settings(BaseSettings):
     max_response_tokens: int = 5000
     max_per_page: int = 100
     response_cache_dir: str = ""
+    # Meraki response cache (defaults match the MCP server's own)
+    cache_max_entries: int = 2000
+    cache_max_bytes: int = 64 * 1024 * 1024
+    cache_sweep_seconds: int = 60  # How often expired entries are purged, checked on cache reads and writes
+    cache_stale_seconds: int = 0  # Serve expired entries this much longer while refreshing (0 = off)
+    cache_negative_ttl_seconds: int = 0  # Cache 4xx errors this long (0 = off)
+    cache_policies: str = ""  # JSON list of per-endpoint cache policies
+    cache_policy_file: str = ""  # Path to a JSON file of per-endpoint cache policies
 
     # Meraki multi-org profile vars (passed through to subprocess)
     meraki_profile_caladan_api_key: str = ""
@@ -34,6 +42,11 @@ class Settings(BaseSettings):
     meraki_profile_launchpad_api_key: str = ""
     meraki_profile_launchpad_org_id: str = ""
     meraki_profile_launchpad_name: str = ""
+    # Per-profile cache budgets; unset falls back to cache_max_entries / cache_max_bytes
+    meraki_profile_caladan_cache_max_entries: int | None = None
+    meraki_profile_caladan_cache_max_bytes: int | None = None
+    meraki_profile_launchpad_cache_max_entries: int | None = None
+    meraki_profile_launchpad_cache_max_bytes: int | None = None
 
     # ThousandEyes MCP (SSE)
     te_mcp_url: str = ""
@@ -43,6 +56,49 @@ class Settings(BaseSettings):
     host: str = "0.0.0.0"
     port: int = 8000
 
+    # HTTP responses
+    http_compression_min_bytes: int = 1024  # Smaller responses are sent uncompressed
+
+    # WebSocket protocol
+    ws_flush_window_ms: int = 20  # Event coalescing window for batched subprotocols
+    ws_per_message_deflate: bool = True  # Passed to uvicorn by main.py; the uvicorn CLI defaults to on too
+    ws_max_concurrent_queries: int = 3  # Queries with distinct request_ids per connection
+    ws_send_queue_max: int = 1000  # Outbound events queued per connection
+    ws_send_timeout_seconds: float = 10.0  # Disconnect a client whose queue stays full this long
+
+    # Health probes: /api/ready answers from a background MCP ping
+    health_probe_interval_seconds: float = 15.0
+    health_probe_timeout_seconds: float = 5.0
+    health_probe_slow_ms: float = 1000.0  # Slower pings mark the source degraded
+    health_required_sources: list[str] = ["meraki"]  # Sources that must be up for /api/ready
+
+    # Queries (WebSocket and POST /api/query)
+    query_timeout_seconds: float = 300.0  # Deadline for one graph run
+
+    # Sessions (in-memory, per process)
+    session_max_sessions: int = 1000
+    session_idle_ttl_seconds: int = 86400
+    session_max_messages: int = 200
+    session_max_cards: int = 100
+    session_db_path: str = "data/sessions.db"  # SQLite file for durable sessions; empty disables
+    session_db_flush_ms: int = 500  # Write-behind batch interval
+    session_db_retention_days: int = 30
+
+    # Agent graph checkpointing: conversation state kept per session between queries
+    checkpointer: str = "memory"  # "memory", "sqlite" (needs langgraph-checkpoint-sqlite) or "" to disable
+    checkpoint_db_path: str = "data/checkpoints.db"
+
+    # Entity stats (hover popups)
+    entity_stats_ttl_seconds: int = 30
+    entity_stats_timeout_seconds: float = 3.0  # Per MCP call; slower counts are returned as missing
+    entity_stats_org_ttl_seconds: int = 120  # Organization-wide snapshots behind POST /api/entity/stats
+    entity_stats_org_timeout_seconds: float = 30.0
+
+    # Inventory index (background refresh of networks, devices and SSIDs)
+    inventory_refresh_seconds: int = 300  # 0 disables the index
+    inventory_ssid_batch: int = 25  # Wireless networks whose SSIDs are refreshed per cycle
+    inventory_full_refresh_seconds: int = 3600  # Full reload; cycles in between apply the change log
+
     # LLM
     model_name: str = "claude-sonnet-4-20250514"
     orchestrator_model_name: str = "claude-haiku-4-5-20251001"
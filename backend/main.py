@@ -3,14 +3,21 @@
 from __future__ import annotations
 
 import logging
-from contextlib import asynccontextmanager
+from contextlib import AsyncExitStack, asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from agents.graph import open_checkpointer
+from api.query import router as query_router
+from api.responses import CompressionMiddleware, FastJSONResponse
 from api.rest import router as rest_router
 from api.websocket import router as ws_router
+from config import settings
+from mcp_client.health import mcp_health
 from mcp_client.manager import mcp_manager
+from state.inventory import inventory
+from state.session import session_store
 
 logging.basicConfig(
     level=logging.INFO,
@@ -21,13 +28,22 @@ logger = logging.getLogger(__name__)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Startup: connect MCP clients. Shutdown: disconnect."""
+    """Startup: open the session store and checkpointer, connect MCP clients,
+    start the health prober and inventory index. Shutdown: reverse."""
     logger.info("AgenticOps starting up...")
-    await mcp_manager.connect()
-    logger.info("AgenticOps ready")
-    yield
-    logger.info("AgenticOps shutting down...")
-    await mcp_manager.disconnect()
+    async with AsyncExitStack() as stack:
+        await session_store.open()
+        await open_checkpointer(stack)
+        await mcp_manager.connect()
+        await mcp_health.start()
+        await inventory.start()
+        logger.info("AgenticOps ready")
+        yield
+        logger.info("AgenticOps shutting down...")
+        await inventory.stop()
+        await mcp_health.stop()
+        await mcp_manager.disconnect()
+        await session_store.close()
 
 
 app = FastAPI(
@@ -35,6 +51,14 @@ app = FastAPI(
     description="AI-powered network operations with multi-agent architecture",
     version="0.1.0",
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
+)
+
+# Compress large REST responses; the streaming query endpoint is left as is
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.http_compression_min_bytes,
+    exclude_paths=("/api/query",),
 )
 
 # CORS for frontend dev server
@@ -48,17 +72,28 @@ app.add_middleware(
 
 # Register routers
 app.include_router(rest_router)
+app.include_router(query_router)
 app.include_router(ws_router)
 
 
+def server_options() -> dict:
+    """uvicorn options for this app, from settings.
+
+    permessage-deflate is negotiated by the server, not the app, so it can't
+    be switched on in ``app`` itself.  uvicorn enables it by default, which
+    means ``uvicorn main:app`` deployments compress WebSocket frames too;
+    ``WS_PER_MESSAGE_DEFLATE`` only reaches uvicorn through these options.
+    With the uvicorn CLI, set ``--ws-per-message-deflate`` (or
+    ``UVICORN_WS_PER_MESSAGE_DEFLATE``) instead.
+    """
+    return {
+        "host": settings.host,
+        "port": settings.port,
+        "ws_per_message_deflate": settings.ws_per_message_deflate,
+    }
+
+
 if __name__ == "__main__":
     import uvicorn
 
-    from config import settings
-
-    uvicorn.run(
-        "main:app",
-        host=settings.host,
-        port=settings.port,
-        reload=True,
-    )
+    uvicorn.run("main:app", reload=True, **server_options())
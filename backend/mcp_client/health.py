@@ -0,0 +1,129 @@
+"""Background MCP health prober backing the readiness probe.
+
+Pings every configured MCP source on an interval and caches the result, so
+``/api/ready`` answers from memory and never causes MCP traffic itself.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+
+from config import settings
+from mcp_client.manager import mcp_manager
+
+logger = logging.getLogger(__name__)
+
+SOURCES = ("meraki", "thousandeyes")
+
+# Consecutive failed pings before a source counts as down rather than degraded
+_FAILURES_UNTIL_DOWN = 3
+
+
+@dataclass(slots=True)
+class SourceHealth:
+    """Latest probe result for one MCP source.
+
+    ``status`` is "healthy", "degraded" (slow ping or a recent failure),
+    "down", or "not_configured".
+    """
+
+    status: str = "not_configured"
+    rtt_ms: float | None = None
+    consecutive_failures: int = 0
+    last_error: str | None = None
+    checked_at: float | None = None  # Monotonic time of the last probe
+    last_ok_at: float | None = None
+
+
+class MCPHealthProber:
+    """Pings MCP sources every ``HEALTH_PROBE_INTERVAL_SECONDS`` and caches the results."""
+
+    def __init__(self) -> None:
+        self._health: dict[str, SourceHealth] = {source: SourceHealth() for source in SOURCES}
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        await self.probe()  # Ready state is known before the first request
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def snapshot(self) -> dict[str, SourceHealth]:
+        """Cached health per source; a source whose last probe is too old counts as down."""
+        stale_after = settings.health_probe_interval_seconds * 3
+        now = time.monotonic()
+        result: dict[str, SourceHealth] = {}
+        for source, health in self._health.items():
+            if health.checked_at is not None and now - health.checked_at > stale_after:
+                health = SourceHealth(
+                    status="down", rtt_ms=health.rtt_ms, consecutive_failures=health.consecutive_failures,
+                    last_error="health probe stale", checked_at=health.checked_at, last_ok_at=health.last_ok_at,
+                )
+            result[source] = health
+        return result
+
+    def ready(self) -> bool:
+        """Whether every required source is healthy or degraded."""
+        snapshot = self.snapshot()
+        return all(
+            snapshot[source].status in ("healthy", "degraded")
+            for source in settings.health_required_sources if source in snapshot
+        )
+
+    async def probe(self) -> None:
+        """Ping all sources concurrently and update the cached results."""
+        await asyncio.gather(*(self._probe_source(source) for source in SOURCES))
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(settings.health_probe_interval_seconds)
+            try:
+                await self.probe()
+            except Exception:
+                logger.exception("MCP health probe failed")
+
+    async def _probe_source(self, source: str) -> None:
+        health = self._health[source]
+        if not mcp_manager.is_connected(source):
+            self._health[source] = SourceHealth(
+                status="down" if source in settings.health_required_sources else "not_configured",
+                last_error="not connected",
+                checked_at=time.monotonic(),
+            )
+            return
+
+        try:
+            rtt = await asyncio.wait_for(mcp_manager.ping(source), settings.health_probe_timeout_seconds)
+        except Exception as exc:
+            failures = health.consecutive_failures + 1
+            status = "down" if failures >= _FAILURES_UNTIL_DOWN else "degraded"
+            if status != health.status:
+                logger.warning("MCP source %s is %s: %s", source, status, exc or type(exc).__name__)
+            self._health[source] = SourceHealth(
+                status=status, rtt_ms=health.rtt_ms, consecutive_failures=failures,
+                last_error=str(exc) or type(exc).__name__, checked_at=time.monotonic(), last_ok_at=health.last_ok_at,
+            )
+            return
+
+        now = time.monotonic()
+        rtt_ms = rtt * 1000
+        status = "degraded" if rtt_ms > settings.health_probe_slow_ms else "healthy"
+        if status != health.status and health.checked_at is not None:
+            logger.info("MCP source %s is %s (%.0f ms)", source, status, rtt_ms)
+        self._health[source] = SourceHealth(
+            status=status, rtt_ms=round(rtt_ms, 1), checked_at=now, last_ok_at=now,
+        )
+
+
+# Global singleton
+mcp_health = MCPHealthProber()
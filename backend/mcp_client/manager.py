@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
+from collections.abc import Callable
 from contextlib import AsyncExitStack
 
 from mcp import ClientSession, StdioServerParameters
@@ -11,6 +14,7 @@ from mcp.client.streamable_http import streamablehttp_client
 
 from config import settings
 from mcp_client.types import ToolDescriptor
+from metrics import MCP_TOOL_DURATION
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +28,8 @@ class MCPClientManager:
         self._te_session: ClientSession | None = None
         self._tools: list[ToolDescriptor] = []
         self._tool_map: dict[str, ToolDescriptor] = {}
+        self._tool_counts: dict[str, int] = {"meraki": 0, "thousandeyes": 0}
+        self._profile_listeners: list[Callable[[], None]] = []
 
     @property
     def tools(self) -> list[ToolDescriptor]:
@@ -37,10 +43,36 @@ class MCPClientManager:
     def te_connected(self) -> bool:
         return self._te_session is not None
 
+    @property
+    def tool_counts(self) -> dict[str, int]:
+        """Tools per source, counted once when the sources connect."""
+        return self._tool_counts
+
+    def add_profile_listener(self, listener: Callable[[], None]) -> None:
+        """Call ``listener`` after each ``switch_profile`` call, i.e. when the Meraki organization may have changed."""
+        self._profile_listeners.append(listener)
+
+    def is_connected(self, source: str) -> bool:
+        return self._session_for(source) is not None
+
+    async def ping(self, source: str) -> float:
+        """Round-trip an MCP ping to a source; returns seconds.  Raises if not connected or on failure."""
+        session = self._session_for(source)
+        if session is None:
+            raise ConnectionError(f"MCP session not connected for source: {source}")
+        started = time.perf_counter()
+        await session.send_ping()
+        return time.perf_counter() - started
+
+    def _session_for(self, source: str) -> ClientSession | None:
+        return self._meraki_session if source == "meraki" else self._te_session
+
     async def connect(self) -> None:
         """Connect to all configured MCP servers and discover tools."""
         await self._connect_meraki()
         await self._connect_thousandeyes()
+        for source in self._tool_counts:
+            self._tool_counts[source] = sum(1 for t in self._tools if t.source == source)
         logger.info(
             "MCP client ready: %d tools (%d Meraki, %d ThousandEyes)",
             len(self._tools),
@@ -55,6 +87,7 @@ class MCPClientManager:
         self._te_session = None
         self._tools.clear()
         self._tool_map.clear()
+        self._tool_counts = dict.fromkeys(self._tool_counts, 0)
         logger.info("MCP client disconnected")
 
     async def _connect_meraki(self) -> None:
@@ -133,27 +166,35 @@ class MCPClientManager:
         if descriptor is None:
             return {"error": f"Unknown tool: {tool_name}"}
 
-        session = (
-            self._meraki_session if descriptor.source == "meraki" else self._te_session
-        )
+        session = self._session_for(descriptor.source)
         if session is None:
             return {"error": f"MCP session not connected for source: {descriptor.source}"}
 
-        try:
-            result = await session.call_tool(tool_name, arguments or {})
-            # Extract text content from MCP result
-            contents = []
-            for block in result.content:
-                if hasattr(block, "text"):
-                    contents.append(block.text)
-            return {
-                "tool": tool_name,
-                "source": descriptor.source,
-                "content": "\n".join(contents) if contents else str(result.content),
-            }
-        except Exception as e:
-            logger.exception("Error calling tool %s", tool_name)
-            return {"error": f"Tool call failed: {e}", "tool": tool_name}
+        with MCP_TOOL_DURATION.time(tool=tool_name, source=descriptor.source, status="ok") as labels:
+            try:
+                result = await session.call_tool(tool_name, arguments or {})
+                # Extract text content from MCP result
+                contents = []
+                for block in result.content:
+                    if hasattr(block, "text"):
+                        contents.append(block.text)
+                if getattr(result, "isError", False):
+                    labels["status"] = "error"
+                elif tool_name == "switch_profile":
+                    for listener in self._profile_listeners:
+                        listener()
+                return {
+                    "tool": tool_name,
+                    "source": descriptor.source,
+                    "content": "\n".join(contents) if contents else str(result.content),
+                }
+            except asyncio.CancelledError:
+                labels["status"] = "cancelled"
+                raise
+            except Exception as e:
+                labels["status"] = "error"
+                logger.exception("Error calling tool %s", tool_name)
+                return {"error": f"Tool call failed: {e}", "tool": tool_name}
 
     def get_tools_for_agent(self, agent_type: str) -> list[ToolDescriptor]:
         """Get tools available to a specific agent type.
@@ -0,0 +1,133 @@
+"""Parsing MCP tool results into Python values.
+
+Shared by everything that reads Meraki data outside the agents' own tool
+calls (table extraction, entity stats, the inventory index, the canvas
+summaries).  Besides plain JSON this handles the two envelopes the Meraki MCP
+server uses: stale cached lists arrive wrapped as ``{"_stale": true, "items":
+[...]}``, and large results are truncated to a preview plus a
+``_full_response_cached`` handle from which the full dataset is loaded.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from pathlib import Path
+
+from config import settings
+from mcp_client.manager import mcp_manager
+
+logger = logging.getLogger(__name__)
+
+# get_cached_response returns at most this many items per call
+_CACHED_PAGE_SIZE = 100
+_CACHED_PAGE_CONCURRENCY = 8
+
+
+def parse_result(raw: object) -> object | None:
+    """Parse a tool result (JSON text, or an already decoded value); None if it isn't JSON."""
+    if isinstance(raw, (list, dict)):
+        return raw
+    if isinstance(raw, str):
+        try:
+            return json.loads(raw)
+        except (json.JSONDecodeError, ValueError):
+            logger.debug("parse_result: not JSON (%d chars)", len(raw))
+            return None
+    return None
+
+
+def unwrap_stale(parsed: object) -> object:
+    """Return the list inside a stale-cache envelope, or ``parsed`` unchanged.
+
+    The Meraki MCP server can't flag a stale list in place, so it wraps it.
+    """
+    if isinstance(parsed, dict) and parsed.get("_stale") and isinstance(parsed.get("items"), list):
+        return parsed["items"]
+    return parsed
+
+
+async def call_json(tool_name: str, args: dict, timeout: float | None = None) -> object | None:
+    """Call an MCP tool and return its parsed result; None on error, timeout or non-JSON.
+
+    Stale lists are unwrapped and truncated responses expanded to the full
+    list (the preview is kept if that fails).
+    """
+    try:
+        result = await asyncio.wait_for(mcp_manager.call_tool(tool_name, args), timeout)
+    except asyncio.TimeoutError:
+        logger.warning("%s timed out for %s", tool_name, args)
+        return None
+    except Exception:
+        logger.warning("Failed to call %s for %s", tool_name, args)
+        return None
+    if "error" in result:
+        logger.warning("%s failed for %s: %s", tool_name, args, result["error"])
+        return None
+    parsed = unwrap_stale(parse_result(result.get("content", "")))
+    if isinstance(parsed, dict) and parsed.get("_full_response_cached"):
+        full = await load_full_response(parsed)
+        if full is not None:
+            parsed = full
+    return parsed
+
+
+async def fetch_list(tool_name: str, args: dict, timeout: float | None = None) -> list | None:
+    """Call an MCP tool expected to return a JSON list; None on error, timeout or any other shape."""
+    parsed = await call_json(tool_name, args, timeout)
+    return parsed if isinstance(parsed, list) else None
+
+
+async def load_full_response(truncated: dict) -> list | None:
+    """Load the full dataset behind a truncated response's cache handle.
+
+    Reads the shared cache file directly when it is inside the response cache
+    directory; otherwise pages through ``get_cached_response`` with parallel
+    batches.  Returns None (callers keep the preview) if neither works.
+    """
+    filepath = str(truncated["_full_response_cached"])
+
+    data = await asyncio.to_thread(_read_cache_file, filepath)
+    if data is not None:
+        logger.info("load_full_response: loaded %d items from cache file %s", len(data), filepath)
+        return data
+
+    total = truncated.get("_total_items")
+    if not isinstance(total, int) or total <= 0 or not mcp_manager.meraki_connected:
+        return None
+
+    semaphore = asyncio.Semaphore(_CACHED_PAGE_CONCURRENCY)
+
+    async def fetch_page(offset: int) -> list | None:
+        async with semaphore:
+            result = await mcp_manager.call_tool("get_cached_response", {
+                "filepath": filepath, "offset": offset, "limit": _CACHED_PAGE_SIZE,
+            })
+        page = parse_result(result.get("content", "")) if "error" not in result else None
+        if isinstance(page, dict) and isinstance(page.get("data"), list):
+            return page["data"]
+        return None
+
+    pages = await asyncio.gather(*(fetch_page(o) for o in range(0, total, _CACHED_PAGE_SIZE)))
+    if any(p is None for p in pages):
+        logger.warning("load_full_response: failed to page cached response %s", filepath)
+        return None
+    data = [item for page in pages for item in page]
+    logger.info("load_full_response: loaded %d items in %d pages via get_cached_response", len(data), len(pages))
+    return data
+
+
+def _read_cache_file(filepath: str) -> list | None:
+    """Read a Meraki MCP cache file, only from inside the response cache dir."""
+    cache_dir = Path(settings.response_cache_dir or ".meraki_cache").resolve()
+    path = Path(filepath).resolve()
+    if cache_dir not in path.parents or not path.is_file():
+        return None
+    try:
+        with path.open(encoding="utf-8") as f:
+            data = json.load(f).get("data")
+    except (OSError, ValueError, AttributeError):
+        logger.debug("load_full_response: could not read cache file %s", filepath)
+        return None
+    return data if isinstance(data, list) else None
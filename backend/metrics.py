@@ -0,0 +1,186 @@
+"""In-process metrics registry rendered in the Prometheus text format.
+
+Counters, gauges and histograms with labels, kept in memory and exposed at
+``/api/metrics``.  Values that already live elsewhere (session counts,
+WebSocket queues, cache hit counts) are read at scrape time by collectors
+instead of being mirrored.  All updates happen on the event loop thread.
+"""
+
+from __future__ import annotations
+
+import bisect
+import math
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+
+# Seconds: from fast tool calls to multi-minute graph runs
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 60, 120, 300)
+TOKEN_BUCKETS = (100, 250, 500, 1000, 2000, 4000, 8000, 16000, 32000, 64000, 128000)
+
+Sample = tuple[str, dict[str, str], float]  # (name, labels, value)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.help = help_text
+        self.labelnames = labelnames
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def samples(self) -> Iterator[Sample]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()) -> None:
+        super().__init__(name, help_text, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> Iterator[Sample]:
+        for key, value in self._values.items():
+            yield self.name, dict(zip(self.labelnames, key)), value
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, help_text, labelnames)
+        self.buckets = buckets
+        # Per label set: (per-bucket counts, +Inf overflow last), sum
+        self._series: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = ([0] * (len(self.buckets) + 1), [0.0])
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1][0] += value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[dict[str, str]]:
+        """Observe the block's duration.  Labels may be updated inside the block."""
+        started = time.perf_counter()
+        try:
+            yield labels
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def samples(self) -> Iterator[Sample]:
+        for key, (counts, total) in self._series.items():
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), counts):
+                cumulative += count
+                yield f"{self.name}_bucket", {**labels, "le": _format_value(bound)}, cumulative
+            yield f"{self.name}_sum", labels, total[0]
+            yield f"{self.name}_count", labels, cumulative
+
+
+class Registry:
+    """Metrics plus collectors, rendered together on scrape."""
+
+    def __init__(self) -> None:
+        self._metrics: list[_Metric] = []
+        self._collectors: list[Callable[[], list[tuple[str, str, str, list[Sample]]]]] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        return self.register(Counter(name, help_text, labelnames))
+
+    def gauge(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()) -> Gauge:
+        return self.register(Gauge(name, help_text, labelnames))
+
+    def histogram(
+        self, name: str, help_text: str, labelnames: tuple[str, ...] = (), buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, help_text, labelnames, buckets))
+
+    def add_collector(self, collector: Callable[[], list[tuple[str, str, str, list[Sample]]]]) -> None:
+        """Add a callable returning ``[(name, kind, help, samples)]`` read at scrape time."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        families = [(m.name, m.kind, m.help, list(m.samples())) for m in self._metrics]
+        for collector in self._collectors:
+            families.extend(collector())
+        lines: list[str] = []
+        for name, kind, help_text, samples in families:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(f"{s}{_format_labels(labels)} {_format_value(v)}" for s, labels, v in samples)
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+GRAPH_NODE_DURATION = REGISTRY.histogram(
+    "agenticops_graph_node_duration_seconds", "Time spent in each agent graph node.", ("node",),
+)
+QUERY_DURATION = REGISTRY.histogram(
+    "agenticops_query_duration_seconds", "End-to-end query time by outcome.", ("outcome",),
+)
+QUERIES_IN_FLIGHT = REGISTRY.gauge("agenticops_queries_in_flight", "Queries currently running.")
+WEBSOCKET_CONNECTIONS = REGISTRY.gauge("agenticops_websocket_connections", "Open WebSocket connections.")
+LLM_DURATION = REGISTRY.histogram(
+    "agenticops_llm_request_duration_seconds", "LLM call latency by model.", ("model",),
+)
+LLM_TOKENS = REGISTRY.histogram(
+    "agenticops_llm_tokens", "Tokens per LLM call by model and direction (input/output).",
+    ("model", "direction"), buckets=TOKEN_BUCKETS,
+)
+LLM_ERRORS = REGISTRY.counter("agenticops_llm_errors_total", "Failed LLM calls by model.", ("model",))
+MCP_TOOL_DURATION = REGISTRY.histogram(
+    "agenticops_mcp_tool_duration_seconds", "MCP call_tool latency by tool, source and status.",
+    ("tool", "source", "status"),
+)
+
+QUERIES_IN_FLIGHT.set(0)
+WEBSOCKET_CONNECTIONS.set(0)
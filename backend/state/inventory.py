@@ -0,0 +1,378 @@
+"""In-memory Meraki inventory index, kept fresh by a background task.
+
+Answers the common inventory questions (devices in a network, which network
+a serial is in, which networks have wireless, SSIDs per network, model
+counts) with dictionary lookups instead of live MCP calls.  Networks and
+devices are loaded with one organization-wide call each, first and then every
+``INVENTORY_FULL_REFRESH_SECONDS``; the cycles in between only refetch the
+networks the organization's configuration change log names.  SSIDs have no
+organization-wide call, so a batch of wireless networks is refreshed each
+cycle, never-seen and just-changed networks first.
+
+The index belongs to one organization: a ``switch_profile`` call, or a
+refresh that finds a different active organization, empties it and reloads.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import Counter
+
+from config import settings
+from mcp_client.manager import mcp_manager
+from mcp_client.results import call_json, fetch_list
+
+logger = logging.getLogger(__name__)
+
+# Concurrent per-network lookups (SSIDs, changed networks) during a refresh
+_NETWORK_CONCURRENCY = 8
+
+# More changed networks than this in one cycle: a full reload is cheaper
+_MAX_CHANGED_NETWORKS = 50
+
+# The change log is read from this long before the last sync, so nothing
+# logged while that sync was running is missed
+_CHANGE_LOG_OVERLAP_SECONDS = 60
+
+
+class InventoryIndex:
+    """Networks, devices and SSIDs of the active organization, indexed for lookup.
+
+    Lookups return None when the data isn't indexed (yet), so callers can
+    fall back to a live call.
+    """
+
+    def __init__(self) -> None:
+        self._networks: dict[str, dict] = {}  # networkId -> network
+        self._network_ids_by_name: dict[str, str] = {}  # lowercased name -> networkId
+        self._devices: dict[str, dict] = {}  # serial -> device
+        self._serials_by_network: dict[str, list[str]] = {}
+        self._wireless: set[str] = set()  # networkIds with wireless devices
+        self._models: Counter[str] = Counter()
+        self._ssids: dict[str, tuple[float, list[dict]]] = {}  # networkId -> (refreshed_at, ssids)
+        self._networks_at: float | None = None
+        self._devices_at: float | None = None
+        self._full_at: float | None = None  # Last full reload (monotonic)
+        self._synced_at: float | None = None  # Wall time the index was last brought up to date
+        self._org_id: str | None = None  # Organization the index was loaded from
+        self._generation = 0  # Bumped by reset(); results of older refreshes are discarded
+        self._wake = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self.refreshes = 0
+        self.incremental_refreshes = 0
+        self.failures = 0
+
+    @property
+    def ready(self) -> bool:
+        """Whether networks and devices have been loaded at least once."""
+        return self._networks_at is not None and self._devices_at is not None
+
+    # -- Lifecycle -----------------------------------------------------------
+
+    async def start(self) -> None:
+        """Start the background refresh (``INVENTORY_REFRESH_SECONDS``, 0 disables)."""
+        if settings.inventory_refresh_seconds <= 0 or not mcp_manager.meraki_connected:
+            return
+        mcp_manager.add_profile_listener(self.reset)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception:
+                self.failures += 1
+                logger.exception("Inventory refresh failed")
+            # Sleep until the next cycle, or until a reset asks for a reload
+            try:
+                await asyncio.wait_for(self._wake.wait(), settings.inventory_refresh_seconds)
+            except TimeoutError:
+                pass
+            self._wake.clear()
+
+    def reset(self) -> None:
+        """Forget everything indexed and reload soon, e.g. after the organization changed."""
+        self._networks, self._network_ids_by_name = {}, {}
+        self._devices, self._serials_by_network = {}, {}
+        self._wireless, self._models = set(), Counter()
+        self._ssids = {}
+        self._networks_at = self._devices_at = None
+        self._full_at = self._synced_at = None
+        self._org_id = None
+        self._generation += 1
+        self._wake.set()
+        logger.info("Inventory index reset")
+
+    async def refresh(self) -> None:
+        """Bring networks and devices up to date, then refresh the next batch of SSIDs.
+
+        Applies only the configuration change log since the last sync when it
+        can; falls back to a full reload when one is due, the log can't be
+        read, it names organization-level changes or too many networks, or a
+        changed network can't be fetched (e.g. it was deleted).
+        """
+        started = time.monotonic()
+        org_id = await _active_org_id()
+        if org_id is not None and self._org_id is not None and org_id != self._org_id:
+            # The organization changed without a switch_profile seen here: reload now
+            self.reset()
+            self._wake.clear()
+        generation = self._generation
+        synced_at = time.time()
+
+        full_due = self._full_at is None or started - self._full_at >= settings.inventory_full_refresh_seconds
+        changes = None if full_due else await self._fetch_changes()
+        if changes is not None:
+            await self._apply_changes(generation, synced_at, *changes)
+        else:
+            await self._reload(generation, synced_at)
+        if generation != self._generation:
+            # The organization changed mid-refresh: these lists are from the old one
+            logger.info("Inventory refresh discarded after a reset")
+            return
+        if org_id is not None:
+            self._org_id = org_id
+
+        await self._refresh_ssids(generation)
+        self.refreshes += 1
+        logger.info(
+            "Inventory refreshed (%s) in %.1fs: %d networks, %d devices, SSIDs for %d/%d wireless networks",
+            "full" if changes is None else f"{len(changes[0])} changed networks",
+            time.monotonic() - started, len(self._networks), len(self._devices),
+            len(self._ssids), len(self._wireless),
+        )
+
+    async def _reload(self, generation: int, synced_at: float) -> None:
+        networks, devices = await asyncio.gather(
+            fetch_list("getOrganizationNetworks", {}),
+            fetch_list("getOrganizationDevices", {}),
+        )
+        if generation != self._generation:
+            return
+        if networks is not None:
+            self._set_networks(networks)
+        if devices is not None:
+            self._set_devices(devices)
+        if networks is None or devices is None:
+            self.failures += 1
+            return
+        self._full_at = time.monotonic()
+        self._synced_at = synced_at
+
+    async def _fetch_changes(self) -> tuple[list[dict], list] | None:
+        """The changed networks and their devices since the last sync; None if a full reload is needed."""
+        if self._synced_at is None:
+            return None
+        t0 = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(self._synced_at - _CHANGE_LOG_OVERLAP_SECONDS))
+        changes = await fetch_list("call_meraki_api", {
+            "section": "organizations",
+            "method": "getOrganizationConfigurationChanges",
+            "parameters": {"t0": t0, "perPage": settings.max_per_page},
+        })
+        if changes is None or len(changes) >= settings.max_per_page:
+            return None  # Unreadable, or possibly more changes than one page holds
+        network_ids: set[str] = set()
+        for change in changes:
+            network_id = change.get("networkId") if isinstance(change, dict) else None
+            if not network_id:
+                return None  # An organization-level change (e.g. a network added or removed)
+            network_ids.add(network_id)
+        if not network_ids:
+            return [], []
+        if len(network_ids) > _MAX_CHANGED_NETWORKS:
+            return None
+
+        semaphore = asyncio.Semaphore(_NETWORK_CONCURRENCY)
+
+        async def fetch_network(network_id: str) -> object | None:
+            async with semaphore:
+                return await call_json("getNetwork", {"networkId": network_id})
+
+        networks, devices = await asyncio.gather(
+            asyncio.gather(*(fetch_network(nid) for nid in sorted(network_ids))),
+            fetch_list("call_meraki_api", {
+                "section": "organizations",
+                "method": "getOrganizationDevices",
+                "parameters": {"networkIds": sorted(network_ids)},
+            }),
+        )
+        if devices is None or not all(isinstance(n, dict) and n.get("id") for n in networks):
+            return None
+        return list(networks), devices
+
+    async def _apply_changes(self, generation: int, synced_at: float, networks: list[dict], devices: list) -> None:
+        """Replace the changed networks and all of their devices in the index."""
+        if generation != self._generation:
+            return
+        changed = {n["id"] for n in networks}
+        for network in networks:
+            old = self._networks.get(network["id"])
+            if old is not None:
+                self._network_ids_by_name.pop(str(old.get("name", "")).lower(), None)
+            self._networks[network["id"]] = network
+            self._network_ids_by_name[str(network.get("name", "")).lower()] = network["id"]
+            self._ssids.pop(network["id"], None)  # Refetched first in this cycle's SSID batch
+        if changed:
+            # Rebuilt from memory: the other networks' devices plus the changed networks' new ones
+            serials = {d.get("serial") for d in devices if isinstance(d, dict)}
+            kept = [d for d in self._devices.values() if d.get("networkId") not in changed and d["serial"] not in serials]
+            self._set_devices(kept + devices)
+        self._networks_at = self._devices_at = time.monotonic()
+        self._synced_at = synced_at
+        self.incremental_refreshes += 1
+
+    def _set_networks(self, networks: list) -> None:
+        self._networks = {n["id"]: n for n in networks if isinstance(n, dict) and n.get("id")}
+        self._network_ids_by_name = {str(n.get("name", "")).lower(): nid for nid, n in self._networks.items()}
+        self._ssids = {nid: v for nid, v in self._ssids.items() if nid in self._networks}
+        self._networks_at = time.monotonic()
+
+    def _set_devices(self, devices: list) -> None:
+        by_serial: dict[str, dict] = {}
+        by_network: dict[str, list[str]] = {}
+        wireless: set[str] = set()
+        models: Counter[str] = Counter()
+        for dev in devices:
+            if not isinstance(dev, dict) or not dev.get("serial"):
+                continue
+            by_serial[dev["serial"]] = dev
+            models[dev.get("model") or "unknown"] += 1
+            network_id = dev.get("networkId")
+            if network_id:
+                by_network.setdefault(network_id, []).append(dev["serial"])
+                if dev.get("productType") == "wireless":
+                    wireless.add(network_id)
+        self._devices, self._serials_by_network = by_serial, by_network
+        self._wireless, self._models = wireless, models
+        self._devices_at = time.monotonic()
+
+    async def _refresh_ssids(self, generation: int) -> None:
+        # Never-indexed networks first, then the least recently refreshed
+        pending = sorted(self._wireless, key=lambda nid: self._ssids.get(nid, (0.0,))[0])
+        batch = pending[:settings.inventory_ssid_batch]
+        semaphore = asyncio.Semaphore(_NETWORK_CONCURRENCY)
+
+        async def refresh_one(network_id: str) -> None:
+            async with semaphore:
+                ssids = await fetch_list("getNetworkWirelessSsids", {"networkId": network_id})
+            if ssids is not None and generation == self._generation:
+                self._ssids[network_id] = (time.monotonic(), [s for s in ssids if isinstance(s, dict)])
+
+        await asyncio.gather(*(refresh_one(nid) for nid in batch))
+
+    # -- Lookups -------------------------------------------------------------
+
+    def device_count(self, network_id: str) -> int | None:
+        if self._devices_at is None:
+            return None
+        return len(self._serials_by_network.get(network_id, ()))
+
+    def device_counts(self) -> dict[str, int] | None:
+        """Device count for every network with devices."""
+        if self._devices_at is None:
+            return None
+        return {nid: len(serials) for nid, serials in self._serials_by_network.items()}
+
+    def enabled_ssid_count(self, network_id: str) -> int | None:
+        """Enabled SSIDs; 0 for networks without wireless devices, None if not indexed yet."""
+        if self._devices_at is None:
+            return None
+        if network_id not in self._wireless:
+            return 0
+        entry = self._ssids.get(network_id)
+        if entry is None:
+            return None
+        return sum(1 for s in entry[1] if s.get("enabled", False))
+
+    def wireless_network_ids(self) -> set[str] | None:
+        return set(self._wireless) if self._devices_at is not None else None
+
+    def network_for_serial(self, serial: str) -> dict | None:
+        device = self._devices.get(serial)
+        return self._networks.get(device.get("networkId", "")) if device else None
+
+    def find_network(self, name_or_id: str) -> dict | None:
+        network_id = name_or_id if name_or_id in self._networks else self._network_ids_by_name.get(name_or_id.lower())
+        return self._networks.get(network_id) if network_id else None
+
+    def find_device(self, serial_or_name: str) -> dict | None:
+        device = self._devices.get(serial_or_name) or self._devices.get(serial_or_name.upper())
+        if device is None:
+            needle = serial_or_name.lower()
+            device = next((d for d in self._devices.values() if str(d.get("name", "")).lower() == needle), None)
+        return device
+
+    def model_counts(self, network_id: str | None = None) -> dict[str, int]:
+        if network_id is None:
+            return dict(self._models.most_common())
+        counts = Counter(self._devices[s].get("model") or "unknown" for s in self._serials_by_network.get(network_id, ()))
+        return dict(counts.most_common())
+
+    def describe_network(self, network: dict) -> dict:
+        """A network with its device, model and SSID details from the index."""
+        network_id = network["id"]
+        entry = self._ssids.get(network_id)
+        return {
+            "id": network_id,
+            "name": network.get("name"),
+            "productTypes": network.get("productTypes", []),
+            "timeZone": network.get("timeZone"),
+            "tags": network.get("tags", []),
+            "deviceCount": self.device_count(network_id),
+            "models": self.model_counts(network_id),
+            "hasWireless": network_id in self._wireless,
+            "ssids": [
+                {"number": s.get("number"), "name": s.get("name"), "enabled": s.get("enabled", False)}
+                for s in entry[1]
+            ] if entry else None,
+        }
+
+    def summary(self) -> dict:
+        product_types = Counter(d.get("productType") or "unknown" for d in self._devices.values())
+        return {
+            "networks": len(self._networks),
+            "devices": len(self._devices),
+            "devicesByProductType": dict(product_types.most_common()),
+            "topModels": dict(self._models.most_common(10)),
+            "wirelessNetworks": len(self._wireless),
+            "ageSeconds": self._age(),
+        }
+
+    def stats(self) -> dict:
+        return {
+            "ready": self.ready,
+            "organization_id": self._org_id,
+            "networks": len(self._networks),
+            "devices": len(self._devices),
+            "wireless_networks": len(self._wireless),
+            "ssid_networks_indexed": len(self._ssids),
+            "age_seconds": self._age(),
+            "refreshes": self.refreshes,
+            "incremental_refreshes": self.incremental_refreshes,
+            "failures": self.failures,
+        }
+
+    def _age(self) -> int | None:
+        loaded = [t for t in (self._networks_at, self._devices_at) if t is not None]
+        return int(time.monotonic() - min(loaded)) if loaded else None
+
+
+async def _active_org_id() -> str | None:
+    """The active profile's organization ID, or None if it can't be read."""
+    profile = await call_json("get_active_profile", {})
+    return profile.get("organization_id") if isinstance(profile, dict) else None
+
+
+# Global singleton
+inventory = InventoryIndex()
@@ -0,0 +1,246 @@
+"""SQLite persistence for sessions, written behind the event loop.
+
+Session mutations are queued in memory and written in batches by a
+background task, so ``add_message``/``add_card`` never wait on disk.  All
+database work runs on one dedicated thread, which keeps writes ordered and
+lets a cold session load see every write queued before it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    created_at REAL NOT NULL,
+    last_active REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id TEXT NOT NULL,
+    role TEXT NOT NULL,
+    content TEXT NOT NULL,
+    timestamp REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS messages_session ON messages (session_id, id);
+CREATE TABLE IF NOT EXISTS cards (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id TEXT NOT NULL,
+    card_id TEXT NOT NULL,
+    data TEXT NOT NULL,
+    UNIQUE (session_id, card_id)
+);
+"""
+
+
+@dataclass(slots=True)
+class StoredSession:
+    """A session as loaded from the database."""
+
+    created_at: float
+    messages: list[tuple[str, str, float]]  # (role, content, timestamp), oldest first
+    cards: list[dict]
+
+
+class SessionDatabase:
+    """Write-behind SQLite store (WAL mode) for session history and cards."""
+
+    def __init__(self, path: str, flush_interval: float, max_messages: int, max_cards: int) -> None:
+        self._path = path
+        self._flush_interval = flush_interval
+        self._max_messages = max_messages
+        self._max_cards = max_cards
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="session-db")
+        self._conn: sqlite3.Connection | None = None
+        self._pending: list[tuple] = []
+        self._known: set[str] = set()  # Session IDs in the database or queued for it
+        self._task: asyncio.Task | None = None
+        self.writes = 0
+        self.batches = 0
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    async def start(self, retention_seconds: float) -> None:
+        """Open the database, drop expired sessions and start the writer task."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self._open, retention_seconds)
+        self._task = asyncio.create_task(self._run())
+        logger.info("Session database ready: %s", self._path)
+
+    async def stop(self) -> None:
+        """Stop the writer task and flush everything still queued."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await asyncio.get_running_loop().run_in_executor(self._executor, self._write, self._take())
+        await asyncio.get_running_loop().run_in_executor(self._executor, self._close)
+        self._executor.shutdown(wait=True)
+
+    # -- Queued writes (called from Session methods, never block) ----------
+
+    def record_session(self, session_id: str, created_at: float) -> None:
+        self._known.add(session_id)
+        self._pending.append(("session", session_id, created_at))
+
+    def record_message(self, session_id: str, role: str, content: str, timestamp: float) -> None:
+        self._pending.append(("message", session_id, role, content, timestamp))
+
+    def record_card(self, session_id: str, card: dict) -> None:
+        self._pending.append(("card", session_id, str(card.get("id", "")), json.dumps(card)))
+
+    def record_card_removed(self, session_id: str, card_id: str) -> None:
+        self._pending.append(("remove_card", session_id, card_id))
+
+    def record_delete(self, session_id: str) -> None:
+        self._known.discard(session_id)
+        self._pending.append(("delete", session_id))
+
+    # -- Loads -------------------------------------------------------------
+
+    async def load(self, session_id: str) -> StoredSession | None:
+        """Load a session, after writing anything still queued.
+
+        Runs on the database thread so it is ordered after in-flight batches.
+        IDs never persisted (e.g. brand-new sessions) return None without
+        touching the database.
+        """
+        if self._conn is None or session_id not in self._known:
+            return None
+        batch = self._take()
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, self._write_then_load, batch, session_id,
+        )
+
+    # -- Database thread ---------------------------------------------------
+
+    def _open(self, retention_seconds: float) -> None:
+        Path(self._path).parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self._path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+        cutoff = time.time() - retention_seconds
+        with conn:
+            expired = [r[0] for r in conn.execute(
+                "SELECT session_id FROM sessions WHERE last_active < ?", (cutoff,))]
+            for sid in expired:
+                self._delete(conn, sid)
+        self._known = {r[0] for r in conn.execute("SELECT session_id FROM sessions")}
+        if expired:
+            logger.info("Session database: dropped %d expired sessions", len(expired))
+        self._conn = conn
+
+    def _close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _take(self) -> list[tuple]:
+        batch, self._pending = self._pending, []
+        return batch
+
+    def _write_then_load(self, batch: list[tuple], session_id: str) -> StoredSession | None:
+        self._write(batch)
+        conn = self._conn
+        row = conn.execute("SELECT created_at FROM sessions WHERE session_id = ?", (session_id,)).fetchone()
+        if row is None:
+            return None
+        messages = conn.execute(
+            "SELECT role, content, timestamp FROM messages WHERE session_id = ? ORDER BY id DESC LIMIT ?",
+            (session_id, self._max_messages),
+        ).fetchall()
+        cards = conn.execute(
+            "SELECT data FROM cards WHERE session_id = ? ORDER BY id DESC LIMIT ?",
+            (session_id, self._max_cards),
+        ).fetchall()
+        return StoredSession(
+            created_at=row[0],
+            messages=list(reversed(messages)),
+            cards=[json.loads(c[0]) for c in reversed(cards)],
+        )
+
+    def _write(self, batch: list[tuple]) -> None:
+        if not batch or self._conn is None:
+            return
+        conn = self._conn
+        now = time.time()
+        touched: set[str] = set()
+        try:
+            with conn:
+                for op, sid, *args in batch:
+                    if op == "session":
+                        conn.execute(
+                            "INSERT OR IGNORE INTO sessions (session_id, created_at, last_active) VALUES (?, ?, ?)",
+                            (sid, args[0], now),
+                        )
+                    elif op == "message":
+                        conn.execute(
+                            "INSERT INTO messages (session_id, role, content, timestamp) VALUES (?, ?, ?, ?)",
+                            (sid, *args),
+                        )
+                    elif op == "card":
+                        conn.execute(
+                            "INSERT OR REPLACE INTO cards (session_id, card_id, data) VALUES (?, ?, ?)",
+                            (sid, *args),
+                        )
+                    elif op == "remove_card":
+                        conn.execute("DELETE FROM cards WHERE session_id = ? AND card_id = ?", (sid, args[0]))
+                    elif op == "delete":
+                        self._delete(conn, sid)
+                        touched.discard(sid)
+                        continue
+                    touched.add(sid)
+
+                for sid in touched:
+                    conn.execute("UPDATE sessions SET last_active = ? WHERE session_id = ?", (now, sid))
+                    self._prune(conn, sid)
+        except sqlite3.Error:
+            logger.exception("Session database: failed to write batch of %d operations", len(batch))
+            return
+        self.writes += len(batch)
+        self.batches += 1
+
+    def _prune(self, conn: sqlite3.Connection, sid: str) -> None:
+        """Keep only the newest messages/cards a session can hold in memory."""
+        conn.execute(
+            "DELETE FROM messages WHERE session_id = ? AND id <= "
+            "(SELECT id FROM messages WHERE session_id = ? ORDER BY id DESC LIMIT 1 OFFSET ?)",
+            (sid, sid, self._max_messages),
+        )
+        conn.execute(
+            "DELETE FROM cards WHERE session_id = ? AND id <= "
+            "(SELECT id FROM cards WHERE session_id = ? ORDER BY id DESC LIMIT 1 OFFSET ?)",
+            (sid, sid, self._max_cards),
+        )
+
+    @staticmethod
+    def _delete(conn: sqlite3.Connection, sid: str) -> None:
+        conn.execute("DELETE FROM messages WHERE session_id = ?", (sid,))
+        conn.execute("DELETE FROM cards WHERE session_id = ?", (sid,))
+        conn.execute("DELETE FROM sessions WHERE session_id = ?", (sid,))
+
+    # -- Writer task ---------------------------------------------------------
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self._flush_interval)
+            batch = self._take()
+            if batch:
+                await loop.run_in_executor(self._executor, self._write, batch)
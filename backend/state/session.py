@@ -2,49 +2,208 @@
 
 from __future__ import annotations
 
+import time
+import uuid
+from collections import OrderedDict, deque
+from collections.abc import Callable
 from dataclasses import dataclass, field
-from datetime import datetime
 
+from config import settings
+from state.persistence import SessionDatabase
+from state.tables import TableStore
 
-@dataclass
+# Bounds on the tool results kept for card follow-ups
+MAX_TOOL_RESULTS = 20
+MAX_TOOL_RESULT_CHARS = 2_000_000
+
+
+@dataclass(slots=True)
+class Message:
+    """One chat message; ``timestamp`` is Unix time in seconds."""
+
+    role: str
+    content: str
+    timestamp: float = field(default_factory=time.time)
+
+
+@dataclass(slots=True)
 class Session:
-    """A chat session with message history and card state."""
+    """A chat session with message history and card state.
+
+    Message and card history are capped (``SESSION_MAX_MESSAGES`` /
+    ``SESSION_MAX_CARDS``); the oldest entries are dropped first.
+    """
 
     session_id: str
-    messages: list[dict] = field(default_factory=list)
-    cards: list[dict] = field(default_factory=list)
-    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    messages: deque[Message] = field(default_factory=lambda: deque(maxlen=settings.session_max_messages))
+    cards: deque[dict] = field(default_factory=lambda: deque(maxlen=settings.session_max_cards))
+    tool_results: dict[str, dict] = field(default_factory=dict)  # Latest query's results by handle
+    tables: TableStore = field(default_factory=TableStore)  # Interactive tables, paged on request
+    created_at: float = field(default_factory=time.time)
+    last_active: float = field(default_factory=time.monotonic)
+    db: SessionDatabase | None = field(default=None, repr=False)  # Write-behind persistence, if enabled
 
     def add_message(self, role: str, content: str) -> None:
-        self.messages.append({
-            "role": role,
-            "content": content,
-            "timestamp": datetime.now().isoformat(),
-        })
+        message = Message(role, content)
+        self.messages.append(message)
+        if self.db is not None:
+            self.db.record_message(self.session_id, role, content, message.timestamp)
 
     def add_card(self, card: dict) -> None:
+        if self.db is not None and len(self.cards) == self.cards.maxlen:
+            # The deque is about to drop its oldest card; drop it on disk too
+            self.db.record_card_removed(self.session_id, str(self.cards[0].get("id", "")))
         self.cards.append(card)
+        if self.db is not None:
+            self.db.record_card(self.session_id, card)
 
     def remove_card(self, card_id: str) -> None:
-        self.cards = [c for c in self.cards if c.get("id") != card_id]
+        self.cards = deque((c for c in self.cards if c.get("id") != card_id), maxlen=self.cards.maxlen)
+        if self.db is not None:
+            self.db.record_card_removed(self.session_id, card_id)
+
+    def set_tool_results(self, results: list[dict]) -> None:
+        """Replace the stored tool results with the latest query's.
+
+        Keeps the most recent results within MAX_TOOL_RESULTS entries and
+        MAX_TOOL_RESULT_CHARS of result text, so "put that on a card"
+        follow-ups can reuse them without re-fetching.
+        """
+        kept: list[dict] = []
+        budget = MAX_TOOL_RESULT_CHARS
+        for tr in reversed(results[-MAX_TOOL_RESULTS:]):
+            budget -= len(str(tr.get("result", "")))
+            if budget < 0:
+                break
+            kept.append({**tr, "handle": tr.get("handle") or f"tr-{uuid.uuid4().hex[:8]}"})
+        self.tool_results = {tr["handle"]: tr for tr in reversed(kept)}
+
+    def last_tool_results(self) -> list[dict]:
+        """Tool results from the most recent query that ran tools, oldest first."""
+        return list(self.tool_results.values())
 
 
 class SessionStore:
-    """In-memory store for all active sessions."""
-
-    def __init__(self) -> None:
-        self._sessions: dict[str, Session] = {}
+    """In-memory store for all active sessions.
 
-    def get_or_create(self, session_id: str) -> Session:
-        if session_id not in self._sessions:
-            self._sessions[session_id] = Session(session_id=session_id)
-        return self._sessions[session_id]
+    Bounded by ``SESSION_MAX_SESSIONS`` (least recently used evicted first)
+    and ``SESSION_IDLE_TTL_SECONDS`` (idle sessions dropped on the next access).
+    With ``SESSION_DB_PATH`` set, history and cards are also persisted to
+    SQLite; evicted or pre-restart sessions are reloaded on first access.
+    """
 
-    def get(self, session_id: str) -> Session | None:
-        return self._sessions.get(session_id)
+    def __init__(self) -> None:
+        # Ordered by last access, least recent first
+        self._sessions: OrderedDict[str, Session] = OrderedDict()
+        self._evicted_lru = 0
+        self._evicted_ttl = 0
+        self._db: SessionDatabase | None = None
+        self._drop_listeners: list[Callable[[str], None]] = []
+
+    def add_drop_listener(self, listener: Callable[[str], None]) -> None:
+        """Call ``listener(session_id)`` whenever a session leaves memory (evicted or deleted)."""
+        self._drop_listeners.append(listener)
+
+    async def open(self) -> None:
+        """Start SQLite persistence if a database path is configured."""
+        if not settings.session_db_path:
+            return
+        db = SessionDatabase(
+            settings.session_db_path,
+            flush_interval=settings.session_db_flush_ms / 1000,
+            max_messages=settings.session_max_messages,
+            max_cards=settings.session_max_cards,
+        )
+        await db.start(retention_seconds=settings.session_db_retention_days * 86400)
+        self._db = db
+
+    async def close(self) -> None:
+        """Flush queued writes and close the database."""
+        if self._db is not None:
+            await self._db.stop()
+            self._db = None
+
+    async def get_or_create(self, session_id: str) -> Session:
+        session = await self.get(session_id)
+        if session is None:
+            session = self._add(Session(session_id=session_id, db=self._db))
+            if self._db is not None:
+                self._db.record_session(session_id, session.created_at)
+        return session
+
+    async def get(self, session_id: str) -> Session | None:
+        self._expire_idle()
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = await self._load(session_id)
+        if session is not None:
+            self._touch(session)
+        return session
 
     def delete(self, session_id: str) -> None:
-        self._sessions.pop(session_id, None)
+        if self._sessions.pop(session_id, None) is not None:
+            self._dropped(session_id)
+        if self._db is not None:
+            self._db.record_delete(session_id)
+
+    def _add(self, session: Session) -> Session:
+        self._sessions[session.session_id] = session
+        while len(self._sessions) > settings.session_max_sessions:
+            evicted, _ = self._sessions.popitem(last=False)
+            self._evicted_lru += 1
+            self._dropped(evicted)
+        return session
+
+    def _dropped(self, session_id: str) -> None:
+        for listener in self._drop_listeners:
+            listener(session_id)
+
+    async def _load(self, session_id: str) -> Session | None:
+        if self._db is None:
+            return None
+        stored = await self._db.load(session_id)
+        if stored is None:
+            return None
+        if session_id in self._sessions:
+            # Loaded or created by another request while this one waited on the database
+            return self._sessions[session_id]
+        session = Session(session_id=session_id, created_at=stored.created_at, db=self._db)
+        session.messages.extend(Message(role, content, ts) for role, content, ts in stored.messages)
+        session.cards.extend(stored.cards)
+        return self._add(session)
+
+    def stats(self) -> dict:
+        """Session counts, eviction totals and approximate memory footprint."""
+        return {
+            "sessions": len(self._sessions),
+            "max_sessions": settings.session_max_sessions,
+            "idle_ttl_seconds": settings.session_idle_ttl_seconds,
+            "evicted_lru": self._evicted_lru,
+            "evicted_ttl": self._evicted_ttl,
+            "messages": sum(len(s.messages) for s in self._sessions.values()),
+            "message_chars": sum(len(m.content) for s in self._sessions.values() for m in s.messages),
+            "cards": sum(len(s.cards) for s in self._sessions.values()),
+            "tool_results": sum(len(s.tool_results) for s in self._sessions.values()),
+            "table_rows": sum(s.tables.row_count for s in self._sessions.values()),
+            "db_enabled": self._db is not None,
+            "db_pending_writes": self._db.pending if self._db else 0,
+            "db_batches_written": self._db.batches if self._db else 0,
+        }
+
+    def _touch(self, session: Session) -> None:
+        session.last_active = time.monotonic()
+        self._sessions.move_to_end(session.session_id)
+
+    def _expire_idle(self) -> None:
+        # The least recently used session is first, so stop at the first live one
+        cutoff = time.monotonic() - settings.session_idle_ttl_seconds
+        while self._sessions:
+            oldest = next(iter(self._sessions.values()))
+            if oldest.last_active >= cutoff:
+                break
+            self._sessions.popitem(last=False)
+            self._evicted_ttl += 1
+            self._dropped(oldest.session_id)
 
 
 # Global singleton
@@ -0,0 +1,92 @@
+"""Short-lived cache for live entity stats shown in hover popups."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+
+# Bound on cached entities, least recently used evicted first
+MAX_ENTRIES = 5000
+
+
+class StatsCache:
+    """TTL cache keyed by entity, with concurrent lookups sharing one load.
+
+    Hovering across a table fires many requests for the same network; only
+    the first one calls MCP, the rest wait on its result.  Results the loader
+    marks as not cacheable (e.g. partial ones) are returned but not stored.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int = MAX_ENTRIES) -> None:
+        self._ttl = ttl_seconds
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()  # key -> (expires_at, value)
+        self._loading: dict[str, asyncio.Future] = {}
+        self._generation = 0  # Bumped by invalidate_prefix(); older loads aren't stored
+        self.hits = 0
+        self.misses = 0
+
+    async def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[tuple[dict, bool]]],
+        ttl_seconds: float | None = None,
+    ) -> tuple[dict, float]:
+        """Return ``(value, expires_at)``, loading on a miss.
+
+        ``loader`` returns ``(value, cacheable)``.  ``expires_at`` is a
+        monotonic time; it is "now" for values that weren't cached.
+        ``ttl_seconds`` overrides the cache's TTL for this key.
+        """
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1], entry[0]
+
+        pending = self._loading.get(key)
+        if pending is not None:
+            self.hits += 1
+            return await asyncio.shield(pending)
+
+        self.misses += 1
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._loading[key] = future
+        generation = self._generation
+        try:
+            value, cacheable = await loader()
+            expires_at = time.monotonic()
+            if cacheable and generation == self._generation:
+                expires_at += self._ttl if ttl_seconds is None else ttl_seconds
+                self._store(key, expires_at, value)
+            future.set_result((value, expires_at))
+            return value, expires_at
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            future.exception()  # Mark retrieved when no one else is waiting
+            raise
+        finally:
+            if self._loading.get(key) is future:
+                del self._loading[key]
+
+    def invalidate(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def invalidate_prefix(self, prefix: str) -> None:
+        """Drop every key starting with ``prefix``; loads already running won't be stored or shared."""
+        self._generation += 1
+        for key in [k for k in self._entries if k.startswith(prefix)]:
+            del self._entries[key]
+        for key in [k for k in self._loading if k.startswith(prefix)]:
+            del self._loading[key]
+
+    def _store(self, key: str, expires_at: float, value: dict) -> None:
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
@@ -0,0 +1,134 @@
+"""Server-held interactive tables, sent to the client one page at a time."""
+
+from __future__ import annotations
+
+import logging
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+# Rows in the table_data event; further pages are fetched with table_page
+PAGE_SIZE = 500
+MAX_PAGE_SIZE = 1000
+
+# Per-session bounds, least recently used tables are evicted first
+MAX_TABLES = 10
+MAX_TABLE_ROWS = 100_000
+
+
+class TableStore:
+    """Bounded LRU store of a session's interactive tables.
+
+    Holds full tables so large results (thousands of networks) can be paged,
+    sorted and filtered on request instead of sent in one frame.  The last
+    sorted/filtered view of each table is kept so paging through it doesn't
+    re-sort; view rows count against ``max_rows`` like table rows.
+    """
+
+    def __init__(self, max_tables: int = MAX_TABLES, max_rows: int = MAX_TABLE_ROWS) -> None:
+        self._tables: OrderedDict[str, dict] = OrderedDict()
+        self._views: dict[str, tuple[tuple, list[dict]]] = {}
+        self._max_tables = max_tables
+        self._max_rows = max_rows
+        self._row_count = 0
+
+    def __len__(self) -> int:
+        return len(self._tables)
+
+    @property
+    def row_count(self) -> int:
+        return self._row_count
+
+    def add(self, table: dict) -> None:
+        """Store a table, evicting the least recently used ones past the bounds."""
+        table_id = table["table_id"]
+        self._discard(table_id)
+        self._tables[table_id] = table
+        self._row_count += len(table["rows"])
+        self._enforce_bounds()
+
+    def page(
+        self,
+        table_id: str,
+        offset: int = 0,
+        limit: int = PAGE_SIZE,
+        sort_column: str | None = None,
+        descending: bool = False,
+        filter_text: str = "",
+    ) -> dict | None:
+        """Return one page of a stored table, or None if it's unknown or evicted.
+
+        ``filter_text`` keeps rows with any cell containing it (case-insensitive);
+        ``sort_column`` sorts by that column, numerically where cells are numbers.
+        ``total_rows`` in the result counts the rows matching the filter.
+        """
+        table = self._tables.get(table_id)
+        if table is None:
+            return None
+        self._tables.move_to_end(table_id)
+
+        offset = max(0, offset)
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        rows = self._view(table, sort_column, descending, filter_text.strip().lower())
+
+        return {
+            "table_id": table_id,
+            "entity_type": table["entity_type"],
+            "source": table["source"],
+            "columns": table["columns"],
+            "rows": rows[offset:offset + limit],
+            "offset": offset,
+            "limit": limit,
+            "total_rows": len(rows),
+            "sort": {"column": sort_column, "descending": descending} if sort_column else None,
+            "filter": filter_text or None,
+        }
+
+    def _view(self, table: dict, sort_column: str | None, descending: bool, needle: str) -> list[dict]:
+        key = (sort_column, descending, needle)
+        cached = self._views.get(table["table_id"])
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        rows = table["rows"]
+        if needle:
+            rows = [r for r in rows if any(needle in str(cell).lower() for cell in r["cells"])]
+        if sort_column in table["columns"]:
+            idx = table["columns"].index(sort_column)
+            rows = sorted(rows, key=lambda r: _sort_key(r["cells"][idx] if idx < len(r["cells"]) else ""),
+                          reverse=descending)
+
+        self._drop_view(table["table_id"])
+        if rows is not table["rows"]:
+            self._views[table["table_id"]] = (key, rows)
+            self._row_count += len(rows)
+            self._enforce_bounds()
+        return rows
+
+    def _enforce_bounds(self) -> None:
+        # The most recently used table is never evicted, even if it alone exceeds the bounds
+        while len(self._tables) > 1 and (
+            len(self._tables) > self._max_tables or self._row_count > self._max_rows
+        ):
+            evicted, _ = next(iter(self._tables.items()))
+            self._discard(evicted)
+            logger.info("TableStore: evicted table %s", evicted)
+
+    def _drop_view(self, table_id: str) -> None:
+        view = self._views.pop(table_id, None)
+        if view is not None:
+            self._row_count -= len(view[1])
+
+    def _discard(self, table_id: str) -> None:
+        table = self._tables.pop(table_id, None)
+        if table is not None:
+            self._row_count -= len(table["rows"])
+        self._drop_view(table_id)
+
+
+def _sort_key(cell: object) -> tuple:
+    """Numbers sort before text, numerically; text sorts case-insensitively."""
+    try:
+        return (0, float(cell), "")
+    except (TypeError, ValueError):
+        return (1, 0.0, str(cell).lower())
@@ -11,7 +11,9 @@ export function ChatPanel() {
   const pendingPrompt = useChatStore((s) => s.pendingPrompt)
   const setPendingPrompt = useChatStore((s) => s.setPendingPrompt)
   const clearMessages = useChatStore((s) => s.clearMessages)
-  const { sendMessage, stopProcessing } = useChat()
+  const pendingTablePage = useChatStore((s) => s.pendingTablePage)
+  const setPendingTablePage = useChatStore((s) => s.requestTablePage)
+  const { sendMessage, stopProcessing, requestTablePage } = useChat()
   const [showClearConfirm, setShowClearConfirm] = useState(false)
   const bottomRef = useRef<HTMLDivElement>(null)
 
@@ -26,6 +28,13 @@ export function ChatPanel() {
     }
   }, [pendingPrompt, sendMessage, setPendingPrompt])
 
+  useEffect(() => {
+    if (pendingTablePage) {
+      requestTablePage(pendingTablePage)
+      setPendingTablePage(null)
+    }
+  }, [pendingTablePage, requestTablePage, setPendingTablePage])
+
   return (
     <div className="flex flex-col h-full bg-gray-950">
       {/* Header */}
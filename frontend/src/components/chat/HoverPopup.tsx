@@ -4,23 +4,26 @@ import type { TableRowMetadata } from '../../types/chat'
 import { useCanvasStore } from '../../store/canvasSlice'
 import type { NetworkHealthCard } from '../../types/card'
 
-interface EntityStats {
+export interface EntityStats {
   deviceCount: number
   clientCount: number
   ssidCount: number
+  partial?: boolean
+  missing?: string[]
 }
 
 interface Props {
   metadata: TableRowMetadata
   entityType: string
+  prefetchedStats?: EntityStats  // From the table's bulk request, if it has arrived
   anchorRect: DOMRect
   networkName?: string
   onClose: () => void
 }
 
-export function HoverPopup({ metadata, entityType, anchorRect, networkName, onClose }: Props) {
-  const [stats, setStats] = useState<EntityStats | null>(null)
-  const [loading, setLoading] = useState(true)
+export function HoverPopup({ metadata, entityType, prefetchedStats, anchorRect, networkName, onClose }: Props) {
+  const [stats, setStats] = useState<EntityStats | null>(prefetchedStats ?? null)
+  const [loading, setLoading] = useState(!prefetchedStats && Boolean(metadata.networkId))
   const [error, setError] = useState<string | null>(null)
   const popupRef = useRef<HTMLDivElement>(null)
   const addCard = useCanvasStore((s) => s.addCard)
@@ -41,17 +44,24 @@ export function HoverPopup({ metadata, entityType, anchorRect, networkName, onCl
   }, [onClose])
 
   useEffect(() => {
+    if (prefetchedStats) {
+      setStats(prefetchedStats)
+      setLoading(false)
+      setError(null)
+      return
+    }
     let cancelled = false
     setLoading(true)
     setError(null)
 
     if (!metadata.networkId) {
+      // Nothing to fetch: the live stats section is hidden
       setLoading(false)
-      setError('No network ID')
       return
     }
 
-    fetch(`/api/entity/${entityType}/${metadata.networkId}/stats`)
+    // Stats are per network; rows of other entity types carry their networkId
+    fetch(`/api/entity/network/${metadata.networkId}/stats`)
       .then((res) => {
         if (!res.ok) throw new Error(`HTTP ${res.status}`)
         return res.json()
@@ -70,7 +80,7 @@ export function HoverPopup({ metadata, entityType, anchorRect, networkName, onCl
       })
 
     return () => { cancelled = true }
-  }, [entityType, metadata.networkId])
+  }, [entityType, metadata.networkId, prefetchedStats])
 
   const handleAddToCanvas = () => {
     const metrics = []
@@ -228,36 +238,40 @@ export function HoverPopup({ metadata, entityType, anchorRect, networkName, onCl
       {/* Divider */}
       <div className="border-t border-gray-800" />
 
-      {/* Live stats */}
-      <div className="px-3 py-2">
-        <span className="text-xs text-gray-500">Live Stats</span>
-        {loading ? (
-          <div className="flex items-center gap-2 mt-1">
-            <div className="w-3 h-3 border-2 border-blue-500/30 border-t-blue-500 rounded-full animate-spin" />
-            <span className="text-xs text-gray-500">Loading stats...</span>
+      {/* Live stats, for entities in a network */}
+      {metadata.networkId && (
+        <>
+          <div className="px-3 py-2">
+            <span className="text-xs text-gray-500">Live Stats</span>
+            {loading ? (
+              <div className="flex items-center gap-2 mt-1">
+                <div className="w-3 h-3 border-2 border-blue-500/30 border-t-blue-500 rounded-full animate-spin" />
+                <span className="text-xs text-gray-500">Loading stats...</span>
+              </div>
+            ) : error ? (
+              <p className="text-xs text-red-400 mt-1">Failed to load stats</p>
+            ) : stats ? (
+              <div className="grid grid-cols-3 gap-2 mt-1">
+                <div className="text-center p-1.5 bg-gray-800/50 rounded">
+                  <p className="text-sm font-semibold text-gray-200">{stats.deviceCount}</p>
+                  <p className="text-xs text-gray-500">Devices</p>
+                </div>
+                <div className="text-center p-1.5 bg-gray-800/50 rounded">
+                  <p className="text-sm font-semibold text-gray-200">{stats.clientCount}</p>
+                  <p className="text-xs text-gray-500">Clients</p>
+                </div>
+                <div className="text-center p-1.5 bg-gray-800/50 rounded">
+                  <p className="text-sm font-semibold text-gray-200">{stats.ssidCount}</p>
+                  <p className="text-xs text-gray-500">SSIDs</p>
+                </div>
+              </div>
+            ) : null}
           </div>
-        ) : error ? (
-          <p className="text-xs text-red-400 mt-1">Failed to load stats</p>
-        ) : stats ? (
-          <div className="grid grid-cols-3 gap-2 mt-1">
-            <div className="text-center p-1.5 bg-gray-800/50 rounded">
-              <p className="text-sm font-semibold text-gray-200">{stats.deviceCount}</p>
-              <p className="text-xs text-gray-500">Devices</p>
-            </div>
-            <div className="text-center p-1.5 bg-gray-800/50 rounded">
-              <p className="text-sm font-semibold text-gray-200">{stats.clientCount}</p>
-              <p className="text-xs text-gray-500">Clients</p>
-            </div>
-            <div className="text-center p-1.5 bg-gray-800/50 rounded">
-              <p className="text-sm font-semibold text-gray-200">{stats.ssidCount}</p>
-              <p className="text-xs text-gray-500">SSIDs</p>
-            </div>
-          </div>
-        ) : null}
-      </div>
 
-      {/* Divider */}
-      <div className="border-t border-gray-800" />
+          {/* Divider */}
+          <div className="border-t border-gray-800" />
+        </>
+      )}
 
       {/* Add to canvas action */}
       <div className="px-3 py-2">
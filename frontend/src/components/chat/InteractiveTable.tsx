@@ -1,6 +1,10 @@
-import { useState, useCallback } from 'react'
-import type { TableData } from '../../types/chat'
-import { HoverPopup } from './HoverPopup'
+import { useState, useCallback, useEffect } from 'react'
+import type { TableData, TableSort } from '../../types/chat'
+import { HoverPopup, type EntityStats } from './HoverPopup'
+import { useChatStore } from '../../store/chatSlice'
+
+// Typing pause before the filter is sent to the server
+const FILTER_DEBOUNCE_MS = 300
 
 interface Props {
   tableData: TableData
@@ -10,8 +14,89 @@ export function InteractiveTable({ tableData }: Props) {
   const [hoveredRowIdx, setHoveredRowIdx] = useState<number | null>(null)
   const [popupRowIdx, setPopupRowIdx] = useState<number | null>(null)
   const [anchorRect, setAnchorRect] = useState<DOMRect | null>(null)
+  const [statsByNetwork, setStatsByNetwork] = useState<Record<string, EntityStats>>({})
+  const [loadingPage, setLoadingPage] = useState(false)
+  const [filterText, setFilterText] = useState(tableData.filter ?? '')
+  const requestTablePage = useChatStore((s) => s.requestTablePage)
+  const pageError = useChatStore((s) => s.tablePageErrors[tableData.table_id])
+
+  // Tables larger than one page are held by the server; rows is the current page
+  const offset = tableData.offset ?? 0
+  const pageSize = tableData.limit ?? tableData.rows.length
+  const totalRows = tableData.total_rows ?? tableData.rows.length
+  const paged = totalRows > tableData.rows.length || offset > 0
+  // Sorting and filtering run on the server, over the whole table
+  const sort = tableData.sort ?? null
+  const appliedFilter = tableData.filter ?? ''
+
+  const requestPage = useCallback((newOffset: number, newSort: TableSort | null, newFilter: string) => {
+    setLoadingPage(true)
+    setPopupRowIdx(null)
+    setAnchorRect(null)
+    requestTablePage({
+      table_id: tableData.table_id, offset: newOffset, limit: pageSize, sort: newSort, filter: newFilter,
+    })
+  }, [requestTablePage, tableData.table_id, pageSize])
+
+  const goToPage = useCallback((newOffset: number) => {
+    requestPage(newOffset, sort, appliedFilter)
+  }, [requestPage, sort, appliedFilter])
+
+  // Clicking a header cycles ascending -> descending -> unsorted
+  const toggleSort = useCallback((column: string) => {
+    let next: TableSort | null = { column, descending: false }
+    if (sort?.column === column) next = sort.descending ? null : { column, descending: true }
+    requestPage(0, next, appliedFilter)
+  }, [requestPage, sort, appliedFilter])
+
+  useEffect(() => {
+    setLoadingPage(false)
+  }, [tableData.rows])
+
+  // A failed table_page request (e.g. the table was evicted) never delivers rows
+  useEffect(() => {
+    if (pageError) setLoadingPage(false)
+  }, [pageError])
+
+  useEffect(() => {
+    const needle = filterText.trim()
+    if (needle === appliedFilter) return
+    const timer = setTimeout(() => requestPage(0, sort, needle), FILTER_DEBOUNCE_MS)
+    return () => clearTimeout(timer)
+  }, [filterText, appliedFilter, sort, requestPage])
+
+  // Fetch stats for every network on this page in one request, so popups open instantly
+  useEffect(() => {
+    const networkIds = [...new Set(tableData.rows.map((r) => r.metadata.networkId).filter(Boolean))]
+    if (networkIds.length === 0) return
+    let cancelled = false
+    fetch('/api/entity/stats', {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ networkIds }),
+    })
+      .then((res) => (res.ok ? res.json() : null))
+      .then((data) => {
+        if (cancelled || !data?.stats) return
+        // Partial entries are left out so their popups retry the single-network endpoint
+        const complete: Record<string, EntityStats> = {}
+        for (const [id, stats] of Object.entries(data.stats as Record<string, EntityStats>)) {
+          if (!stats.partial) complete[id] = stats
+        }
+        setStatsByNetwork(complete)
+      })
+      .catch(() => {
+        // Popups fall back to fetching their own network's stats
+      })
+    return () => { cancelled = true }
+  }, [tableData.rows])
+
+  // Details and stats are per network; rows without one (e.g. ThousandEyes tests) have no popup
+  const hasDetails = (idx: number) => Boolean(tableData.rows[idx]?.metadata.networkId)
+  const anyDetails = tableData.rows.some((r) => r.metadata.networkId)
 
   const handleClick = useCallback((idx: number, el: HTMLTableRowElement) => {
+    if (!tableData.rows[idx]?.metadata.networkId) return
     if (popupRowIdx === idx) {
       setPopupRowIdx(null)
       setAnchorRect(null)
@@ -19,7 +104,7 @@ export function InteractiveTable({ tableData }: Props) {
       setAnchorRect(el.getBoundingClientRect())
       setPopupRowIdx(idx)
     }
-  }, [popupRowIdx])
+  }, [popupRowIdx, tableData.rows])
 
   const closePopup = useCallback(() => {
     setPopupRowIdx(null)
@@ -34,7 +119,39 @@ export function InteractiveTable({ tableData }: Props) {
         <svg className="w-3 h-3 text-blue-400" viewBox="0 0 24 24" fill="none" stroke="currentColor" strokeWidth="2">
           <path strokeLinecap="round" strokeLinejoin="round" d="M15.042 21.672L13.684 16.6m0 0l-2.51 2.225.569-9.47 5.227 7.917-3.286-.672zM12 2.25V4.5m5.834.166l-1.591 1.591M20.25 10.5H18M7.757 14.743l-1.59 1.59M6 10.5H3.75m4.007-4.243l-1.59-1.59" />
         </svg>
-        <span className="text-[11px] text-gray-500">Click a row for details</span>
+        {anyDetails && <span className="text-[11px] text-gray-500">Click a row for details</span>}
+        <input
+          type="search"
+          value={filterText}
+          onChange={(e) => setFilterText(e.target.value)}
+          onMouseDown={(e) => e.stopPropagation()}
+          placeholder="Filter rows"
+          className="ml-2 w-36 px-1.5 py-0.5 rounded bg-gray-800/60 border border-gray-700 text-[11px] text-gray-300 placeholder-gray-600 focus:outline-none focus:border-blue-500/50"
+        />
+        {pageError && <span className="text-[11px] text-red-400">{pageError}</span>}
+        {paged && (
+          <div className="ml-auto flex items-center gap-2 text-[11px] text-gray-500">
+            <span>
+              Rows {totalRows === 0 ? 0 : offset + 1}–{offset + tableData.rows.length} of {totalRows.toLocaleString()}
+            </span>
+            <button
+              onClick={() => goToPage(Math.max(0, offset - pageSize))}
+              disabled={loadingPage || offset === 0}
+              className="px-1.5 py-0.5 rounded hover:bg-gray-800 hover:text-gray-300 disabled:opacity-40 disabled:cursor-default cursor-pointer"
+              title="Previous page"
+            >
+              ‹ Prev
+            </button>
+            <button
+              onClick={() => goToPage(offset + pageSize)}
+              disabled={loadingPage || offset + tableData.rows.length >= totalRows}
+              className="px-1.5 py-0.5 rounded hover:bg-gray-800 hover:text-gray-300 disabled:opacity-40 disabled:cursor-default cursor-pointer"
+              title="Next page"
+            >
+              Next ›
+            </button>
+          </div>
+        )}
       </div>
 
       <table className="w-full border-collapse text-[0.8125rem]">
@@ -43,9 +160,12 @@ export function InteractiveTable({ tableData }: Props) {
             {tableData.columns.map((col) => (
               <th
                 key={col}
-                className="bg-[#1e293b] px-3 py-2 text-left font-semibold text-gray-300 border-b border-[#334155] whitespace-nowrap"
+                onClick={() => !loadingPage && toggleSort(col)}
+                title="Sort by this column"
+                className="bg-[#1e293b] px-3 py-2 text-left font-semibold text-gray-300 border-b border-[#334155] whitespace-nowrap cursor-pointer select-none hover:text-gray-100"
               >
                 {col}
+                {sort?.column === col && <span className="ml-1 text-blue-400">{sort.descending ? '▼' : '▲'}</span>}
               </th>
             ))}
           </tr>
@@ -56,9 +176,9 @@ export function InteractiveTable({ tableData }: Props) {
               key={row.id || `row-${idx}`}
               onMouseDown={(e) => e.stopPropagation()}
               onClick={(e) => handleClick(idx, e.currentTarget)}
-              onMouseEnter={() => setHoveredRowIdx(idx)}
+              onMouseEnter={() => setHoveredRowIdx(hasDetails(idx) ? idx : null)}
               onMouseLeave={() => setHoveredRowIdx(null)}
-              className={`border-b border-[#1e293b] cursor-pointer transition-all duration-200 ${
+              className={`border-b border-[#1e293b] transition-all duration-200 ${hasDetails(idx) ? 'cursor-pointer' : ''} ${
                 popupRowIdx === idx
                   ? 'bg-blue-500/10 shadow-[inset_0_0_0_1px_rgba(59,130,246,0.3)]'
                   : hoveredRowIdx === idx
@@ -73,6 +193,13 @@ export function InteractiveTable({ tableData }: Props) {
               ))}
             </tr>
           ))}
+          {tableData.rows.length === 0 && appliedFilter && (
+            <tr>
+              <td colSpan={tableData.columns.length} className="px-3 py-2 text-gray-500 italic">
+                No rows match “{appliedFilter}”
+              </td>
+            </tr>
+          )}
         </tbody>
       </table>
 
@@ -80,6 +207,7 @@ export function InteractiveTable({ tableData }: Props) {
         <HoverPopup
           metadata={popupRow.metadata}
           entityType={tableData.entity_type}
+          prefetchedStats={statsByNetwork[popupRow.metadata.networkId]}
           anchorRect={anchorRect}
           networkName={popupRow.cells[0]}
           onClose={closePopup}
@@ -11,6 +11,8 @@ export function useChat() {
     addMessage,
     appendToLastAssistant,
     attachTableData,
+    replaceTablePage,
+    failTablePage,
     setActiveAgent,
     addToolCall,
     updateToolCall,
@@ -58,6 +60,11 @@ export function useChat() {
           break
         }
 
+        case 'table_page': {
+          replaceTablePage(event.data as TableData)
+          break
+        }
+
         case 'done': {
           setActiveAgent(null)
           setProcessing(false)
@@ -66,7 +73,12 @@ export function useChat() {
         }
 
         case 'error': {
-          const errData = event.data as { message: string } | null
+          const errData = event.data as { message: string; table_id?: string } | null
+          if (errData?.table_id !== undefined) {
+            // A failed table_page request: reported on the table, not in the chat
+            failTablePage(errData.table_id, errData.message)
+            break
+          }
           appendToLastAssistant(
             `\n\n_Error: ${errData?.message ?? 'Unknown error'}_`
           )
@@ -74,10 +86,10 @@ export function useChat() {
         }
       }
     },
-    [addMessage, appendToLastAssistant, attachTableData, setActiveAgent, addToolCall, updateToolCall, setProcessing, clearToolCalls, addCard]
+    [addMessage, appendToLastAssistant, attachTableData, replaceTablePage, failTablePage, setActiveAgent, addToolCall, updateToolCall, setProcessing, clearToolCalls, addCard]
   )
 
-  const { sendMessage: wsSend, sendStop: wsStop } = useWebSocket(handleMessage)
+  const { sendMessage: wsSend, sendStop: wsStop, sendTablePage } = useWebSocket(handleMessage)
 
   const sendMessage = useCallback(
     (content: string) => {
@@ -100,5 +112,5 @@ export function useChat() {
     clearToolCalls()
   }, [wsStop, setProcessing, setActiveAgent, clearToolCalls])
 
-  return { sendMessage, stopProcessing }
+  return { sendMessage, stopProcessing, requestTablePage: sendTablePage }
 }
@@ -1,6 +1,7 @@
 import { useEffect, useRef, useCallback } from 'react'
 import { useConnectionStore } from '../store/connectionSlice'
 import type { WebSocketInEvent } from '../types/websocket'
+import type { TablePageRequest } from '../types/chat'
 
 export function useWebSocket(onMessage: (event: WebSocketInEvent) => void) {
   const wsRef = useRef<WebSocket | null>(null)
@@ -65,5 +66,13 @@ export function useWebSocket(onMessage: (event: WebSocketInEvent) => void) {
     }
   }, [])
 
-  return { sendMessage, sendStop }
+  const sendTablePage = useCallback((request: TablePageRequest) => {
+    if (wsRef.current?.readyState === WebSocket.OPEN) {
+      wsRef.current.send(
+        JSON.stringify({ type: 'table_page', session_id: 'default', ...request })
+      )
+    }
+  }, [])
+
+  return { sendMessage, sendStop, sendTablePage }
 }
@@ -1,5 +1,5 @@
 import { create } from 'zustand'
-import type { ChatMessage, ToolCallEvent, TableData } from '../types/chat'
+import type { ChatMessage, ToolCallEvent, TableData, TablePageRequest } from '../types/chat'
 
 export interface CompletedToolCall extends ToolCallEvent {
   agent: string
@@ -14,10 +14,15 @@ interface ChatState {
   processingStartedAt: number | null
   pendingPrompt: string | null
   pendingTableData: TableData[]
+  pendingTablePage: TablePageRequest | null
+  tablePageErrors: Record<string, string>  // table_id -> why the last page request failed
 
   addMessage: (message: ChatMessage) => void
   appendToLastAssistant: (text: string) => void
   attachTableData: (tableData: TableData) => void
+  replaceTablePage: (page: TableData) => void
+  requestTablePage: (request: TablePageRequest | null) => void
+  failTablePage: (tableId: string, message: string) => void
   setActiveAgent: (agent: string | null) => void
   addToolCall: (toolCall: ToolCallEvent) => void
   updateToolCall: (tool: string, status: 'running' | 'complete') => void
@@ -36,6 +41,8 @@ export const useChatStore = create<ChatState>((set) => ({
   processingStartedAt: null,
   pendingPrompt: null,
   pendingTableData: [],
+  pendingTablePage: null,
+  tablePageErrors: {},
 
   addMessage: (message) =>
     set((state) => ({ messages: [...state.messages, message] })),
@@ -88,6 +95,31 @@ export const useChatStore = create<ChatState>((set) => ({
       return { pendingTableData: [...state.pendingTableData, tableData] }
     }),
 
+  replaceTablePage: (page) =>
+    set((state) => {
+      // Swap in the new page wherever the table is shown, keeping its other fields
+      const swap = (td: TableData) => (td.table_id === page.table_id ? { ...td, ...page } : td)
+      return {
+        messages: state.messages.map((m) =>
+          m.tableData?.some((td) => td.table_id === page.table_id)
+            ? { ...m, tableData: m.tableData.map(swap) }
+            : m
+        ),
+        pendingTableData: state.pendingTableData.map(swap),
+      }
+    }),
+
+  requestTablePage: (request) =>
+    set((state) => {
+      if (!request) return { pendingTablePage: null }
+      const tablePageErrors = { ...state.tablePageErrors }
+      delete tablePageErrors[request.table_id]
+      return { pendingTablePage: request, tablePageErrors }
+    }),
+
+  failTablePage: (tableId, message) =>
+    set((state) => ({ tablePageErrors: { ...state.tablePageErrors, [tableId]: message } })),
+
   setActiveAgent: (agent) => set({ activeAgent: agent }),
 
   addToolCall: (toolCall) =>
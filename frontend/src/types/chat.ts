@@ -20,6 +20,8 @@ export interface TableRowMetadata {
   tags?: string[]
   timeZone?: string
   productTypes?: string[]
+  // Entity-specific fields (serial, portId, testId, ...)
+  [key: string]: unknown
 }
 
 export interface TableRow {
@@ -34,4 +36,23 @@ export interface TableData {
   source: 'meraki' | 'thousandeyes'
   columns: string[]
   rows: TableRow[]
+  // Paging: rows holds one page of a table held by the server
+  offset?: number
+  limit?: number
+  total_rows?: number  // Rows matching the filter
+  sort?: TableSort | null
+  filter?: string | null
+}
+
+export interface TableSort {
+  column: string
+  descending: boolean
+}
+
+export interface TablePageRequest {
+  table_id: string
+  offset: number
+  limit?: number
+  sort?: TableSort | null
+  filter?: string
 }
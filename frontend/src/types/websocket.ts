@@ -1,12 +1,19 @@
 export interface WebSocketOutMessage {
-  type: 'user_message' | 'stop'
+  type: 'user_message' | 'stop' | 'table_page'
   content?: string
   session_id?: string
+  request_id?: string
+  table_id?: string
+  offset?: number
+  limit?: number
+  sort?: { column: string; descending?: boolean }
+  filter?: string
 }
 
 export interface WebSocketInEvent {
-  type: 'agent_start' | 'tool_call' | 'text' | 'card' | 'done' | 'error' | 'cards_ready' | 'table_data'
+  type: 'agent_start' | 'tool_call' | 'text' | 'card' | 'done' | 'error' | 'cards_ready' | 'table_data' | 'table_page'
   data: unknown
+  request_id?: string
 }
 
 export interface AgentStartData {